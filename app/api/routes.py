@@ -11,10 +11,12 @@ class ScrapingResponse(BaseModel):
     message: Optional[str] = None
 
 @router.get("/scrape/education", response_model=ScrapingResponse)
-async def scrape_education_news(url: HttpUrl):
+async def scrape_education_news(url: HttpUrl, unseen_for: Optional[str] = None):
     """Scrape education news from supported websites"""
     try:
-        data = await scraping_engine.scrape_website(str(url))
+        data = await scraping_engine.scrape_cached(str(url))
+        if unseen_for:
+            data = await scraping_engine.filter_unseen(unseen_for, data)
         return {
             "status": "success",
             "data": data,
@@ -0,0 +1,139 @@
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional
+from .parsers import ParserBackend
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Fallbacks used when a site config has no article_selectors for a field
+GENERIC_SELECTORS = {
+    'body': ['[itemprop="articleBody"]', 'div.article-body', 'div.story-content', 'div.full-details', 'article', 'main'],
+    'author': ['[itemprop="author"] [itemprop="name"]', '[rel="author"]', '.author-name', '.author'],
+    'date': ['[itemprop="datePublished"]', 'time[datetime]']
+}
+META_SELECTORS = {
+    'canonical': 'link[rel="canonical"]',
+    'json_ld': 'script[type="application/ld+json"]',
+    'published': 'meta[property="article:published_time"], meta[itemprop="datePublished"], meta[name="publish-date"]',
+    'author': 'meta[name="author"], meta[property="article:author"]',
+    'tags': 'meta[property="article:tag"]',
+    'keywords': 'meta[name="keywords"], meta[name="news_keywords"]',
+    'paragraphs': 'p'
+}
+ARTICLE_TYPES = {'Article', 'NewsArticle', 'ReportageNewsArticle', 'BlogPosting'}
+
+
+def _clean(text: Optional[str]) -> str:
+    return WHITESPACE_RE.sub(' ', text or '').strip()
+
+
+def _names(value: Any) -> List[str]:
+    """Author or keyword values from JSON-LD, which may be strings, objects or lists"""
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(',') if part.strip()]
+    if isinstance(value, dict):
+        return _names(value.get('name'))
+    if isinstance(value, list):
+        return [name for item in value for name in _names(item)]
+    return []
+
+
+class ArticleExtractor:
+    """Pulls body, author, tags and publish time out of a single article page.
+
+    Structured data (JSON-LD, article meta tags) wins over markup since it
+    survives redesigns; per-site `article_selectors` come next, then generic
+    selectors.
+    """
+
+    def __init__(self, parser: ParserBackend):
+        self.parser = parser
+        self.generic = {
+            key: [parser.compile(selector) for selector in selectors]
+            for key, selectors in GENERIC_SELECTORS.items()
+        }
+        self.meta = {key: parser.compile(selector) for key, selector in META_SELECTORS.items()}
+
+    def _json_ld(self, root) -> Dict[str, Any]:
+        for script in self.parser.select(root, self.meta['json_ld']):
+            try:
+                data = json.loads(self.parser.text(script))
+            except ValueError:
+                continue
+            items = data if isinstance(data, list) else data.get('@graph', [data]) if isinstance(data, dict) else []
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                types = item.get('@type')
+                types = set(types) if isinstance(types, list) else {types}
+                if types & ARTICLE_TYPES:
+                    return item
+        return {}
+
+    def _first(self, root, selectors: Iterable) -> Optional[Any]:
+        for selector in selectors:
+            element = self.parser.select_one(root, selector)
+            if element is not None:
+                return element
+        return None
+
+    def _content(self, root, selector) -> List[str]:
+        return [
+            _clean(self.parser.attr(element, 'content'))
+            for element in self.parser.select(root, selector)
+            if self.parser.attr(element, 'content')
+        ]
+
+    def _body(self, root, selectors: List) -> Optional[str]:
+        container = self._first(root, selectors)
+        if container is None:
+            return None
+        paragraphs = [_clean(self.parser.text(p)) for p in self.parser.select(container, self.meta['paragraphs'])]
+        paragraphs = [p for p in paragraphs if p]
+        return '\n\n'.join(paragraphs) if paragraphs else _clean(self.parser.text(container)) or None
+
+    def extract(self, html: str, site_selectors: Optional[Dict[str, List]] = None) -> Dict[str, Any]:
+        root = self.parser.parse(html)
+        site_selectors = site_selectors or {}
+        ld = self._json_ld(root)
+
+        def selectors(field):
+            return site_selectors.get(field, []) + self.generic.get(field, [])
+
+        body = self._body(root, site_selectors['body']) if 'body' in site_selectors else None
+        if not body and ld.get('articleBody'):
+            body = _clean(ld['articleBody'])
+        if not body:
+            body = self._body(root, self.generic['body'])
+
+        authors = _names(ld.get('author')) or self._content(root, self.meta['author'])
+        if not authors:
+            element = self._first(root, selectors('author'))
+            if element is not None:
+                authors = [_clean(self.parser.text(element))]
+
+        tags = self._content(root, self.meta['tags']) or _names(ld.get('keywords'))
+        if not tags:
+            tags = [tag for value in self._content(root, self.meta['keywords']) for tag in _names(value)]
+        if 'tags' in site_selectors:
+            tags = tags or [
+                _clean(self.parser.text(element))
+                for selector in site_selectors['tags']
+                for element in self.parser.select(root, selector)
+            ]
+
+        published = ld.get('datePublished') or next(iter(self._content(root, self.meta['published'])), None)
+        if not published:
+            element = self._first(root, selectors('date'))
+            if element is not None:
+                published = (self.parser.attr(element, 'datetime') or self.parser.attr(element, 'content')
+                             or self.parser.text(element))
+
+        canonical = self.parser.select_one(root, self.meta['canonical'])
+        return {
+            'body': body,
+            'author': ', '.join(dict.fromkeys(author for author in authors if author)) or None,
+            'tags': list(dict.fromkeys(tag for tag in tags if tag)),
+            'published': _clean(published) if isinstance(published, str) else None,
+            'canonical_url': self.parser.attr(canonical, 'href') if canonical is not None else None
+        }
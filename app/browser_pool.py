@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+
+try:
+    from selenium import webdriver
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions
+    from selenium.webdriver.support.ui import WebDriverWait
+except ImportError:  # JS rendering is optional, static fetching covers most sites
+    webdriver = None
+
+CHROME_ARGUMENTS = (
+    '--headless',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-extensions',
+    '--blink-settings=imagesEnabled=false'
+)
+
+
+class _Browser:
+    """One headless Chrome and the tab it keeps reusing"""
+
+    def __init__(self, driver: Any):
+        self.driver = driver
+        self.pages = 0
+        self.started_at = time.monotonic()
+
+
+class BrowserPool:
+    """Pre-launched headless browsers for pages that only render with JavaScript.
+
+    Selenium is blocking, so every browser command runs on a dedicated
+    thread pool with one thread per browser; the event loop only awaits.
+    A caller waits at most `acquire_timeout` seconds for a free browser.
+    Each browser reuses its tab and is replaced after `max_pages` pages, or
+    after any failure, to cap memory leaks.
+    """
+
+    def __init__(self, size: int = 2, max_pages: int = 50, acquire_timeout: float = 30,
+                 page_timeout: float = 30, render_wait: float = 10,
+                 binary_path: Optional[str] = None, driver_path: Optional[str] = None,
+                 user_agent: Optional[str] = None):
+        self.size = size
+        self.max_pages = max_pages
+        self.acquire_timeout = acquire_timeout
+        self.page_timeout = page_timeout
+        self.render_wait = render_wait
+        self.binary_path = binary_path
+        self.driver_path = driver_path
+        self.user_agent = user_agent
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.idle: Optional[asyncio.Queue] = None
+        self._launching: List[asyncio.Task] = []
+        # Browsers running, idle or busy
+        self._alive = 0
+        self._closed = False
+        self.stats = {
+            'launched': 0,
+            'recycled': 0,
+            'rendered': 0,
+            'failed': 0,
+            'acquire_timeouts': 0
+        }
+
+    @property
+    def available(self) -> bool:
+        return webdriver is not None
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def _launch_driver(self) -> Any:
+        options = webdriver.ChromeOptions()
+        for argument in CHROME_ARGUMENTS:
+            options.add_argument(argument)
+        if self.user_agent:
+            options.add_argument(f'--user-agent={self.user_agent}')
+        if self.binary_path:
+            options.binary_location = self.binary_path
+        # Return once the DOM is ready; scripts get render_wait to fill in the page
+        options.page_load_strategy = 'eager'
+        service = Service(self.driver_path) if self.driver_path else Service()
+        driver = webdriver.Chrome(service=service, options=options)
+        driver.set_page_load_timeout(self.page_timeout)
+        return driver
+
+    async def _launch(self):
+        try:
+            browser = _Browser(await self._run(self._launch_driver))
+        except Exception as e:
+            logging.error(f"Could not launch headless browser: {str(e)}")
+            return
+        if self._closed:
+            await self._run(browser.driver.quit)
+            return
+        self.stats['launched'] += 1
+        self._alive += 1
+        self.idle.put_nowait(browser)
+
+    def _spawn(self):
+        task = asyncio.create_task(self._launch())
+        self._launching.append(task)
+        task.add_done_callback(self._launching.remove)
+
+    async def start(self):
+        """Launch all browsers up front so the first render does not pay for startup"""
+        if self.idle is not None:
+            return
+        if not self.available:
+            logging.warning("selenium not installed, JavaScript rendering disabled")
+            return
+        self._closed = False
+        self.executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix='browser')
+        self.idle = asyncio.Queue()
+        for _ in range(self.size):
+            self._spawn()
+        await asyncio.gather(*self._launching, return_exceptions=True)
+
+    async def _recycle(self, browser: _Browser):
+        self.stats['recycled'] += 1
+        self._alive -= 1
+        if not self._closed:
+            self._spawn()
+        try:
+            await self._run(browser.driver.quit)
+        except Exception as e:
+            logging.error(f"Error quitting headless browser: {str(e)}")
+
+    def _render(self, browser: _Browser, url: str, wait_selector: Optional[str]) -> str:
+        driver = browser.driver
+        driver.get(url)
+        if wait_selector:
+            try:
+                WebDriverWait(driver, self.render_wait).until(
+                    expected_conditions.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
+                )
+            except TimeoutException:
+                # Still return what rendered; the page may really have no matches
+                pass
+        html = driver.page_source
+        # Leave the tab idle instead of running the page's scripts until the next render
+        driver.get('about:blank')
+        return html
+
+    async def render(self, url: str, wait_selector: Optional[str] = None) -> str:
+        """Load a page in a pooled browser and return the HTML after its scripts ran"""
+        if self.idle is None:
+            await self.start()
+        if self.idle is None or (not self._alive and not self._launching):
+            raise RuntimeError("JavaScript rendering is not available")
+        try:
+            browser = await asyncio.wait_for(self.idle.get(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.stats['acquire_timeouts'] += 1
+            raise TimeoutError(f"No headless browser free within {self.acquire_timeout}s for {url}")
+
+        # Shielded: a cancelled caller must not hand back a browser still busy with its page
+        future = asyncio.get_running_loop().run_in_executor(self.executor, self._render, browser, url, wait_selector)
+        future.add_done_callback(lambda done: self._release(browser, done))
+        return await asyncio.shield(future)
+
+    def _release(self, browser: _Browser, done: asyncio.Future):
+        failed = done.cancelled() or done.exception() is not None
+        self.stats['failed' if failed else 'rendered'] += 1
+        browser.pages += 1
+        if failed or browser.pages >= self.max_pages or self._closed:
+            asyncio.ensure_future(self._recycle(browser))
+        else:
+            self.idle.put_nowait(browser)
+
+    def get_stats(self):
+        idle = self.idle.qsize() if self.idle is not None else 0
+        return {**self.stats, 'size': self.size, 'alive': self._alive, 'idle': idle, 'available': self.available}
+
+    async def close(self):
+        self._closed = True
+        if self.idle is None:
+            return
+        await asyncio.gather(*self._launching, return_exceptions=True)
+        browsers = []
+        while not self.idle.empty():
+            browsers.append(self.idle.get_nowait())
+        for browser in browsers:
+            self._alive -= 1
+            try:
+                await self._run(browser.driver.quit)
+            except Exception as e:
+                logging.error(f"Error quitting headless browser: {str(e)}")
+        self.executor.shutdown(wait=True)
+        self.executor = None
+        self.idle = None
+
+
+def create_browser_pool() -> Optional[BrowserPool]:
+    """Browser pool configured from the environment, None when disabled"""
+    size = int(os.getenv('BROWSER_POOL_SIZE', 2))
+    if size <= 0:
+        return None
+    if webdriver is None:
+        logging.warning("selenium not installed, JavaScript rendering disabled")
+        return None
+    return BrowserPool(
+        size=size,
+        max_pages=int(os.getenv('BROWSER_MAX_PAGES', 50)),
+        acquire_timeout=float(os.getenv('BROWSER_ACQUIRE_TIMEOUT', 30)),
+        page_timeout=float(os.getenv('BROWSER_PAGE_TIMEOUT', 30)),
+        binary_path=os.getenv('CHROME_BINARY'),
+        driver_path=os.getenv('CHROMEDRIVER_PATH')
+    )
@@ -0,0 +1,230 @@
+import logging
+import os
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from .dedup import article_key
+from .listing_extractor import SUMMARY_PLACEHOLDER
+
+try:
+    import numpy as np
+except ImportError:  # story clustering is optional
+    np = None
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+NUMBER_RE = re.compile(r'\d+(?=st|nd|rd|th\b|\b)')
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'were', 'will', 'with', 'read', 'more',
+    'click', 'here', 'check', 'details', 'latest', 'news', 'updates', 'live'
+}
+
+# Hashes are (a * x + b) mod p; with p below 2**31 the product never overflows uint64
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+def shingles(article: Dict[str, Any]) -> Set[int]:
+    """Hashed word unigrams and bigrams of title and summary, without stopwords"""
+    text = article.get('title') or ''
+    summary = article.get('summary')
+    if summary and summary != SUMMARY_PLACEHOLDER:
+        text = f"{text} {summary}"
+    words = [word for word in WORD_RE.findall(text.lower()) if word not in STOPWORDS]
+    grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    return {zlib.crc32(gram.encode('utf-8')) for gram in grams}
+
+
+def title_numbers(article: Dict[str, Any]) -> frozenset:
+    """Numbers in the title ("10th" counts as 10); they tell apart stories that share most words"""
+    return frozenset(NUMBER_RE.findall((article.get('title') or '').lower()))
+
+
+def numbers_conflict(first: frozenset, second: frozenset) -> bool:
+    # "Class 10 result" vs "Class 12 result": each has a number the other lacks
+    return bool(first - second) and bool(second - first)
+
+
+class _Item:
+    __slots__ = ('key', 'article', 'signature', 'bands', 'numbers', 'cluster', 'added_at')
+
+    def __init__(self, key: str, article: Dict[str, Any], signature: 'np.ndarray',
+                 bands: List[Tuple[int, bytes]], numbers: frozenset, added_at: float):
+        self.key = key
+        self.article = article
+        self.signature = signature
+        self.bands = bands
+        self.numbers = numbers
+        self.cluster = 0
+        self.added_at = added_at
+
+
+class StoryClusterer:
+    """Groups near-duplicate articles from different sources into stories.
+
+    Each article gets a MinHash signature of its title and summary. An LSH
+    index (`bands` buckets of `rows` hashes each) turns lookup of similar
+    articles into a handful of dict probes; candidates are confirmed by
+    estimated Jaccard similarity, and rejected when their titles carry
+    conflicting numbers (class 10 vs class 12 results). Articles older than
+    `window` seconds, or beyond `max_items`, are evicted so memory stays
+    bounded.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 32, threshold: float = 0.25,
+                 window: float = 48 * 3600, max_items: int = 50000, seed: int = 1):
+        if np is None:
+            raise ImportError("Story clustering requires numpy")
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.window = window
+        self.max_items = max_items
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.items: 'OrderedDict[str, _Item]' = OrderedDict()
+        self.buckets: Dict[Tuple[int, bytes], Set[str]] = {}
+        self.clusters: Dict[int, Set[str]] = {}
+        self._next_cluster = 1
+
+    def signature(self, tokens: Set[int]) -> Optional['np.ndarray']:
+        if not tokens:
+            return None
+        values = np.fromiter(tokens, dtype=np.uint64, count=len(tokens)) % np.uint64(MERSENNE_PRIME)
+        hashed = (np.outer(self._a, values) + self._b[:, None]) % np.uint64(MERSENNE_PRIME)
+        return hashed.min(axis=1)
+
+    def _band_keys(self, signature: 'np.ndarray') -> List[Tuple[int, bytes]]:
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    @staticmethod
+    def similarity(first: 'np.ndarray', second: 'np.ndarray') -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return float(np.count_nonzero(first == second)) / len(first)
+
+    def _merge(self, target: int, other: int) -> int:
+        # Relabel the smaller cluster so merges stay cheap overall
+        if len(self.clusters[target]) < len(self.clusters[other]):
+            target, other = other, target
+        for key in self.clusters.pop(other):
+            self.items[key].cluster = target
+            self.clusters[target].add(key)
+        return target
+
+    def _evict(self, now: float):
+        while self.items:
+            key, item = next(iter(self.items.items()))
+            if len(self.items) <= self.max_items and now - item.added_at <= self.window:
+                break
+            self._remove(key)
+
+    def _remove(self, key: str):
+        item = self.items.pop(key)
+        for band_key in item.bands:
+            bucket = self.buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.buckets[band_key]
+        members = self.clusters.get(item.cluster)
+        if members is not None:
+            members.discard(key)
+            if not members:
+                del self.clusters[item.cluster]
+
+    def add(self, article: Dict[str, Any], now: Optional[float] = None) -> int:
+        """Index an article and return the id of the story cluster it joins"""
+        now = time.time() if now is None else now
+        key = article_key(article)
+        existing = self.items.get(key)
+        if existing is not None:
+            # Seen again on a later scrape: keep it alive in the window
+            existing.added_at = now
+            existing.article = article
+            self.items.move_to_end(key)
+            return existing.cluster
+
+        signature = self.signature(shingles(article))
+        bands = self._band_keys(signature) if signature is not None else []
+        numbers = title_numbers(article)
+        matched: Set[int] = set()
+        candidates: Set[str] = set()
+        for band_key in bands:
+            candidates.update(self.buckets.get(band_key, ()))
+        for candidate in candidates:
+            other = self.items[candidate]
+            if other.cluster in matched or numbers_conflict(numbers, other.numbers):
+                continue
+            if self.similarity(signature, other.signature) >= self.threshold:
+                matched.add(other.cluster)
+
+        if matched:
+            cluster = matched.pop()
+            for other in matched:
+                cluster = self._merge(cluster, other)
+        else:
+            cluster = self._next_cluster
+            self._next_cluster += 1
+            self.clusters[cluster] = set()
+
+        item = _Item(key, article, signature, bands, numbers, now)
+        item.cluster = cluster
+        self.items[key] = item
+        self.clusters[cluster].add(key)
+        for band_key in bands:
+            self.buckets.setdefault(band_key, set()).add(key)
+        self._evict(now)
+        return item.cluster
+
+    def add_many(self, articles: Iterable[Dict[str, Any]], now: Optional[float] = None) -> List[int]:
+        return [self.add(article, now) for article in articles]
+
+    def cluster_of(self, article: Dict[str, Any]) -> Optional[int]:
+        item = self.items.get(article_key(article))
+        return item.cluster if item is not None else None
+
+    def representatives(self, min_size: int = 1) -> List[Dict[str, Any]]:
+        """One article per story, most recently active story first.
+
+        The representative is the member with the most informative summary,
+        earliest seen on ties; the other sources are listed alongside it.
+        """
+        stories = []
+        for cluster, keys in self.clusters.items():
+            if len(keys) < min_size:
+                continue
+            members = [self.items[key] for key in keys]
+            members.sort(key=lambda item: item.added_at)
+            best = max(members, key=lambda item: len(item.article.get('summary') or '')
+                       if item.article.get('summary') != SUMMARY_PLACEHOLDER else 0)
+            story = dict(best.article)
+            story['story_id'] = cluster
+            story['story_size'] = len(members)
+            story['sources'] = list(dict.fromkeys(item.article.get('source') for item in members))
+            story['related_links'] = [item.article.get('link') for item in members if item is not best]
+            stories.append((max(item.added_at for item in members), story))
+        stories.sort(key=lambda entry: entry[0], reverse=True)
+        return [story for _, story in stories]
+
+    def get_stats(self) -> Dict[str, int]:
+        return {'articles': len(self.items), 'stories': len(self.clusters), 'buckets': len(self.buckets)}
+
+
+def create_story_clusterer() -> Optional[StoryClusterer]:
+    """Story clusterer configured from the environment, None without numpy"""
+    if np is None:
+        logging.warning("numpy not installed, story clustering disabled")
+        return None
+    return StoryClusterer(
+        threshold=float(os.getenv('STORY_THRESHOLD', 0.25)),
+        window=float(os.getenv('STORY_WINDOW', 48 * 3600)),
+        max_items=int(os.getenv('STORY_MAX_ITEMS', 50000))
+    )
@@ -0,0 +1,121 @@
+import bisect
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+ALIASES = {
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+    '@monthly': '0 0 1 * *',
+    '@weekly': '0 0 * * 0',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@hourly': '0 * * * *'
+}
+MONTH_NAMES = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+DAY_NAMES = ['sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat']
+
+# minute, hour, day of month, month, day of week
+FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+# Give up looking for a match after this many years (e.g. "0 0 30 2 *")
+MAX_YEARS = 5
+
+
+def _value(token: str, field: int) -> int:
+    token = token.lower()
+    if field == 3 and token in MONTH_NAMES:
+        return MONTH_NAMES.index(token) + 1
+    if field == 4 and token in DAY_NAMES:
+        return DAY_NAMES.index(token)
+    return int(token)
+
+
+def parse_field(text: str, field: int) -> List[int]:
+    low, high = FIELD_RANGES[field]
+    values = set()
+    for part in text.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Invalid step in cron field: {text}")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start_text, end_text = part.split('-', 1)
+            start, end = _value(start_text, field), _value(end_text, field)
+        else:
+            start = _value(part, field)
+            # "5/15" means every 15 starting at 5
+            end = high if step > 1 else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron field out of range: {text}")
+        values.update(range(start, end + 1, step))
+    if field == 4 and 7 in values:
+        # Both 0 and 7 mean Sunday
+        values.discard(7)
+        values.add(0)
+    return sorted(values)
+
+
+class CronExpression:
+    """Five-field cron expression with names, ranges, steps and @aliases.
+
+    As in Vixie cron, when both day of month and day of week are restricted
+    a day matches if either does.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        text = ALIASES.get(expression.strip().lower(), expression)
+        fields = text.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression}")
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            parse_field(field, index) for index, field in enumerate(fields)
+        )
+        # Vixie cron counts a field starting with '*' (so '*/2' too) as unrestricted
+        self.any_day = fields[2].startswith('*')
+        self.any_weekday = fields[4].startswith('*')
+
+    def _day_matches(self, moment: datetime) -> bool:
+        in_days = moment.day in self.days
+        # datetime: Monday is 0; cron: Sunday is 0
+        in_weekdays = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+    def next_after(self, moment: datetime) -> Optional[datetime]:
+        """First matching minute strictly after `moment` (naive wall-clock time)"""
+        moment = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment.year + MAX_YEARS
+        # Jump field by field instead of stepping minute by minute
+        while moment.year <= limit:
+            if moment.month not in self.months:
+                index = bisect.bisect_right(self.months, moment.month)
+                if index < len(self.months):
+                    moment = moment.replace(month=self.months[index], day=1, hour=0, minute=0)
+                else:
+                    moment = moment.replace(year=moment.year + 1, month=self.months[0], day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if moment.hour not in self.hours:
+                index = bisect.bisect_right(self.hours, moment.hour)
+                if index < len(self.hours):
+                    moment = moment.replace(hour=self.hours[index], minute=0)
+                else:
+                    moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if moment.minute not in self.minutes:
+                index = bisect.bisect_right(self.minutes, moment.minute)
+                if index < len(self.minutes):
+                    moment = moment.replace(minute=self.minutes[index])
+                else:
+                    moment = (moment + timedelta(hours=1)).replace(minute=0)
+                continue
+            return moment
+        return None
@@ -0,0 +1,105 @@
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, tzinfo
+from typing import Dict, List, Optional, Tuple
+from dateutil import parser
+
+OUTPUT_FORMAT = '%Y-%m-%d %I:%M %p IST'
+
+WHITESPACE_RE = re.compile(r'\s+')
+PREFIX_RE = re.compile(r'^(Updated:|Published:|Posted:|Last Updated:|Updated on:|Published on:)\s*')
+ISO_RE = re.compile(r'^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?(Z|[+-]\d{2}:?\d{2})?$')
+
+
+class DateNormalizer:
+    """Normalizes scraped date strings, cheapest strategy first.
+
+    Order: memoized result, ISO-8601 fast path, the format that last worked
+    for the site, the site's remaining formats, and finally fuzzy dateutil.
+    Fuzzy results take missing fields from today's date ("5 March",
+    "2 hours ago"), so they are only memoized for the day they were made.
+    """
+
+    def __init__(self, timezone: tzinfo, cache_size: int = 4096):
+        self.timezone = timezone
+        self.cache_size = cache_size
+        # (site, raw string) -> (result, epoch time it expires at, None when it holds for good)
+        self._cache: 'OrderedDict[Tuple[Optional[str], str], Tuple[Optional[str], Optional[float]]]' = OrderedDict()
+        self._learned: Dict[str, str] = {}
+
+    def clean(self, date_str: str) -> str:
+        date_str = WHITESPACE_RE.sub(' ', date_str.strip())
+        return PREFIX_RE.sub('', date_str)
+
+    def _format(self, parsed: datetime) -> str:
+        if parsed.tzinfo is None:
+            parsed = self.timezone.localize(parsed)
+        return parsed.strftime(OUTPUT_FORMAT)
+
+    def _parse_iso(self, date_str: str) -> Optional[datetime]:
+        if not ISO_RE.match(date_str):
+            return None
+        if date_str.endswith('Z'):
+            date_str = date_str[:-1] + '+00:00'
+        try:
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            return None
+
+    def _parse_formats(self, date_str: str, formats: List[str], site: Optional[str]) -> Optional[datetime]:
+        learned = self._learned.get(site) if site else None
+        candidates = [learned] + [fmt for fmt in formats if fmt != learned] if learned else formats
+        for fmt in candidates:
+            try:
+                parsed = datetime.strptime(date_str, fmt)
+            except ValueError:
+                continue
+            if site:
+                self._learned[site] = fmt
+            return parsed
+        return None
+
+    def _normalize(self, date_str: str, formats: List[str], site: Optional[str]) -> Tuple[Optional[str], bool]:
+        """The normalized date, and whether it depends on today's date"""
+        date_str = self.clean(date_str)
+
+        parsed = self._parse_iso(date_str) or self._parse_formats(date_str, formats, site)
+        if parsed is not None:
+            return self._format(parsed), False
+        # Last resort, fuzzy parsing is by far the slowest strategy
+        try:
+            parsed = parser.parse(date_str, fuzzy=True)
+        except (ValueError, OverflowError):
+            return date_str, False
+        return self._format(parsed), True
+
+    @staticmethod
+    def _next_midnight() -> float:
+        # dateutil fills missing fields from the local date, so that is when results go stale
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return (today + timedelta(days=1)).timestamp()
+
+    def parse(self, date_str: Optional[str], formats: List[str], site: Optional[str] = None) -> Optional[str]:
+        """Parse date string to formatted datetime"""
+        if not date_str:
+            return None
+
+        key = (site, date_str)
+        cached = self._cache.get(key)
+        if cached is not None:
+            result, expires = cached
+            if expires is None or time.time() < expires:
+                self._cache.move_to_end(key)
+                return result
+
+        result, relative = self._normalize(date_str, formats, site)
+        if self.cache_size > 0:
+            self._cache[key] = (result, self._next_midnight() if relative else None)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def learned_formats(self) -> Dict[str, str]:
+        return dict(self._learned)
@@ -0,0 +1,248 @@
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import sqlite3
+import struct
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+# Ad-click and campaign identifiers only (plus utm_*); generic names like `ref`, `from` or
+# `page` are real parameters on many CMS and pagination URLs and must stay in the key
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'gbraid', 'wbraid', 'msclkid', 'yclid', 'twclid', 'igshid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', 'ref_src', 'cmpid'
+}
+
+
+def canonical_link(link: str) -> str:
+    """Normalize an article link and strip tracking parameters"""
+    parts = urlparse(link.strip())
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ]
+    path = parts.path.rstrip('/') or '/'
+    return urlunparse((parts.scheme.lower(), parts.netloc.lower(), path, '', urlencode(sorted(query)), ''))
+
+
+def article_key(article: Dict) -> str:
+    """Canonical identity of an article: its link, or title plus source without one"""
+    link = article.get('link')
+    if link:
+        identity = canonical_link(link)
+    else:
+        identity = f"{' '.join(str(article.get('title', '')).lower().split())}|{article.get('source', '')}"
+    return hashlib.blake2b(identity.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def dedupe_articles(articles: Iterable[Dict]) -> List[Dict]:
+    """Drop repeated articles, keeping the first occurrence"""
+    seen = set()
+    unique = []
+    for article in articles:
+        key = article_key(article)
+        if key not in seen:
+            seen.add(key)
+            unique.append(article)
+    return unique
+
+
+class SeenStore:
+    """Remembers article keys already returned to a consumer"""
+
+    async def filter_unseen(self, consumer: str, articles: List[Dict]) -> List[Dict]:
+        """Return the articles this consumer has not seen yet and mark them seen"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class BloomFilter:
+    def __init__(self, num_bits: int, num_hashes: int, bits: Optional[bytearray] = None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class BloomSeenStore(SeenStore):
+    """Two rotating Bloom filters; memory is fixed at twice one filter.
+
+    Once the current filter holds `capacity` keys it becomes the previous
+    one and a fresh filter takes over, so the oldest history ages out.
+    With a `path`, the filters are saved after every call that adds keys,
+    so a crash loses at most the call in progress.
+    """
+
+    MAGIC = b'SEEN1'
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001, path: Optional[str] = None):
+        self.capacity = capacity
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.path = path
+        self.count = 0
+        self.current = BloomFilter(self.num_bits, self.num_hashes)
+        self.previous = BloomFilter(self.num_bits, self.num_hashes)
+        self._dirty = False
+        self._saving = False
+        if path and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            header = f.read(len(self.MAGIC) + 24)
+            if not header.startswith(self.MAGIC):
+                return
+            num_bits, num_hashes, count = struct.unpack('<QQQ', header[len(self.MAGIC):])
+            if (num_bits, num_hashes) != (self.num_bits, self.num_hashes):
+                # Sizing changed, start over rather than misreading the bits
+                return
+            size = (num_bits + 7) // 8
+            self.current = BloomFilter(num_bits, num_hashes, bytearray(f.read(size)))
+            self.previous = BloomFilter(num_bits, num_hashes, bytearray(f.read(size)))
+            self.count = count
+
+    def _snapshot(self) -> bytes:
+        header = self.MAGIC + struct.pack('<QQQ', self.num_bits, self.num_hashes, self.count)
+        return header + bytes(self.current.bits) + bytes(self.previous.bits)
+
+    def _write(self, data: bytes):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+    def save(self):
+        if self.path:
+            self._write(self._snapshot())
+
+    async def _persist(self):
+        # The snapshot is taken on the loop so the thread never sees half-updated bits.
+        # One write at a time; calls arriving during it are covered by one more write.
+        self._dirty = True
+        if self._saving:
+            return
+        self._saving = True
+        try:
+            while self._dirty:
+                self._dirty = False
+                await asyncio.to_thread(self._write, self._snapshot())
+        except OSError as e:
+            logging.error(f"Could not save seen store {self.path}: {str(e)}")
+        finally:
+            self._saving = False
+
+    def _seen(self, key: str) -> bool:
+        return key in self.current or key in self.previous
+
+    def _add(self, key: str):
+        if self.count >= self.capacity:
+            self.previous = self.current
+            self.current = BloomFilter(self.num_bits, self.num_hashes)
+            self.count = 0
+        self.current.add(key)
+        self.count += 1
+
+    async def filter_unseen(self, consumer: str, articles: List[Dict]) -> List[Dict]:
+        unseen = []
+        for article in articles:
+            key = f"{consumer}:{article_key(article)}"
+            if not self._seen(key):
+                self._add(key)
+                unseen.append(article)
+        if unseen and self.path:
+            await self._persist()
+        return unseen
+
+    def close(self):
+        self.save()
+
+
+class SQLiteSeenStore(SeenStore):
+    """Exact seen-set in SQLite, pruned to the newest `max_entries` keys"""
+
+    def __init__(self, path: str, max_entries: int = 1000000):
+        self.path = path
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._inserts = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, seen_at REAL NOT NULL) WITHOUT ROWID'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS seen_at_idx ON seen (seen_at)')
+            self._conn.commit()
+        return self._conn
+
+    def _filter_unseen(self, consumer: str, articles: List[Dict]) -> List[Dict]:
+        now = time.time()
+        unseen = []
+        with self._lock:
+            conn = self._connect()
+            for article in articles:
+                cursor = conn.execute(
+                    'INSERT OR IGNORE INTO seen VALUES (?, ?)', (f"{consumer}:{article_key(article)}", now)
+                )
+                if cursor.rowcount:
+                    unseen.append(article)
+            self._inserts += len(unseen)
+            if self._inserts >= max(1, self.max_entries // 100):
+                self._prune(conn)
+            conn.commit()
+        return unseen
+
+    def _prune(self, conn: sqlite3.Connection):
+        total = conn.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+        if total > self.max_entries:
+            conn.execute(
+                'DELETE FROM seen WHERE key IN (SELECT key FROM seen ORDER BY seen_at LIMIT ?)',
+                (total - self.max_entries,)
+            )
+        self._inserts = 0
+
+    async def filter_unseen(self, consumer: str, articles: List[Dict]) -> List[Dict]:
+        return await asyncio.to_thread(self._filter_unseen, consumer, articles)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_seen_store(backend: Optional[str], path: Optional[str] = None, capacity: int = 100000) -> Optional[SeenStore]:
+    if not backend or backend == 'none':
+        return None
+    if backend == 'bloom':
+        return BloomSeenStore(capacity=capacity, path=path)
+    if backend == 'sqlite':
+        return SQLiteSeenStore(path or 'cache/seen.db', max_entries=capacity)
+    raise ValueError(f"Unknown seen store backend: {backend}")
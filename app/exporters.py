@@ -1,48 +1,377 @@
+import asyncio
 import csv
+import io
 import json
-from typing import List, Dict, Any
-from fastapi import HTTPException
+import logging
 import os
+import pickle
+import tempfile
+import zlib
+from typing import List, Dict, Any, AsyncIterable, AsyncIterator, Iterable, Optional, Tuple, Union
+import aiofiles
+from fastapi import HTTPException
+
+try:
+    import zstandard
+except ImportError:  # zstd compression is optional
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:  # columnar formats are optional
+    pa = None
+
+Records = Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]
+
+# format -> (media type, file extension)
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'json': ('application/json', 'json'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'txt': ('text/plain', 'txt'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrow')
+}
+COMPRESSIONS = {
+    'gzip': ('application/gzip', 'gz'),
+    'zstd': ('application/zstd', 'zst')
+}
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def aiter_records(records: Records) -> AsyncIterator[Dict[str, Any]]:
+    """Iterate sync or async record sources the same way"""
+    if hasattr(records, '__aiter__'):
+        async for record in records:
+            yield record
+    else:
+        for record in records:
+            yield record
+
+
+def _as_text(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return str(value)
+
+
+def _column_type(values: List[Any]) -> 'pa.DataType':
+    """Arrow type of one column's values; mixed values become strings"""
+    try:
+        return pa.array(values).type
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError, OverflowError):
+        return pa.string()
+
+
+def _unify_types(current: 'pa.DataType', seen: 'pa.DataType') -> 'pa.DataType':
+    """One type for a column across batches: nulls defer, ints widen to floats, other clashes become strings"""
+    if current == seen or pa.types.is_null(seen):
+        return current
+    if pa.types.is_null(current):
+        return seen
+    numeric = (pa.types.is_integer, pa.types.is_floating)
+    if any(check(current) for check in numeric) and any(check(seen) for check in numeric):
+        return pa.float64()
+    return pa.string()
+
+
+def _conform(batch: List[Dict[str, Any]], schema: 'pa.Schema') -> 'pa.Table':
+    """The batch as a table of exactly `schema`; missing keys are null and extra keys are dropped"""
+    columns = []
+    for field in schema:
+        values = [record.get(field.name) for record in batch]
+        if pa.types.is_string(field.type):
+            values = [_as_text(value) for value in values]
+        columns.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def _read_spool(spool, limit: int) -> List[Dict[str, Any]]:
+    batch = []
+    while len(batch) < limit:
+        try:
+            batch.append(pickle.load(spool))
+        except EOFError:
+            break
+    return batch
+
+
+class _ChunkSink:
+    """Write-only file object collecting bytes until drained"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
 
 class DataExporter:
-    def __init__(self, data: List[Dict[str, Any]]):
+    """Streams records out as CSV, JSON, NDJSON, TXT, Parquet or Arrow IPC.
+
+    `data` may be a list or any (async) iterable and is consumed once, in
+    constant memory apart from the CSV header sample and columnar batches.
+    Columnar exports without `fields` spool to a temporary file first so
+    their schema covers every record.
+    """
+
+    def __init__(self, data: Records, fields: Optional[List[str]] = None, export_dir: str = 'exports',
+                 header_sample: int = 100, batch_size: int = 10000):
         self.data = data
+        self.fields = fields
+        self.export_dir = export_dir
+        self.header_sample = header_sample
+        self.batch_size = batch_size
+
+    @staticmethod
+    def validate(format: str, compression: Optional[str] = None):
+        if format not in FORMATS:
+            raise HTTPException(status_code=400, detail=f"Unsupported export format: {format}")
+        if compression and compression not in COMPRESSIONS:
+            raise HTTPException(status_code=400, detail=f"Unsupported compression: {compression}")
+        if compression == 'zstd' and zstandard is None:
+            raise HTTPException(status_code=400, detail="zstd compression requires the zstandard package")
+        if format in COLUMNAR_FORMATS and pa is None:
+            raise HTTPException(status_code=400, detail=f"{format} export requires the pyarrow package")
+
+    @staticmethod
+    def media_type(format: str, compression: Optional[str] = None) -> str:
+        return COMPRESSIONS[compression][0] if compression else FORMATS[format][0]
+
+    @staticmethod
+    def extension(format: str, compression: Optional[str] = None) -> str:
+        extension = FORMATS[format][1]
+        return f"{extension}.{COMPRESSIONS[compression][1]}" if compression else extension
+
+    async def _csv_chunks(self, records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+        # Headers are the union of keys over the first records, not just the first one
+        sample = []
+        fields = list(self.fields) if self.fields else []
+        if not self.fields:
+            async for record in records:
+                sample.append(record)
+                for key in record:
+                    if key not in fields:
+                        fields.append(key)
+                if len(sample) >= self.header_sample:
+                    break
+
+        buffer = io.StringIO()
+        if not fields:
+            csv.writer(buffer).writerow(['No data available'])
+            yield buffer.getvalue()
+            return
+
+        writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        warned = False
+
+        async def rows():
+            for record in sample:
+                yield record
+            async for record in records:
+                yield record
+
+        async for record in rows():
+            if not warned and not self.fields and any(key not in fields for key in record):
+                logging.warning("CSV export dropping fields not seen in the header sample")
+                warned = True
+            writer.writerow(record)
+            if buffer.tell() >= CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    async def _ndjson_chunks(self, records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+        async for record in records:
+            yield json.dumps(record, ensure_ascii=False) + '\n'
+
+    async def _json_chunks(self, records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+        separator = '[\n'
+        async for record in records:
+            yield separator + json.dumps(record, ensure_ascii=False, indent=2)
+            separator = ',\n'
+        yield '[]' if separator == '[\n' else '\n]'
+
+    async def _txt_chunks(self, records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+        async for item in records:
+            lines = ['---Article---\n']
+            lines.extend(f"{key}: {value}\n" for key, value in item.items())
+            lines.append('\n')
+            yield ''.join(lines)
+
+    async def _batches(self, records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[List[Dict[str, Any]]]:
+        batch = []
+        async for record in records:
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def _spool(self, records: AsyncIterator[Dict[str, Any]]) -> Tuple[Any, 'pa.Schema']:
+        """Copy the records to a temporary file, working out the schema over all of them.
+
+        A columnar file's schema is written before its first row, so without
+        `fields` every record has to be seen first; spooling keeps that to
+        one batch in memory.
+        """
+        spool = tempfile.TemporaryFile()
+        types: Dict[str, 'pa.DataType'] = {}
+
+        def write(batch: List[Dict[str, Any]]):
+            for record in batch:
+                pickle.dump(record, spool, pickle.HIGHEST_PROTOCOL)
+                for key in record:
+                    types.setdefault(key, pa.null())
+            for key, current in types.items():
+                types[key] = _unify_types(current, _column_type([record.get(key) for record in batch]))
 
-    async def to_csv(self, filename: str) -> str:
         try:
-            filepath = f"exports/{filename}.csv"
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                if not self.data:
-                    writer = csv.writer(f)
-                    writer.writerow(['No data available'])
-                else:
-                    # Get headers from first item
-                    headers = list(self.data[0].keys())
-                    writer = csv.DictWriter(f, fieldnames=headers)
-                    writer.writeheader()
-                    writer.writerows(self.data)
-            return filepath
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error exporting to CSV: {str(e)}")
+            async for batch in self._batches(records):
+                await asyncio.to_thread(write, batch)
+        except BaseException:
+            spool.close()
+            raise
+        spool.seek(0)
+        # Columns that were always null fall back to strings
+        schema = pa.schema([(key, pa.string() if pa.types.is_null(type) else type) for key, type in types.items()])
+        return spool, schema
+
+    async def _columnar_chunks(self, records: AsyncIterator[Dict[str, Any]], format: str) -> AsyncIterator[bytes]:
+        # With fields the schema is fixed up front: one nullable string column per field
+        if self.fields:
+            spool = None
+            schema = pa.schema([(field, pa.string()) for field in self.fields])
+            batches = self._batches(records)
+        else:
+            spool, schema = await self._spool(records)
+
+            async def spooled():
+                while True:
+                    batch = await asyncio.to_thread(_read_spool, spool, self.batch_size)
+                    if not batch:
+                        return
+                    yield batch
+
+            batches = spooled()
+
+        sink = _ChunkSink()
+        target = pa.PythonFile(sink, mode='w')
+        if format == 'parquet':
+            writer = pq.ParquetWriter(target, schema)
+        else:
+            writer = pa.ipc.new_stream(target, schema)
+
+        def write_batch(batch: List[Dict[str, Any]]):
+            writer.write_table(_conform(batch, schema))
+            return sink.drain()
 
-    async def to_json(self, filename: str) -> str:
         try:
-            filepath = f"exports/{filename}.json"
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
-            return filepath
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error exporting to JSON: {str(e)}")
+            async for batch in batches:
+                yield await asyncio.to_thread(write_batch, batch)
+            writer.close()
+            yield sink.drain()
+        finally:
+            if spool is not None:
+                spool.close()
 
-    async def to_txt(self, filename: str) -> str:
+    async def _encoded(self, format: str) -> AsyncIterator[bytes]:
+        records = aiter_records(self.data)
+        if format in COLUMNAR_FORMATS:
+            async for chunk in self._columnar_chunks(records, format):
+                yield chunk
+            return
+
+        encoders = {
+            'csv': self._csv_chunks,
+            'json': self._json_chunks,
+            'ndjson': self._ndjson_chunks,
+            'txt': self._txt_chunks
+        }
+        pending = []
+        size = 0
+        async for text in encoders[format](records):
+            pending.append(text)
+            size += len(text)
+            if size >= CHUNK_SIZE:
+                yield ''.join(pending).encode('utf-8')
+                pending = []
+                size = 0
+        if pending:
+            yield ''.join(pending).encode('utf-8')
+
+    async def stream(self, format: str, compression: Optional[str] = None) -> AsyncIterator[bytes]:
+        """Yield the export as byte chunks, optionally gzip or zstd compressed"""
+        self.validate(format, compression)
+        if compression == 'gzip':
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        elif compression == 'zstd':
+            compressor = zstandard.ZstdCompressor().compressobj()
+        else:
+            compressor = None
+
+        async for chunk in self._encoded(format):
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+        if compressor is not None:
+            yield compressor.flush()
+
+    async def export(self, filename: str, format: str, compression: Optional[str] = None) -> str:
+        """Write the export under export_dir without blocking the event loop"""
+        self.validate(format, compression)
         try:
-            filepath = f"exports/{filename}.txt"
-            with open(filepath, 'w', encoding='utf-8') as f:
-                for item in self.data:
-                    f.write('---Article---\n')
-                    for key, value in item.items():
-                        f.write(f"{key}: {value}\n")
-                    f.write('\n')
+            os.makedirs(self.export_dir, exist_ok=True)
+            filepath = os.path.join(self.export_dir, f"{filename}.{self.extension(format, compression)}")
+            async with aiofiles.open(filepath, 'wb') as f:
+                async for chunk in self.stream(format, compression):
+                    await f.write(chunk)
             return filepath
+        except HTTPException:
+            raise
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error exporting to TXT: {str(e)}") 
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=f"Error exporting to {format.upper()}: {str(e)}")
+
+    async def to_csv(self, filename: str) -> str:
+        return await self.export(filename, 'csv')
+
+    async def to_json(self, filename: str) -> str:
+        return await self.export(filename, 'json')
+
+    async def to_txt(self, filename: str) -> str:
+        return await self.export(filename, 'txt')
+
+    async def to_ndjson(self, filename: str, compression: Optional[str] = None) -> str:
+        return await self.export(filename, 'ndjson', compression)
+
+    async def to_parquet(self, filename: str) -> str:
+        return await self.export(filename, 'parquet')
@@ -0,0 +1,89 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import pytz
+from .article_extractor import ArticleExtractor
+from .date_parser import DateNormalizer
+from .listing_extractor import ListingExtractor
+from .parsers import get_parser_backend
+from .site_registry import ExtractionPlan, SiteRegistry
+
+# Per-worker site plans and extractors, created once by the pool initializer
+_worker_registry: Optional[SiteRegistry] = None
+_listing_extractor: Optional[ListingExtractor] = None
+_article_extractor: Optional[ArticleExtractor] = None
+
+
+def _init_worker(site_config_dir: str, parser_name: Optional[str], timezone: str):
+    """Build a parser backend, the site plans and the extractors, not a whole scraping engine"""
+    global _worker_registry, _listing_extractor, _article_extractor
+    parser = get_parser_backend(parser_name)
+    _worker_registry = SiteRegistry(site_config_dir, parser)
+    _listing_extractor = ListingExtractor(parser, DateNormalizer(pytz.timezone(timezone)))
+    _article_extractor = ArticleExtractor(parser)
+
+
+def _warm() -> int:
+    return os.getpid()
+
+
+def _plan(domain: str, version: Tuple) -> ExtractionPlan:
+    registry = _worker_registry
+    if registry.version != version:
+        # The parent picked up changed site files, follow it
+        registry.load()
+    return registry.plans[domain]
+
+
+def _extract(domain: str, html: str, version: Tuple) -> List[Dict]:
+    return _listing_extractor.extract(html, _plan(domain, version))
+
+
+def _extract_article(domain: str, html: str, version: Tuple) -> Dict:
+    return _article_extractor.extract(html, _plan(domain, version).article_selectors)
+
+
+class ExtractionPool:
+    """Runs parsing and extraction in worker processes, off the event loop"""
+
+    def __init__(self, workers: Optional[int], site_config_dir: str, parser_name: Optional[str] = None,
+                 timezone: str = 'Asia/Kolkata'):
+        self.workers = workers or os.cpu_count() or 1
+        self.site_config_dir = site_config_dir
+        self.parser_name = parser_name
+        self.timezone = timezone
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    async def start(self):
+        if self.executor is not None:
+            return
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.site_config_dir, self.parser_name, self.timezone)
+        )
+        # Spawn every worker now rather than on the first scrape
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _warm) for _ in range(self.workers)))
+
+    async def close(self):
+        if self.executor is not None:
+            executor, self.executor = self.executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    async def extract(self, domain: str, html: str, version: Tuple) -> List[Dict]:
+        """Extract articles from raw HTML in a worker, returning plain dicts"""
+        if self.executor is None:
+            await self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _extract, domain, html, version)
+
+    async def extract_article(self, domain: str, html: str, version: Tuple) -> Dict:
+        """Extract one article page's details in a worker"""
+        if self.executor is None:
+            await self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _extract_article, domain, html, version)
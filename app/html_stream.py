@@ -0,0 +1,145 @@
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Tuple, Union
+
+try:
+    import lxml.html
+    from lxml import etree
+    from cssselect import HTMLTranslator, parse as parse_css
+    from cssselect.parser import CombinedSelector, Element
+except ImportError:  # streaming extraction needs lxml, like the lxml parser backend
+    lxml = None
+
+Source = Union[str, bytes, Iterable[Union[str, bytes]], AsyncIterable[Union[str, bytes]]]
+
+# Feed size for documents handed over whole; the tree never holds more than a record anyway
+CHUNK_SIZE = 64 * 1024
+
+
+class ElementMatcher:
+    """Tests one element against a CSS selector while its document is still being parsed.
+
+    Only the element and its ancestors are looked at, since earlier siblings
+    may already be discarded; selectors with `+` or `~` are rejected.
+    """
+
+    def __init__(self, selector: str, translator: 'HTMLTranslator'):
+        self.selector = selector
+        self.translator = translator
+        trees = [parsed.parsed_tree for parsed in parse_css(selector)]
+        self.chains = [self._compile(tree) for tree in trees]
+        # Tags the selector can end on, None when any tag can; most elements fail this cheap check
+        tags = {self._tag(tree.subselector if isinstance(tree, CombinedSelector) else tree) for tree in trees}
+        self.tags = None if None in tags else tags
+
+    @staticmethod
+    def _tag(compound) -> str:
+        while not isinstance(compound, Element):
+            compound = compound.selector
+        return compound.element.lower() if compound.element else None
+
+    def _compile(self, tree) -> Tuple:
+        """(XPath testing the rightmost compound, combinator, chain for the rest)"""
+        if not isinstance(tree, CombinedSelector):
+            return self._self_xpath(tree), None, None
+        if tree.combinator not in (' ', '>'):
+            raise ValueError(f"Sibling combinators are not supported when streaming: {self.selector}")
+        return self._self_xpath(tree.subselector), tree.combinator, self._compile(tree.selector)
+
+    def _self_xpath(self, compound):
+        return etree.XPath(self.translator.css_to_xpath(compound.canonical(), prefix='self::'))
+
+    def _matches(self, element, chain: Tuple) -> bool:
+        xpath, combinator, rest = chain
+        if not xpath(element):
+            return False
+        if combinator is None:
+            return True
+        parent = element.getparent()
+        if combinator == '>':
+            return parent is not None and self._matches(parent, rest)
+        while parent is not None:
+            if self._matches(parent, rest):
+                return True
+            parent = parent.getparent()
+        return False
+
+    def __call__(self, element) -> bool:
+        if self.tags is not None and element.tag not in self.tags:
+            return False
+        return any(self._matches(element, chain) for chain in self.chains)
+
+
+async def iter_chunks(source: Source) -> AsyncIterator[Union[str, bytes]]:
+    """A whole document, or sync or async chunks of one, as chunks"""
+    if isinstance(source, (str, bytes)):
+        for start in range(0, len(source), CHUNK_SIZE):
+            yield source[start:start + CHUNK_SIZE]
+    elif hasattr(source, '__aiter__'):
+        async for chunk in source:
+            yield chunk
+    else:
+        for chunk in source:
+            yield chunk
+
+
+class StreamingParser:
+    """Incremental HTML parsing that hands out matching elements as they close.
+
+    `records` matches the repeated containers (reviews, posts, jobs). Each
+    one is yielded complete and then dropped from the tree. Elements outside
+    any record are tested against the `context` matchers and dropped as soon
+    as they close. The tree is never more than the open ancestors plus the
+    record being built.
+    """
+
+    def __init__(self, records: str, context: Dict[str, str] = None):
+        if lxml is None:
+            raise ImportError("Streaming extraction requires the lxml and cssselect packages")
+        translator = HTMLTranslator()
+        self.records = ElementMatcher(records, translator)
+        self.context = {name: ElementMatcher(selector, translator) for name, selector in (context or {}).items()}
+
+    @staticmethod
+    def _discard(element):
+        # Drop the element's content and everything before it; the parser only holds open ancestors
+        element.clear(keep_tail=False)
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
+    def _events(self, parser, state: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        matched = []
+        for event, element in parser.read_events():
+            if event == 'start':
+                if self.records(element):
+                    state['opened'].add(element)
+                continue
+            if element in state['opened']:
+                state['opened'].discard(element)
+                matched.append(('record', element))
+            elif not state['opened']:
+                for name, matcher in self.context.items():
+                    if matcher(element):
+                        matched.append((name, element))
+                        break
+                else:
+                    self._discard(element)
+        return matched
+
+    async def elements(self, source: Source) -> AsyncIterator[Tuple[str, Any]]:
+        """("record" or a context name, element) pairs in document order; use each before the next"""
+        parser = etree.HTMLPullParser(events=('start', 'end'))
+        parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+        state = {'opened': set()}
+        async for chunk in iter_chunks(source):
+            parser.feed(chunk)
+            for name, element in self._events(parser, state):
+                yield name, element
+                if not state['opened']:
+                    self._discard(element)
+            # Large documents are CPU work; let other requests run between chunks
+            await asyncio.sleep(0)
+        parser.close()
+        for name, element in self._events(parser, state):
+            yield name, element
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class CachedResponse:
+    def __init__(self, body: str, etag: Optional[str], last_modified: Optional[str], stored_at: float):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.stored_at < ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Validators to send when revalidating this entry"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """Persistent on-disk HTTP cache keyed by URL with LRU eviction"""
+
+    def __init__(self, path: str, max_bytes: int = 100 * 1024 * 1024, ttl: float = 300):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'revalidations': 0,
+            'bytes_saved': 0
+        }
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'url TEXT PRIMARY KEY, body TEXT NOT NULL, etag TEXT, last_modified TEXT, '
+                'size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)')
+            self._conn.commit()
+        return self._conn
+
+    def _get(self, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT body, etag, last_modified, stored_at FROM entries WHERE url = ?', (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute('UPDATE entries SET accessed_at = ? WHERE url = ?', (time.time(), url))
+            conn.commit()
+            return CachedResponse(*row)
+
+    def _put(self, url: str, body: str, etag: Optional[str], last_modified: Optional[str]):
+        size = len(body.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (url, body, etag, last_modified, size, now, now)
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _refresh(self, url: str):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute('UPDATE entries SET stored_at = ?, accessed_at = ? WHERE url = ?', (now, now, url))
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in conn.execute('SELECT url, size FROM entries ORDER BY accessed_at').fetchall():
+            conn.execute('DELETE FROM entries WHERE url = ?', (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    async def get(self, url: str) -> Optional[CachedResponse]:
+        return await asyncio.to_thread(self._get, url)
+
+    async def put(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        await asyncio.to_thread(self._put, url, body, etag, last_modified)
+
+    async def refresh(self, url: str):
+        """Mark an entry as fresh again after a 304"""
+        await asyncio.to_thread(self._refresh, url)
+
+    def record_hit(self, entry: CachedResponse):
+        self.stats['hits'] += 1
+        self.stats['bytes_saved'] += len(entry.body.encode('utf-8'))
+
+    def record_revalidation(self, entry: CachedResponse):
+        self.stats['revalidations'] += 1
+        self.stats['bytes_saved'] += len(entry.body.encode('utf-8'))
+
+    def record_miss(self):
+        self.stats['misses'] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
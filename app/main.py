@@ -1,9 +1,25 @@
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import Depends, FastAPI, Request, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from typing import List, Optional
+import json
 import logging
+import os
+import time
+from .api import routes
+from .auth import get_current_user
+from .exporters import DataExporter
+from .middleware.profiling import ProfilingMiddleware
+from .middleware.rate_limiter import RateLimiter, RateLimitMiddleware, create_token_bucket_store
+from .models import ScraperRun
+from .notifications import close_notifiers
+from .profiling import profiler
+from .queue_manager import queue_manager
+from .routers import scrapers
+from .scheduler import cron_scheduler
 from .scraping_engine import scraping_engine
+from .storage import result_store
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -11,20 +27,65 @@ logging.basicConfig(level=logging.INFO)
 # Initialize FastAPI app
 app = FastAPI(title="Education News Scraper")
 
+# Per-client rate limiting, shared through Redis when REDIS_URL is set.
+# Clients are keyed by peer address unless TRUSTED_PROXY_HOPS reverse proxies sit in front.
+requests_per_minute = int(os.getenv("RATE_LIMIT_PER_MINUTE", 60))
+if requests_per_minute > 0:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=RateLimiter(requests_per_minute, store=create_token_bucket_store(os.getenv("REDIS_URL"))),
+        trusted_proxy_hops=int(os.getenv("TRUSTED_PROXY_HOPS", 0))
+    )
+
+# Flamegraph input for a fraction of requests when PROFILE_SAMPLE_RATE is set
+if profiler.enabled:
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 templates = Jinja2Templates(directory="app/templates")
 
+# Stored scrapers, runs and results
+app.include_router(scrapers.router)
+# Per-site scraping, Google Maps reviews and the supported-site list
+app.include_router(routes.router)
+
+@app.on_event("startup")
+async def startup():
+    """Open the scraping engine's connection pool and start the job workers and scheduler"""
+    await scraping_engine.start()
+    await queue_manager.start()
+    for scraper in await result_store.scheduled_scrapers():
+        try:
+            cron_scheduler.add(scraper["id"], scraper["schedule"], {"url": scraper["target_url"]})
+        except ValueError as e:
+            logging.error(f"Invalid schedule for scraper {scraper['id']}: {str(e)}")
+    await cron_scheduler.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop the scheduler and job workers and close the scraping engine's connection pool"""
+    await cron_scheduler.close()
+    await queue_manager.close()
+    await close_notifiers()
+    result_store.close()
+    await scraping_engine.close()
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Render home page"""
     return templates.TemplateResponse("index.html", {"request": request})
 
 @app.get("/scrape")
-async def scrape_news(url: str):
+async def scrape_news(url: str, unseen_for: Optional[str] = None, deep: bool = False):
     try:
         logging.info(f"Starting scraping for URL: {url}")
-        results = await scraping_engine.scrape_website(url)
+        if deep:
+            results = await scraping_engine.scrape_website_deep(url)
+        else:
+            results = await scraping_engine.scrape_cached(url)
+        if unseen_for:
+            results = await scraping_engine.filter_unseen(unseen_for, results)
         
         if not results:
             logging.warning("No results found")
@@ -35,11 +96,14 @@ async def scrape_news(url: str):
             })
 
         logging.info(f"Successfully scraped {len(results)} articles")
-        return JSONResponse({
+        started = time.perf_counter()
+        response = JSONResponse({
             "status": "success",
             "message": f"Successfully scraped {len(results)} articles",
             "data": results
         })
+        scraping_engine.metrics.observe("serialize", scraping_engine.site_label(url), time.perf_counter() - started)
+        return response
 
     except Exception as e:
         logging.error(f"Scraping error: {str(e)}")
@@ -49,6 +113,172 @@ async def scrape_news(url: str):
             "data": []
         }, status_code=500)
 
+@app.get("/scrape/all")
+async def scrape_all_sites(sites: Optional[str] = None, format: str = "ndjson", concurrency: int = 4):
+    """Scrape every configured site (or a comma-separated subset) and stream results as they finish"""
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+    site_list = [site.strip() for site in sites.split(",") if site.strip()] if sites else None
+
+    async def stream():
+        async for result in scraping_engine.scrape_sites(site_list, concurrency):
+            if result["status"] == "error":
+                logging.error(f"Scraping error for {result['site']}: {result['message']}")
+            payload = json.dumps(result, ensure_ascii=False)
+            if format == "sse":
+                event = "error" if result["status"] == "error" else "site"
+                yield f"event: {event}\ndata: {payload}\n\n"
+            else:
+                yield payload + "\n"
+        if format == "sse":
+            yield "event: done\ndata: {}\n\n"
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(stream(), media_type=media_type)
+
+@app.get("/scrape/deep")
+async def scrape_deep(url: str, format: str = "ndjson"):
+    """Stream the listing at once, then each article with its full body as it is fetched"""
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+    if scraping_engine.get_site_plan(url) is None:
+        raise HTTPException(status_code=400, detail=f"Unsupported website: {url}")
+
+    async def stream():
+        try:
+            async for event in scraping_engine.scrape_deep(url):
+                payload = json.dumps(event["data"], ensure_ascii=False)
+                if format == "sse":
+                    yield f"event: {event['type']}\ndata: {payload}\n\n"
+                else:
+                    yield json.dumps(event, ensure_ascii=False) + "\n"
+        except Exception as e:
+            logging.error(f"Deep scraping error for {url}: {str(e)}")
+            error = {"type": "error", "message": str(e)}
+            if format == "sse":
+                yield f"event: error\ndata: {json.dumps(error)}\n\n"
+            else:
+                yield json.dumps(error) + "\n"
+        if format == "sse":
+            yield "event: done\ndata: {}\n\n"
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(stream(), media_type=media_type)
+
+@app.get("/export/{format}")
+async def export_articles(format: str, url: Optional[str] = None, compression: Optional[str] = None):
+    """Stream an export of one listing page, or of every configured site, as a chunked download"""
+    DataExporter.validate(format, compression)
+
+    async def records():
+        if url:
+            for article in await scraping_engine.scrape_cached(url):
+                yield article
+            return
+        async for result in scraping_engine.scrape_sites():
+            for article in result["data"]:
+                yield article
+
+    exporter = DataExporter(records(), fields=["title", "link", "summary", "published_date", "source"])
+    filename = f"scraped_data.{DataExporter.extension(format, compression)}"
+    return StreamingResponse(
+        exporter.stream(format, compression),
+        media_type=DataExporter.media_type(format, compression),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/stories")
+async def list_stories(refresh: bool = False, min_size: int = 1, limit: int = 100):
+    """One representative article per story seen across sites, most recent first"""
+    if scraping_engine.clusterer is None:
+        return {"status": "disabled", "data": []}
+    if refresh:
+        async for result in scraping_engine.scrape_sites():
+            if result["status"] == "error":
+                logging.error(f"Scraping error for {result['site']}: {result['message']}")
+    stories = scraping_engine.clusterer.representatives(min_size)
+    return {
+        "status": "success",
+        "stats": scraping_engine.clusterer.get_stats(),
+        "data": stories[:limit]
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Per-site, per-stage scrape metrics in the Prometheus text format"""
+    return PlainTextResponse(scraping_engine.metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """HTTP cache hit, miss and revalidation counts"""
+    if scraping_engine.http_cache is None:
+        return {"status": "disabled", "data": {}}
+    return {"status": "success", "data": scraping_engine.http_cache.get_stats()}
+
+@app.get("/scheduler/stats")
+async def scheduler_stats():
+    """Per-host queue depth, wait times and current pacing of outbound fetches"""
+    if scraping_engine.scheduler is None:
+        return {"status": "disabled", "data": {}}
+    articles = scraping_engine.article_scheduler
+    return {
+        "status": "success",
+        "data": scraping_engine.scheduler.get_stats(),
+        "articles": articles.get_stats() if articles is not None else {}
+    }
+
+@app.get("/proxies/stats")
+async def proxy_stats():
+    """Health, latency and circuit state of each outbound proxy"""
+    if scraping_engine.proxy_pool is None:
+        return {"status": "disabled", "data": {}}
+    return {
+        "status": "success",
+        "data": scraping_engine.proxy_pool.get_stats(),
+        "direct_fallbacks": scraping_engine.proxy_pool.direct_fallbacks
+    }
+
+@app.get("/browsers/stats")
+async def browser_stats():
+    """Headless browser pool usage for JavaScript-rendered pages"""
+    if scraping_engine.browser_pool is None:
+        return {"status": "disabled", "data": {}}
+    return {"status": "success", "data": scraping_engine.browser_pool.get_stats()}
+
+@app.post("/jobs")
+async def enqueue_jobs(runs: List[ScraperRun], priority: int = 0, user: str = Depends(get_current_user)):
+    """Queue scraper runs in one batch; higher priority runs first.
+
+    A run is for one of the caller's scrapers, or for a supported site by
+    domain, which scrapes that site's education page.
+    """
+    for run in runs:
+        scraper = await result_store.get_scraper(run.scraper_id)
+        if scraper is not None:
+            if scraper["user"] != user:
+                raise HTTPException(status_code=404, detail=f"Scraper not found: {run.scraper_id}")
+        elif run.scraper_id not in scraping_engine.registry.plans:
+            raise HTTPException(status_code=404, detail=f"Scraper not found: {run.scraper_id}")
+        elif (run.parameters or {}).get("url"):
+            raise HTTPException(status_code=400, detail="Supported-site runs scrape the site's own page and take no url")
+    job_ids = await queue_manager.add_jobs(runs, priority)
+    return {"status": "success", "data": job_ids}
+
+@app.get("/jobs/stats")
+async def job_stats():
+    return {"status": "success", "data": await queue_manager.get_stats()}
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    status = await queue_manager.get_job_status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"status": "success", "data": status}
+
+@app.get("/schedules")
+async def list_schedules():
+    return {"status": "success", "data": cron_scheduler.get_stats()}
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -0,0 +1,33 @@
+import re
+from typing import Sequence
+from ..profiling import SamplingProfiler
+
+LABEL_RE = re.compile(r'[^A-Za-z0-9]+')
+
+
+class ProfilingMiddleware:
+    """ASGI middleware running a sampled fraction of requests under the profiler"""
+
+    def __init__(self, app, profiler: SamplingProfiler,
+                 exempt_paths: Sequence[str] = ('/metrics', '/health', '/static')):
+        self.app = app
+        self.profiler = profiler
+        self.exempt_paths = tuple(exempt_paths)
+
+    async def __call__(self, scope, receive, send):
+        if (scope['type'] != 'http' or scope['path'].startswith(self.exempt_paths)
+                or not self.profiler.should_profile()):
+            await self.app(scope, receive, send)
+            return
+
+        label = LABEL_RE.sub('_', scope['path']).strip('_') or 'root'
+        async with self.profiler.profile(label) as filename:
+            async def send_with_header(message):
+                # Name the caller's profile file without revealing where it lives on the server
+                if filename is not None and message['type'] == 'http.response.start':
+                    message = dict(message, headers=list(message.get('headers', [])) + [
+                        (b'x-profile', filename.encode('utf-8'))
+                    ])
+                await send(message)
+
+            await self.app(scope, receive, send_with_header)
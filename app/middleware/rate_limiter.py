@@ -1,25 +1,216 @@
-from fastapi import Request, HTTPException
-import time
-from redis import Redis
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from collections import OrderedDict
+from functools import partial
+from typing import Callable, Dict, Optional, Sequence, Tuple
 import asyncio
+import logging
+import math
+import time
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # Redis is optional, the in-memory store covers single-node use
+    redis_asyncio = None
+
+# Token bucket refill, return of a lease's unused tokens and take in one atomic
+# server-side step. Returns how many of the requested tokens were granted.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local returned = tonumber(ARGV[4]) or 0
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate + returned)
+local granted = math.min(requested, math.floor(tokens))
+tokens = tokens - granted
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return granted
+"""
+
+
+class TokenBucketStore:
+    """Shared token buckets; take() must be atomic per key"""
+
+    async def take(self, key: str, requested: int, rate: float, capacity: int, returned: int = 0) -> int:
+        """Give back `returned` unused tokens, then take up to `requested`"""
+        raise NotImplementedError
+
+
+class RedisTokenBucketStore(TokenBucketStore):
+    """Buckets kept in Redis, updated by a Lua script in a single round-trip"""
+
+    def __init__(self, client):
+        self.client = client
+        self.script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def take(self, key: str, requested: int, rate: float, capacity: int, returned: int = 0) -> int:
+        return int(await self.script(keys=[key], args=[rate, capacity, requested, returned]))
+
+
+class MemoryTokenBucketStore(TokenBucketStore):
+    """In-process stand-in for Redis with the same bucket semantics"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.buckets: Dict[str, Tuple[float, float]] = {}
+
+    async def take(self, key: str, requested: int, rate: float, capacity: int, returned: int = 0) -> int:
+        now = self.clock()
+        tokens, ts = self.buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + max(0.0, now - ts) * rate + returned)
+        granted = min(requested, math.floor(tokens))
+        self.buckets[key] = (tokens - granted, now)
+        return granted
+
+
+class _Lease:
+    __slots__ = ('tokens', 'expires', 'blocked_until')
+
+    def __init__(self):
+        self.tokens = 0
+        self.expires = 0.0
+        # Set when the shared bucket is empty so denials are also answered locally
+        self.blocked_until = 0.0
 
-redis_client = Redis(host='localhost', port=6379, db=0)
 
 class RateLimiter:
-    def __init__(self, requests_per_minute: int = 60):
+    """Two-tier token bucket limiter.
+
+    Each process leases tokens from the shared store in batches and spends
+    them locally, so most checks never leave the process. Leased tokens are
+    already removed from the shared bucket, so the global limit holds across
+    processes. Tokens left in an expired lease go back to the bucket with the
+    next refill, so a slow client does not drain it. If the store is
+    unreachable, requests are allowed (fail open).
+    """
+
+    def __init__(self, requests_per_minute: int = 60, store: Optional[TokenBucketStore] = None,
+                 batch_size: int = 10, lease_ttl: float = 1.0, timeout: float = 0.05,
+                 max_clients: int = 100000):
         self.requests_per_minute = requests_per_minute
-        self.redis = redis_client
+        self.rate = requests_per_minute / 60
+        self.capacity = requests_per_minute
+        self.store = store or MemoryTokenBucketStore()
+        self.batch_size = max(1, min(batch_size, requests_per_minute))
+        self.lease_ttl = lease_ttl
+        self.timeout = timeout
+        self.max_clients = max_clients
+        self._leases: 'OrderedDict[str, _Lease]' = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._last_error = 0.0
+
+    def _lease(self, client_id: str) -> _Lease:
+        lease = self._leases.get(client_id)
+        if lease is None:
+            lease = self._leases[client_id] = _Lease()
+            if len(self._leases) > self.max_clients:
+                self._leases.popitem(last=False)
+        else:
+            self._leases.move_to_end(client_id)
+        return lease
+
+    async def _refill(self, client_id: str, lease: _Lease) -> None:
+        # Only called once the lease is empty or expired; its leftovers ride along with the take
+        returned, lease.tokens = lease.tokens, 0
+        try:
+            granted = await asyncio.wait_for(
+                self.store.take(f"rate_limit:{client_id}", self.batch_size, self.rate, self.capacity, returned),
+                self.timeout
+            )
+        except Exception as e:
+            now = time.monotonic()
+            if now - self._last_error > 10:
+                logging.error(f"Rate limit store unavailable, allowing requests: {str(e)}")
+                self._last_error = now
+            # Fail open for this batch
+            granted = self.batch_size
+        now = time.monotonic()
+        lease.tokens = granted
+        lease.expires = now + self.lease_ttl
+        if not granted:
+            lease.blocked_until = now + 1 / self.rate
+
+    async def allow(self, client_id: str) -> bool:
+        lease = self._lease(client_id)
+        while True:
+            now = time.monotonic()
+            if lease.tokens > 0 and lease.expires > now:
+                lease.tokens -= 1
+                return True
+            if lease.blocked_until > now:
+                return False
+
+            # Concurrent requests from one client share a single store round-trip
+            pending = self._pending.get(client_id)
+            if pending is None:
+                pending = asyncio.ensure_future(self._refill(client_id, lease))
+                self._pending[client_id] = pending
+                pending.add_done_callback(lambda _: self._pending.pop(client_id, None))
+            await asyncio.shield(pending)
 
     async def check_rate_limit(self, client_id: str):
-        current = int(time.time())
-        key = f"rate_limit:{client_id}:{current // 60}"
-        
-        count = self.redis.incr(key)
-        if count == 1:
-            self.redis.expire(key, 60)
-        
-        if count > self.requests_per_minute:
+        if not await self.allow(client_id):
             raise HTTPException(
                 status_code=429,
                 detail="Rate limit exceeded. Please try again later."
-            ) 
\ No newline at end of file
+            )
+
+
+def client_ip(scope, trusted_proxy_hops: int = 0) -> str:
+    """The connecting peer's address, or with N trusted proxies in front the
+    X-Forwarded-For entry appended by the outermost one. Entries left of that
+    come from the client and can be forged, so they are never used.
+    """
+    client = scope.get('client')
+    peer = client[0] if client else 'unknown'
+    if trusted_proxy_hops <= 0:
+        return peer
+    forwarded = dict(scope.get('headers') or []).get(b'x-forwarded-for')
+    if not forwarded:
+        return peer
+    hops = [hop.strip() for hop in forwarded.decode('latin-1').split(',')]
+    if len(hops) < trusted_proxy_hops:
+        return peer
+    return hops[-trusted_proxy_hops] or peer
+
+
+class RateLimitMiddleware:
+    """ASGI middleware answering 429 once a client exceeds its limit"""
+
+    def __init__(self, app, limiter: RateLimiter, key_func: Optional[Callable] = None,
+                 exempt_paths: Sequence[str] = ('/health', '/static'), trusted_proxy_hops: int = 0):
+        self.app = app
+        self.limiter = limiter
+        self.key_func = key_func or partial(client_ip, trusted_proxy_hops=trusted_proxy_hops)
+        self.exempt_paths = tuple(exempt_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.limiter.allow(self.key_func(scope)):
+            retry_after = max(1, math.ceil(1 / self.limiter.rate))
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded. Please try again later."},
+                status_code=429,
+                headers={"Retry-After": str(retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+
+def create_token_bucket_store(redis_url: Optional[str] = None) -> TokenBucketStore:
+    if redis_url and redis_asyncio is not None:
+        return RedisTokenBucketStore(redis_asyncio.from_url(redis_url))
+    if redis_url:
+        logging.warning("redis package not installed, using in-memory rate limiting")
+    return MemoryTokenBucketStore()
@@ -1,29 +1,209 @@
 import aiohttp
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+import asyncio
 import json
 import logging
-import datetime
+import os
+import random
+import time
+from datetime import datetime, timezone
+from .politeness import parse_retry_after
+
+# Statuses worth retrying; any other failure is final
+RETRY_STATUSES = (408, 425, 429)
+
+
 class WebhookNotifier:
-    def __init__(self, webhook_url: str):
+    """Outbox for one webhook endpoint.
+
+    `notify` only enqueues. A background dispatcher gathers events for up to
+    `batch_window` seconds (or `max_batch` events) into one POST over a
+    pooled session, retries with exponential backoff and full jitter, and
+    appends batches that still fail to a dead-letter NDJSON file.
+    """
+
+    def __init__(self, webhook_url: str, batch_window: float = 1.0, max_batch: int = 100,
+                 max_retries: int = 5, base_delay: float = 0.5, max_delay: float = 30,
+                 timeout: float = 10, max_queue: int = 10000,
+                 dead_letter_path: Optional[str] = 'cache/webhook_dead_letter.ndjson'):
         self.webhook_url = webhook_url
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self.dead_letter_path = dead_letter_path
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        # Events taken off the queue but not yet delivered
+        self._batch: List[Dict[str, Any]] = []
+        self.stats = {
+            'queued': 0,
+            'sent': 0,
+            'batches': 0,
+            'retries': 0,
+            'dead_lettered': 0
+        }
 
-    async def send_notification(self, event_type: str, data: Dict[str, Any]):
-        payload = {
+    def _start(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue(self.max_queue)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    def notify(self, event_type: str, data: Dict[str, Any]):
+        """Queue an event for delivery and return immediately"""
+        self._start()
+        event = {
             "event": event_type,
             "data": data,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+        try:
+            self.queue.put_nowait(event)
+            self.stats['queued'] += 1
+        except asyncio.QueueFull:
+            logging.error(f"Webhook outbox full for {self.webhook_url}, dead-lettering event")
+            asyncio.create_task(self._dead_letter([event], 'outbox full'))
+
+    async def send_notification(self, event_type: str, data: Dict[str, Any]):
+        """Kept for existing callers; delivery happens in the background"""
+        self.notify(event_type, data)
+
+    async def _collect(self):
+        self._batch.append(await self.queue.get())
+        deadline = time.monotonic() + self.batch_window
+        while len(self._batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                self._batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _dispatch(self):
+        while True:
+            await self._collect()
+            batch = self._batch
+            try:
+                await self._deliver(batch)
+            except Exception as e:
+                # Never let one bad batch stop the dispatcher; a cancelled one stays for close()
+                logging.error(f"Webhook dispatch failed for {self.webhook_url}: {str(e)}")
+            self._batch = []
+            for _ in batch:
+                self.queue.task_done()
+
+    async def _post(self, batch: List[Dict[str, Any]]):
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        payload = {
+            "events": batch,
+            "count": len(batch),
+            "sent_at": datetime.now(timezone.utc).isoformat()
         }
+        # Events may carry values json can't encode natively, e.g. datetimes
+        async with self.session.post(
+            self.webhook_url,
+            data=json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8'),
+            headers={"Content-Type": "application/json"}
+        ) as response:
+            return response.status, response.headers.get('Retry-After'), await response.text()
 
-        async with aiohttp.ClientSession() as session:
+    async def _deliver(self, batch: List[Dict[str, Any]]):
+        error = None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
             try:
-                async with session.post(
-                    self.webhook_url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                ) as response:
-                    if response.status not in (200, 201, 202):
-                        logging.error(f"Webhook notification failed: {await response.text()}")
-                    return response.status
+                status, retry_after, text = await self._post(batch)
+                if 200 <= status < 300:
+                    self.stats['sent'] += len(batch)
+                    self.stats['batches'] += 1
+                    return
+                error = f"HTTP {status}: {text[:200]}"
+                if status < 500 and status not in RETRY_STATUSES:
+                    break
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                logging.error(f"Error sending webhook notification: {str(e)}")
-                return None 
\ No newline at end of file
+                error = str(e) or type(e).__name__
+            if attempt == self.max_retries:
+                break
+            self.stats['retries'] += 1
+            delay = parse_retry_after(retry_after)
+            if delay is None:
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            await asyncio.sleep(min(delay, self.max_delay))
+
+        logging.error(f"Webhook notification failed for {self.webhook_url}: {error}")
+        await self._dead_letter(batch, error)
+
+    def _write_dead_letter(self, record: Dict[str, Any]):
+        directory = os.path.dirname(self.dead_letter_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.dead_letter_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+    async def _dead_letter(self, batch: List[Dict[str, Any]], error: Optional[str]):
+        self.stats['dead_lettered'] += len(batch)
+        if not self.dead_letter_path:
+            return
+        record = {
+            "webhook_url": self.webhook_url,
+            "events": batch,
+            "error": error,
+            "failed_at": datetime.now(timezone.utc).isoformat()
+        }
+        try:
+            await asyncio.to_thread(self._write_dead_letter, record)
+        except Exception as e:
+            logging.error(f"Could not write webhook dead letter: {str(e)}")
+
+    async def flush(self, timeout: Optional[float] = None):
+        """Wait until everything queued so far has been delivered or dead-lettered"""
+        if self.queue is not None and self._dispatcher is not None:
+            await asyncio.wait_for(self.queue.join(), timeout)
+
+    async def close(self, timeout: float = 10):
+        try:
+            await self.flush(timeout)
+        except asyncio.TimeoutError:
+            logging.error(f"Webhook outbox for {self.webhook_url} not drained before shutdown")
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        if self.queue is not None:
+            # Whatever is left would be lost on exit
+            leftover, self._batch = self._batch, []
+            while not self.queue.empty():
+                leftover.append(self.queue.get_nowait())
+            if leftover:
+                await self._dead_letter(leftover, 'shutdown')
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+# One outbox, and so one pooled session, per endpoint
+notifiers: Dict[str, WebhookNotifier] = {}
+
+
+def get_notifier(webhook_url: str, **options) -> WebhookNotifier:
+    notifier = notifiers.get(webhook_url)
+    if notifier is None:
+        notifier = notifiers[webhook_url] = WebhookNotifier(webhook_url, **options)
+    return notifier
+
+
+async def close_notifiers():
+    await asyncio.gather(*(notifier.close() for notifier in notifiers.values()))
+    notifiers.clear()
@@ -0,0 +1,122 @@
+from typing import Any, Dict, List, Optional, Union
+from bs4 import BeautifulSoup
+import soupsieve
+
+try:
+    import lxml.html
+    from lxml import etree
+    from cssselect import HTMLTranslator
+except ImportError:  # lxml backend is optional
+    lxml = None
+
+
+class ParserBackend:
+    """Common interface over an HTML parser and its CSS selector engine"""
+    name = ''
+
+    def parse(self, html: str) -> Any:
+        raise NotImplementedError
+
+    def compile(self, selector: str) -> Any:
+        raise NotImplementedError
+
+    def select(self, node: Any, compiled: Any) -> List[Any]:
+        raise NotImplementedError
+
+    def select_one(self, node: Any, compiled: Any) -> Optional[Any]:
+        raise NotImplementedError
+
+    def text(self, node: Any) -> str:
+        raise NotImplementedError
+
+    def attr(self, node: Any, name: str, default: Any = None) -> Any:
+        raise NotImplementedError
+
+
+class SoupBackend(ParserBackend):
+    """BeautifulSoup with the pure-Python html.parser"""
+    name = 'html.parser'
+
+    def parse(self, html: str) -> BeautifulSoup:
+        return BeautifulSoup(html, 'html.parser')
+
+    def compile(self, selector: str):
+        return soupsieve.compile(selector)
+
+    def select(self, node, compiled) -> List[Any]:
+        return compiled.select(node)
+
+    def select_one(self, node, compiled):
+        return compiled.select_one(node)
+
+    def text(self, node) -> str:
+        return node.get_text()
+
+    def attr(self, node, name: str, default: Any = None) -> Any:
+        return node.get(name, default)
+
+
+class LxmlBackend(ParserBackend):
+    """libxml2 parsing with CSS selectors translated to XPath once"""
+    name = 'lxml'
+
+    def __init__(self):
+        if lxml is None:
+            raise ImportError("The lxml backend requires the lxml and cssselect packages")
+        self.translator = HTMLTranslator()
+
+    def parse(self, html: str):
+        try:
+            return lxml.html.document_fromstring(html)
+        except ValueError:
+            # Unicode strings with an XML encoding declaration must be passed as bytes
+            return lxml.html.document_fromstring(html.encode('utf-8'))
+        except etree.ParserError:
+            return lxml.html.document_fromstring('<html></html>')
+
+    def compile(self, selector: str):
+        # Match descendants only, like BeautifulSoup's select()
+        return etree.XPath(self.translator.css_to_xpath(selector, prefix='descendant::'))
+
+    def select(self, node, compiled) -> List[Any]:
+        return compiled(node)
+
+    def select_one(self, node, compiled):
+        matches = compiled(node)
+        return matches[0] if matches else None
+
+    def text(self, node) -> str:
+        return node.text_content()
+
+    def attr(self, node, name: str, default: Any = None) -> Any:
+        return node.get(name, default)
+
+
+parser_backends = {
+    SoupBackend.name: SoupBackend,
+    LxmlBackend.name: LxmlBackend
+}
+
+
+def default_backend_name() -> str:
+    return LxmlBackend.name if lxml is not None else SoupBackend.name
+
+
+def get_parser_backend(name: Optional[str] = None) -> ParserBackend:
+    """Instantiate a parser backend by name, defaulting to the fastest available"""
+    name = name or default_backend_name()
+    if name not in parser_backends:
+        raise ValueError(f"Unknown parser backend: {name}")
+    return parser_backends[name]()
+
+
+def compile_selectors(selectors: Dict[str, Union[str, List[str]]],
+                      backend: ParserBackend) -> Dict[str, Any]:
+    """Compile a site's selector config; list-valued entries stay lists"""
+    compiled = {}
+    for key, value in selectors.items():
+        if isinstance(value, (list, tuple)):
+            compiled[key] = [backend.compile(selector) for selector in value]
+        else:
+            compiled[key] = backend.compile(value)
+    return compiled
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class HostState:
+    def __init__(self, concurrency: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.robots_lock = asyncio.Lock()
+        self.next_slot = 0.0
+        self.backoff = 1.0
+        self.crawl_delay: Optional[float] = None
+        self.robots_checked: Optional[float] = None
+        self.queued = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class PolitenessScheduler:
+    """Per-host concurrency caps and request spacing for outbound fetches.
+
+    The gap between requests to a host is the larger of `min_interval` and
+    the host's robots.txt Crawl-delay, multiplied by a backoff factor that
+    grows on 429/403 and decays again on success. Retry-After is honored.
+    """
+
+    def __init__(self, concurrency: int = 2, min_interval: float = 0.5, max_backoff: float = 64,
+                 robots_ttl: float = 3600, user_agent: str = '*',
+                 fetch_text: Optional[Callable[[str], Awaitable[Optional[str]]]] = None):
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self.max_backoff = max_backoff
+        self.robots_ttl = robots_ttl
+        self.user_agent = user_agent
+        # Used to download robots.txt; robots handling is off without it
+        self.fetch_text = fetch_text
+        self.hosts: Dict[str, HostState] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def _state(self, host: str) -> HostState:
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = HostState(self.concurrency)
+        return state
+
+    def delay(self, state: HostState) -> float:
+        return max(self.min_interval, state.crawl_delay or 0.0) * state.backoff
+
+    def _robots_fresh(self, state: HostState) -> bool:
+        return state.robots_checked is not None and time.monotonic() - state.robots_checked < self.robots_ttl
+
+    async def _check_robots(self, url: str, state: HostState):
+        if self.fetch_text is None or self._robots_fresh(state):
+            return
+        async with state.robots_lock:
+            if self._robots_fresh(state):
+                return
+            parts = urlparse(url)
+            try:
+                text = await self.fetch_text(f"{parts.scheme}://{parts.netloc}/robots.txt")
+                robots = RobotFileParser()
+                # crawl_delay() answers None until the parser is marked as read
+                robots.modified()
+                robots.parse((text or '').splitlines())
+                delay = robots.crawl_delay(self.user_agent)
+                state.crawl_delay = float(delay) if delay is not None else None
+            except Exception as e:
+                logging.error(f"Could not read robots.txt for {parts.netloc}: {str(e)}")
+            state.robots_checked = time.monotonic()
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Wait for a free, correctly spaced slot on the URL's host"""
+        host = self.host_of(url)
+        state = self._state(host)
+        await self._check_robots(url, state)
+
+        queued_at = time.monotonic()
+        state.queued += 1
+        try:
+            await state.semaphore.acquire()
+            try:
+                now = time.monotonic()
+                start_at = max(now, state.next_slot)
+                # Reserve the slot before sleeping so waiters are spaced, not bunched
+                state.next_slot = start_at + self.delay(state)
+                if start_at > now:
+                    await asyncio.sleep(start_at - now)
+            except BaseException:
+                state.semaphore.release()
+                raise
+        finally:
+            state.queued -= 1
+
+        wait = time.monotonic() - queued_at
+        state.total_wait += wait
+        state.max_wait = max(state.max_wait, wait)
+        state.requests += 1
+        state.in_flight += 1
+        try:
+            yield
+        finally:
+            state.in_flight -= 1
+            state.semaphore.release()
+
+    def report(self, url: str, status: int, retry_after: Optional[str] = None):
+        """Adapt a host's pacing to a response status"""
+        state = self._state(self.host_of(url))
+        if status in (429, 403, 503):
+            state.throttled += 1
+            state.backoff = min(self.max_backoff, state.backoff * 2)
+            wait = parse_retry_after(retry_after)
+            pause = wait if wait is not None else self.delay(state)
+            state.next_slot = max(state.next_slot, time.monotonic() + pause)
+        elif status < 400:
+            state.backoff = max(1.0, state.backoff / 2)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        return {
+            host: {
+                'queued': state.queued,
+                'in_flight': state.in_flight,
+                'requests': state.requests,
+                'throttled': state.throttled,
+                'avg_wait': state.total_wait / state.requests if state.requests else 0.0,
+                'max_wait': state.max_wait,
+                'delay': self.delay(state),
+                'crawl_delay': state.crawl_delay,
+                'backoff': state.backoff
+            }
+            for host, state in self.hosts.items()
+        }
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+
+def _collapse(frame) -> str:
+    """One stack as root-first "file:function" frames joined by semicolons"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class _Session:
+    """Samples one thread's stack from a background thread until stopped"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class SamplingProfiler:
+    """Profiles a random fraction of requests into flamegraph input.
+
+    A sampled request gets a background thread that snapshots the event loop
+    thread's stack every `interval` seconds. The counts are written in the
+    collapsed-stack format read by flamegraph.pl, speedscope and inferno.
+    With `sample_rate` 0 the only cost per request is one comparison.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, interval: float = 0.005,
+                 output_dir: str = 'cache/profiles'):
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.output_dir = output_dir
+        # All requests share the loop thread, so overlapping sessions would see each other's work
+        self._active = False
+        self.stats = {'profiled': 0, 'skipped_busy': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def should_profile(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    @asynccontextmanager
+    async def profile(self, label: str) -> AsyncIterator[Optional[str]]:
+        """Sample the current thread for the duration of the block; yields the output file name"""
+        if self._active:
+            self.stats['skipped_busy'] += 1
+            yield None
+            return
+        self._active = True
+        filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self.stats['profiled']}-{label}.folded"
+        path = os.path.join(self.output_dir, filename)
+        session = _Session(threading.get_ident(), self.interval)
+        session.start()
+        try:
+            yield filename
+        finally:
+            session.stop()
+            self._active = False
+            self.stats['profiled'] += 1
+            # File I/O off the event loop being profiled
+            await asyncio.to_thread(self._write, path, session.stacks)
+
+    def _write(self, path: str, stacks: Counter):
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+        except OSError as e:
+            logging.error(f"Could not write profile {path}: {str(e)}")
+
+
+profiler = SamplingProfiler(
+    sample_rate=float(os.getenv('PROFILE_SAMPLE_RATE', 0)),
+    interval=float(os.getenv('PROFILE_INTERVAL', 0.005)),
+    output_dir=os.getenv('PROFILE_DIR', 'cache/profiles')
+)
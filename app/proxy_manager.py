@@ -1,49 +1,251 @@
 import aiohttp
 import random
-from typing import List
+import logging
+import time
+from typing import Dict, List, Optional, Sequence
 import asyncio
 
+DEFAULT_PROVIDERS = [
+    "https://proxy-provider1.com/api/proxies",
+    "https://proxy-provider2.com/api/proxies"
+]
+
+
+class ProxyHealth:
+    """Success rate, EWMA latency and circuit breaker state for one proxy"""
+
+    def __init__(self, proxy: str):
+        self.proxy = proxy
+        self.successes = 0
+        self.failures = 0
+        self.latency: Optional[float] = None
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+        self.probe_started = 0.0
+
+    @property
+    def success_rate(self) -> float:
+        # Laplace smoothing so new proxies start at 0.5 instead of 0 or 1
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+    def state(self, now: float) -> str:
+        if self.open_until > now:
+            return 'open'
+        return 'half_open' if self.trips and self.consecutive_failures else 'closed'
+
+    def to_dict(self, now: float) -> Dict:
+        return {
+            'state': self.state(now),
+            'successes': self.successes,
+            'failures': self.failures,
+            'success_rate': self.success_rate,
+            'latency': self.latency
+        }
+
+
 class ProxyRotator:
-    def __init__(self):
-        self.proxies: List[str] = []
-        self.current_index = 0
-        self.lock = asyncio.Lock()
+    """Pool of proxies picked by health rather than plain round-robin.
 
-    async def load_proxies(self):
-        """Load proxies from various sources"""
-        async with aiohttp.ClientSession() as session:
-            # Load from proxy providers
-            providers = [
-                "https://proxy-provider1.com/api/proxies",
-                "https://proxy-provider2.com/api/proxies"
-            ]
-            
-            for provider in providers:
+    Proxies are weighted by success rate over EWMA latency. After
+    `failure_threshold` consecutive failures a proxy's circuit opens and it
+    is skipped for `cooldown` seconds (doubling on repeated trips); then a
+    single trial request decides whether it rejoins the pool.
+
+    With no usable proxy, a request waits up to `timeout` seconds for the
+    next trial and then fails, unless `fallback_direct` allows it to go out
+    from the server's own address; each such fallback is logged and counted.
+    """
+
+    def __init__(self, providers: Optional[Sequence[str]] = None, check_url: str = 'https://httpbin.org/ip',
+                 check_interval: float = 300, check_concurrency: int = 20, timeout: float = 5,
+                 failure_threshold: int = 3, cooldown: float = 30, max_cooldown: float = 600,
+                 ewma_alpha: float = 0.3, fallback_direct: bool = False):
+        self.providers = list(DEFAULT_PROVIDERS if providers is None else providers)
+        self.check_url = check_url
+        self.check_interval = check_interval
+        self.check_concurrency = check_concurrency
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.ewma_alpha = ewma_alpha
+        self.fallback_direct = fallback_direct
+        self.direct_fallbacks = 0
+        self.health: Dict[str, ProxyHealth] = {}
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._loading: Optional[asyncio.Task] = None
+        self._checker: Optional[asyncio.Task] = None
+
+    @property
+    def proxies(self) -> List[str]:
+        return list(self.health)
+
+    @staticmethod
+    def normalize(proxy: str) -> str:
+        proxy = proxy.strip()
+        return proxy if '://' in proxy else f"http://{proxy}"
+
+    def add_proxies(self, proxies: Sequence[str]):
+        for proxy in proxies:
+            proxy = self.normalize(proxy)
+            if proxy not in self.health:
+                self.health[proxy] = ProxyHealth(proxy)
+
+    async def start(self):
+        """Open the shared session and validate proxies in the background"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        if self._checker is None or self._checker.done():
+            self._checker = asyncio.create_task(self._check_loop())
+
+    async def close(self):
+        for task in (self._checker, self._loading):
+            if task is not None and not task.done():
+                task.cancel()
                 try:
-                    async with session.get(provider) as response:
-                        if response.status == 200:
-                            proxies = await response.json()
-                            self.proxies.extend(proxies)
-                except Exception as e:
-                    print(f"Error loading proxies from {provider}: {e}")
-
-    async def get_next_proxy(self) -> str:
-        async with self.lock:
-            if not self.proxies:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._checker = self._loading = None
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _check_loop(self):
+        while True:
+            try:
                 await self.load_proxies()
-            
-            proxy = self.proxies[self.current_index]
-            self.current_index = (self.current_index + 1) % len(self.proxies)
-            return proxy
+                await self.validate_all()
+            except Exception as e:
+                logging.error(f"Proxy health check failed: {str(e)}")
+            await asyncio.sleep(self.check_interval)
 
-    async def validate_proxy(self, proxy: str) -> bool:
+    async def _fetch_provider(self, session: aiohttp.ClientSession, provider: str) -> List[str]:
         try:
+            async with session.get(provider, timeout=self.timeout) as response:
+                if response.status == 200:
+                    return await response.json(content_type=None)
+        except Exception as e:
+            logging.error(f"Error loading proxies from {provider}: {str(e)}")
+        return []
+
+    async def load_proxies(self):
+        """Load proxies from all providers concurrently"""
+        if self.session is not None and not self.session.closed:
+            results = await asyncio.gather(*(self._fetch_provider(self.session, p) for p in self.providers))
+        else:
             async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    'https://httpbin.org/ip',
-                    proxy=proxy,
-                    timeout=5
-                ) as response:
-                    return response.status == 200
-        except:
-            return False 
\ No newline at end of file
+                results = await asyncio.gather(*(self._fetch_provider(session, p) for p in self.providers))
+        for proxies in results:
+            self.add_proxies(proxies)
+
+    async def _ensure_loaded(self):
+        # Single-flight: concurrent callers wait on one load without holding a lock.
+        # Later refreshes are left to the background check loop.
+        if self._loading is None:
+            self._loading = asyncio.create_task(self.load_proxies())
+        await asyncio.shield(self._loading)
+
+    def report(self, proxy: str, success: bool, latency: Optional[float] = None):
+        """Record the outcome of a request made through a proxy"""
+        health = self.health.get(proxy)
+        if health is None:
+            return
+        health.probe_started = 0.0
+        if success:
+            health.successes += 1
+            health.consecutive_failures = 0
+            health.trips = 0
+            health.open_until = 0.0
+            if latency is not None:
+                if health.latency is None:
+                    health.latency = latency
+                else:
+                    health.latency += self.ewma_alpha * (latency - health.latency)
+            return
+
+        health.failures += 1
+        health.consecutive_failures += 1
+        # A failed trial re-opens at once; otherwise trip on the threshold
+        if health.trips or health.consecutive_failures >= self.failure_threshold:
+            health.open_until = time.monotonic() + min(self.max_cooldown, self.cooldown * 2 ** health.trips)
+            health.trips += 1
+
+    def _weights(self, candidates: List[ProxyHealth]) -> List[float]:
+        known = sorted(health.latency for health in candidates if health.latency is not None)
+        # Unmeasured proxies get the median latency so they are still tried
+        default = known[len(known) // 2] if known else 1.0
+        return [
+            health.success_rate / max(health.latency if health.latency is not None else default, 0.001)
+            for health in candidates
+        ]
+
+    def select(self) -> Optional[str]:
+        now = time.monotonic()
+        candidates = []
+        for health in self.health.values():
+            state = health.state(now)
+            if state == 'closed':
+                candidates.append(health)
+            elif state == 'half_open' and now - health.probe_started > self.timeout:
+                # Cooldown over: let one request through as a trial (again if it never reported)
+                health.probe_started = now
+                return health.proxy
+        if not candidates:
+            return None
+        return random.choices(candidates, weights=self._weights(candidates))[0].proxy
+
+    def _next_trial_in(self, now: float) -> Optional[float]:
+        """Seconds until the first open circuit allows a trial request"""
+        reopening = [health.open_until for health in self.health.values() if health.open_until > now]
+        return min(reopening) - now if reopening else None
+
+    async def get_next_proxy(self) -> Optional[str]:
+        """A proxy to use; None (direct connection) only when fallback_direct is set"""
+        if not self.health:
+            await self._ensure_loaded()
+        proxy = self.select()
+        if proxy is None:
+            wait = self._next_trial_in(time.monotonic())
+            if wait is not None and wait <= self.timeout:
+                await asyncio.sleep(wait)
+                proxy = self.select()
+        if proxy is not None:
+            return proxy
+        if not self.fallback_direct:
+            raise RuntimeError("No healthy proxy available and direct connections are not allowed")
+        self.direct_fallbacks += 1
+        logging.warning(f"No healthy proxy available, connecting directly ({self.direct_fallbacks} so far)")
+        return None
+
+    async def validate_proxy(self, proxy: str, session: Optional[aiohttp.ClientSession] = None) -> bool:
+        session = session or self.session
+        if session is None or session.closed:
+            async with aiohttp.ClientSession() as session:
+                return await self.validate_proxy(proxy, session)
+        started = time.monotonic()
+        try:
+            async with session.get(self.check_url, proxy=proxy, timeout=self.timeout) as response:
+                ok = response.status == 200
+        except Exception:
+            ok = False
+        self.report(proxy, ok, time.monotonic() - started if ok else None)
+        return ok
+
+    async def validate_all(self) -> Dict[str, bool]:
+        """Check every proxy whose circuit is not open, a bounded number at a time"""
+        semaphore = asyncio.Semaphore(self.check_concurrency)
+        now = time.monotonic()
+        proxies = [proxy for proxy, health in self.health.items() if health.state(now) != 'open']
+
+        async def check(proxy):
+            async with semaphore:
+                return await self.validate_proxy(proxy)
+
+        results = await asyncio.gather(*(check(proxy) for proxy in proxies))
+        return dict(zip(proxies, results))
+
+    def get_stats(self) -> Dict[str, Dict]:
+        now = time.monotonic()
+        return {proxy: health.to_dict(now) for proxy, health in self.health.items()}
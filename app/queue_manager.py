@@ -1,31 +1,339 @@
-from redis import Redis
-from rq import Queue
+import asyncio
+import itertools
 import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+from .models import ScraperRun
+from .notifications import WebhookNotifier, get_notifier
+from .scraping_engine import scraping_engine
+from .storage import result_store
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # Redis is optional, the in-process backend covers single-node use
+    redis_asyncio = None
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+FINAL_STATUSES = ('finished', 'failed')
+
+
+def new_job(run: ScraperRun, priority: int = 0) -> Dict[str, Any]:
+    return {
+        'id': uuid.uuid4().hex,
+        'scraper_id': run.scraper_id,
+        'parameters': run.parameters or {},
+        'priority': priority,
+        'status': 'queued',
+        'result': None,
+        'error': None,
+        'enqueued_at': time.time(),
+        'started_at': None,
+        'ended_at': None
+    }
+
+
+class JobBackend:
+    """Job storage plus a priority queue; higher priority pops first, FIFO within a priority"""
+
+    async def push(self, jobs: Sequence[Dict[str, Any]]):
+        raise NotImplementedError
+
+    async def pop(self, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def update(self, job_id: str, fields: Dict[str, Any]):
+        raise NotImplementedError
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def size(self) -> int:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class MemoryJobBackend(JobBackend):
+    """In-process backend for single-node deployments and tests"""
+
+    def __init__(self, max_jobs: int = 10000):
+        self.max_jobs = max_jobs
+        self.jobs: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.queue: Optional[asyncio.PriorityQueue] = None
+        self._counter = itertools.count()
+
+    def _queue(self) -> asyncio.PriorityQueue:
+        # Created lazily so it binds to the running loop, not the import-time one
+        if self.queue is None:
+            self.queue = asyncio.PriorityQueue()
+        return self.queue
+
+    def _evict(self):
+        # Only finished jobs are dropped; queued and running ones are always kept
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= self.max_jobs:
+                break
+            if self.jobs[job_id]['status'] in FINAL_STATUSES:
+                del self.jobs[job_id]
+
+    async def push(self, jobs: Sequence[Dict[str, Any]]):
+        queue = self._queue()
+        for job in jobs:
+            self.jobs[job['id']] = dict(job)
+            queue.put_nowait((-job['priority'], next(self._counter), job['id']))
+        self._evict()
+
+    async def pop(self, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+        try:
+            _, _, job_id = await asyncio.wait_for(self._queue().get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        job = self.jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    async def update(self, job_id: str, fields: Dict[str, Any]):
+        if job_id in self.jobs:
+            self.jobs[job_id].update(fields)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    async def size(self) -> int:
+        return self._queue().qsize()
+
+
+class RedisJobBackend(JobBackend):
+    """Jobs as Redis hashes, queued in a sorted set scored by priority then enqueue order"""
+
+    def __init__(self, client, prefix: str = 'jobs', result_ttl: int = 86400):
+        self.client = client
+        self.prefix = prefix
+        self.queue_key = f"{prefix}:queue"
+        self.counter_key = f"{prefix}:seq"
+        self.result_ttl = result_ttl
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}"
+
+    @staticmethod
+    def _encode(fields: Dict[str, Any]) -> Dict[str, str]:
+        return {key: json.dumps(value) for key, value in fields.items()}
+
+    async def push(self, jobs: Sequence[Dict[str, Any]]):
+        if not jobs:
+            return
+        # Reserve a block of sequence numbers, then write every job in one round-trip
+        last = await self.client.incrby(self.counter_key, len(jobs))
+        pipe = self.client.pipeline(transaction=False)
+        for offset, job in enumerate(jobs):
+            seq = last - len(jobs) + offset + 1
+            pipe.hset(self._key(job['id']), mapping=self._encode(job))
+            pipe.zadd(self.queue_key, {job['id']: -job['priority'] * 1e12 + seq})
+        await pipe.execute()
+
+    async def pop(self, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+        popped = await self.client.bzpopmin(self.queue_key, timeout=max(1, int(timeout)))
+        if popped is None:
+            return None
+        job_id = popped[1].decode() if isinstance(popped[1], bytes) else popped[1]
+        return await self.get(job_id)
+
+    async def update(self, job_id: str, fields: Dict[str, Any]):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hset(self._key(job_id), mapping=self._encode(fields))
+        if fields.get('status') in FINAL_STATUSES:
+            pipe.expire(self._key(job_id), self.result_ttl)
+        await pipe.execute()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.client.hgetall(self._key(job_id))
+        if not raw:
+            return None
+        return {
+            (key.decode() if isinstance(key, bytes) else key): json.loads(value)
+            for key, value in raw.items()
+        }
+
+    async def size(self) -> int:
+        return await self.client.zcard(self.queue_key)
+
+    async def close(self):
+        await self.client.close()
+
+
+async def run_scraper_job(job: Dict[str, Any]) -> List[Dict]:
+    """Scrape a stored scraper's `url` parameter or target URL, recording the run and its
+    articles in the result store, or the education page of the site named by scraper_id"""
+    scraper = await result_store.get_scraper(job['scraper_id'])
+    url = job['parameters'].get('url') or (scraper['target_url'] if scraper is not None else None)
+    if not url:
+        plan = scraping_engine.registry.plans.get(job['scraper_id'])
+        if plan is None:
+            raise ValueError(f"Unknown scraper: {job['scraper_id']}")
+        url = plan.config['education_url']
+    if scraper is None:
+        # Supported-site runs belong to no one, so they stay out of the per-owner store
+        return await scraping_engine.scrape_cached(url)
+    await result_store.start_run(job['id'], job['scraper_id'])
+    try:
+        articles = await scraping_engine.scrape_cached(url)
+    except Exception as e:
+        await result_store.fail_run(job['id'], str(e) or type(e).__name__)
+        raise
+    await result_store.finish_run(job['id'], job['scraper_id'], articles)
+    return articles
+
+
+class WorkerPool:
+    """A bounded number of asyncio workers pulling jobs from a backend"""
+
+    def __init__(self, backend: JobBackend, handler: JobHandler, concurrency: int = 4,
+                 job_timeout: float = 3600, poll_timeout: float = 1.0,
+                 notifier: Optional[WebhookNotifier] = None):
+        self.backend = backend
+        self.handler = handler
+        # Told about finished jobs; only enqueues, so webhooks never slow a worker
+        self.notifier = notifier
+        self.concurrency = concurrency
+        self.job_timeout = job_timeout
+        self.poll_timeout = poll_timeout
+        self.workers: List[asyncio.Task] = []
+        self.processed = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return any(not worker.done() for worker in self.workers)
+
+    def start(self):
+        if self.running:
+            return
+        self.workers = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    async def _work(self):
+        while True:
+            try:
+                job = await self.backend.pop(self.poll_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Job backend unavailable: {str(e)}")
+                await asyncio.sleep(self.poll_timeout)
+                continue
+            if job is None:
+                continue
+            try:
+                await self.run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # A backend error while recording the job must not take the worker down
+                logging.error(f"Worker error on job {job.get('id')}: {str(e)}")
+
+    async def run(self, job: Dict[str, Any]):
+        await self.backend.update(job['id'], {'status': 'running', 'started_at': time.time()})
+        try:
+            result = await asyncio.wait_for(self.handler(job), self.job_timeout)
+            fields = {'status': 'finished', 'result': result}
+            self.processed += 1
+        except asyncio.CancelledError:
+            await self.backend.update(job['id'], {'status': 'failed', 'error': 'cancelled', 'ended_at': time.time()})
+            raise
+        except Exception as e:
+            logging.error(f"Job {job['id']} failed: {str(e)}")
+            fields = {'status': 'failed', 'error': str(e) or type(e).__name__}
+            self.failed += 1
+        fields['ended_at'] = time.time()
+        await self.backend.update(job['id'], fields)
+        if self.notifier is not None:
+            result = fields.get('result')
+            self.notifier.notify(f"job.{fields['status']}", {
+                'id': job['id'],
+                'scraper_id': job['scraper_id'],
+                'error': fields.get('error'),
+                'articles': len(result) if isinstance(result, list) else None
+            })
 
-redis_conn = Redis(host='localhost', port=6379)
-task_queue = Queue(connection=redis_conn)
 
 class QueueManager:
-    def __init__(self):
-        self.queue = task_queue
-
-    async def add_job(self, scraper_config, run_config):
-        job = self.queue.enqueue(
-            'scraping_engine.process_job',
-            args=(scraper_config, run_config),
-            job_timeout='1h'
-        )
-        return job.id
-
-    async def get_job_status(self, job_id):
-        job = self.queue.fetch_job(job_id)
+    def __init__(self, backend: Optional[JobBackend] = None, handler: JobHandler = run_scraper_job,
+                 workers: int = 4, job_timeout: float = 3600, notifier: Optional[WebhookNotifier] = None):
+        self.backend = backend or MemoryJobBackend()
+        self.pool = WorkerPool(self.backend, handler, workers, job_timeout, notifier=notifier)
+
+    async def start(self):
+        if self.pool.concurrency > 0:
+            self.pool.start()
+
+    async def close(self):
+        await self.pool.stop()
+        await self.backend.close()
+
+    async def add_job(self, run: ScraperRun, priority: int = 0) -> str:
+        return (await self.add_jobs([run], priority))[0]
+
+    async def add_jobs(self, runs: Sequence[ScraperRun], priority: int = 0) -> List[str]:
+        """Enqueue many runs with a single backend write"""
+        jobs = [new_job(run, priority) for run in runs]
+        await self.backend.push(jobs)
+        return [job['id'] for job in jobs]
+
+    async def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = await self.backend.get(job_id)
         if job is None:
             return None
         return {
-            'id': job.id,
-            'status': job.get_status(),
-            'result': job.result,
-            'error': job.exc_info
+            'id': job['id'],
+            'status': job['status'],
+            'result': job['result'],
+            'error': job['error']
         }
 
-queue_manager = QueueManager() 
\ No newline at end of file
+    async def wait_for(self, job_id: str, poll_interval: float = 1.0) -> Optional[Dict[str, Any]]:
+        """Wait until a job has finished or failed and return its status"""
+        while True:
+            status = await self.get_job_status(job_id)
+            if status is None or status['status'] in FINAL_STATUSES:
+                return status
+            await asyncio.sleep(poll_interval)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        return {
+            'queued': await self.backend.size(),
+            'workers': self.pool.concurrency,
+            'processed': self.pool.processed,
+            'failed': self.pool.failed
+        }
+
+
+def create_job_backend(redis_url: Optional[str] = None) -> JobBackend:
+    if redis_url and redis_asyncio is not None:
+        # from_url connects lazily, nothing is opened at import time
+        return RedisJobBackend(redis_asyncio.from_url(redis_url))
+    if redis_url:
+        logging.warning("redis package not installed, using the in-process job queue")
+    return MemoryJobBackend()
+
+
+queue_manager = QueueManager(
+    create_job_backend(os.getenv('REDIS_URL')),
+    workers=int(os.getenv('JOB_WORKERS', 4)),
+    notifier=get_notifier(
+        os.getenv('WEBHOOK_URL'),
+        batch_window=float(os.getenv('WEBHOOK_BATCH_WINDOW', 1.0)),
+        dead_letter_path=os.getenv('WEBHOOK_DEAD_LETTER_PATH', 'cache/webhook_dead_letter.ndjson')
+    ) if os.getenv('WEBHOOK_URL') else None
+)
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so equivalent spellings share one cache key"""
+    parts = urlparse(url.strip())
+    path = parts.path.rstrip('/') or '/'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunparse((parts.scheme.lower(), parts.netloc.lower(), path, '', query, ''))
+
+
+class _Entry:
+    __slots__ = ('value', 'stored_at')
+
+    def __init__(self, value: Any):
+        self.value = value
+        self.stored_at = time.monotonic()
+
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+
+class ResultCache:
+    """TTL cache with single-flight loading and stale-while-revalidate"""
+
+    def __init__(self, ttl: float = 60, stale_ttl: float = 600, max_entries: int = 256):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._background: Set[asyncio.Task] = set()
+
+    def _store(self, key: str, value: Any):
+        self._entries[key] = _Entry(value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """Start a load for key, or join the one already running"""
+        future = self._inflight.get(key)
+        if future is not None:
+            return future
+
+        async def run():
+            try:
+                value = await loader()
+                self._store(key, value)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+        future = asyncio.ensure_future(run())
+        self._inflight[key] = future
+        return future
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Awaitable[Any]]):
+        if key in self._inflight:
+            return
+        task = self._load(key, loader)
+        self._background.add(task)
+
+        def done(t: asyncio.Future):
+            self._background.discard(t)
+            if not t.cancelled() and t.exception() is not None:
+                logging.error(f"Background refresh failed for {key}: {t.exception()}")
+
+        task.add_done_callback(done)
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = entry.age()
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                return entry.value
+            if age < self.ttl + self.stale_ttl:
+                # Serve stale data now, refresh behind the caller
+                self._entries.move_to_end(key)
+                self._refresh_in_background(key, loader)
+                return entry.value
+            del self._entries[key]
+
+        # Shield so one caller cancelling does not abort the shared load
+        return await asyncio.shield(self._load(key, loader))
+
+    def invalidate(self, key: Optional[str] = None):
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,24 +1,111 @@
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
 from ..models import *
 from ..auth import get_current_user
+from ..cron import CronExpression
+from ..scheduler import cron_scheduler
+from ..storage import result_store
 
 router = APIRouter()
 
+def page(items: List, next_cursor: Optional[str]):
+    return {"status": "success", "data": items, "next_cursor": next_cursor}
+
+async def owned_scraper(scraper_id: str, user: str):
+    scraper = await result_store.get_scraper(scraper_id)
+    if scraper is None or scraper["user"] != user:
+        raise HTTPException(status_code=404, detail="Scraper not found")
+    return scraper
+
+@router.post("/scrapers")
+async def create_scraper(scraper: ScraperCreate, user: str = Depends(get_current_user)):
+    """Register a scraper; one with a cron schedule starts running on it"""
+    if scraper.schedule:
+        # Reject a bad schedule before anything is stored
+        try:
+            CronExpression(scraper.schedule)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    created = await result_store.create_scraper(user, scraper.dict())
+    if scraper.schedule:
+        cron_scheduler.add(created["id"], scraper.schedule, {"url": scraper.target_url})
+    return {"status": "success", "data": created}
+
+@router.put("/schedules/{scraper_id}")
+async def set_schedule(scraper_id: str, scraper: ScraperCreate, user: str = Depends(get_current_user)):
+    """Run a scraper on its cron schedule; a scraper without one is unscheduled"""
+    await owned_scraper(scraper_id, user)
+    if not scraper.schedule:
+        await result_store.set_schedule(scraper_id, None)
+        cron_scheduler.remove(scraper_id)
+        return {"status": "success", "data": None}
+    try:
+        CronExpression(scraper.schedule)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Stored first so the schedule survives a restart
+    await result_store.set_schedule(scraper_id, scraper.schedule, scraper.target_url)
+    schedule = cron_scheduler.add(scraper_id, scraper.schedule, {"url": scraper.target_url})
+    return {"status": "success", "data": schedule.to_dict()}
+
+@router.delete("/schedules/{scraper_id}")
+async def delete_schedule(scraper_id: str, user: str = Depends(get_current_user)):
+    """Stop running a scraper on a schedule"""
+    scraper = await owned_scraper(scraper_id, user)
+    removed = cron_scheduler.remove(scraper_id)
+    if scraper["schedule"] is None and not removed:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    await result_store.set_schedule(scraper_id, None)
+    return {"status": "success"}
+
 @router.get("/scrapers")
-async def list_scrapers(user: str = Depends(get_current_user)):
+async def list_scrapers(cursor: Optional[str] = None, limit: int = 50,
+                        user: str = Depends(get_current_user)):
     """List all scrapers for the current user"""
-    scrapers = await db.scrapers.find({"user": user}).to_list(None)
-    return scrapers
+    try:
+        return page(*await result_store.list_scrapers(user, cursor, min(limit, 500)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/scrapers/{scraper_id}/runs")
-async def list_runs(scraper_id: str, user: str = Depends(get_current_user)):
+async def list_runs(scraper_id: str, cursor: Optional[str] = None, limit: int = 50,
+                    user: str = Depends(get_current_user)):
     """List all runs for a specific scraper"""
-    runs = await db.runs.find({"scraper_id": scraper_id}).to_list(None)
-    return runs
+    await owned_scraper(scraper_id, user)
+    try:
+        return page(*await result_store.list_runs(scraper_id, cursor, min(limit, 500)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/runs/{run_id}/results")
-async def get_results(run_id: str, user: str = Depends(get_current_user)):
+async def get_results(run_id: str, cursor: Optional[str] = None, limit: int = 100,
+                      user: str = Depends(get_current_user)):
     """Get results for a specific run"""
-    results = await db.results.find_one({"run_id": run_id})
-    return results 
\ No newline at end of file
+    run = await result_store.get_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    scraper = await result_store.get_scraper(run["scraper_id"])
+    if scraper is None or scraper["user"] != user:
+        raise HTTPException(status_code=404, detail="Run not found")
+    try:
+        return page(*await result_store.list_results(run_id=run_id, cursor=cursor, limit=min(limit, 1000)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/results")
+async def list_results(source: Optional[str] = None, cursor: Optional[str] = None, limit: int = 100,
+                       user: str = Depends(get_current_user)):
+    """Stored articles from the current user's scrapers, most recently published first"""
+    try:
+        return page(*await result_store.list_results(source=source, cursor=cursor, limit=min(limit, 1000), user=user))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/results/search")
+async def search_results(q: str, cursor: Optional[str] = None, limit: int = 50,
+                         user: str = Depends(get_current_user)):
+    """Full-text search over the current user's stored article titles and summaries"""
+    try:
+        return page(*await result_store.search(q, cursor, min(limit, 500), user=user))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
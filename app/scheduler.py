@@ -0,0 +1,271 @@
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import pytz
+from .cron import CronExpression
+from .models import ScraperRun
+from .queue_manager import queue_manager
+
+ScheduleRunner = Callable[[str, Dict[str, Any]], Awaitable[Any]]
+
+OVERLAP_POLICIES = ('skip', 'queue')
+CATCH_UP_POLICIES = ('none', 'once', 'all')
+
+
+async def run_via_queue(scraper_id: str, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Enqueue a scheduled run on the job queue and wait for it to finish"""
+    job_id = await queue_manager.add_job(ScraperRun(scraper_id=scraper_id, parameters=parameters))
+    return await queue_manager.wait_for(job_id)
+
+
+class Schedule:
+    def __init__(self, scraper_id: str, cron: CronExpression, parameters: Dict[str, Any],
+                 jitter: float, overlap: str):
+        self.scraper_id = scraper_id
+        self.cron = cron
+        self.parameters = parameters
+        self.jitter = jitter
+        self.overlap = overlap
+        self.next_run: Optional[float] = None
+        self.last_run: Optional[float] = None
+        # Bumped on every reschedule so stale heap entries can be skipped
+        self.generation = 0
+        self.running: Optional[asyncio.Task] = None
+        self.pending = 0
+        self.runs = 0
+        self.skipped = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'schedule': self.cron.expression,
+            'jitter': self.jitter,
+            'overlap': self.overlap,
+            'next_run': self.next_run,
+            'last_run': self.last_run,
+            'running': self.running is not None and not self.running.done(),
+            'pending': self.pending,
+            'runs': self.runs,
+            'skipped': self.skipped
+        }
+
+
+class CronScheduler:
+    """Runs scrapers on their cron schedules from a single timer heap.
+
+    Each scraper fires at its cron time plus a fixed per-scraper jitter, so
+    schedules sharing an expression don't all start in the same second. A
+    fire while the previous run is still going is skipped or queued
+    (`overlap`). Missed fires after downtime, known from the persisted
+    state file, are dropped, run once or all run (`catch_up`).
+    """
+
+    def __init__(self, runner: ScheduleRunner = run_via_queue, timezone: str = 'UTC',
+                 max_jitter: float = 60, overlap: str = 'skip', catch_up: str = 'once',
+                 max_catch_up: int = 10, state_path: Optional[str] = None, save_interval: float = 5):
+        if overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"Unknown overlap policy: {overlap}")
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"Unknown catch-up policy: {catch_up}")
+        self.runner = runner
+        self.timezone = pytz.timezone(timezone)
+        self.max_jitter = max_jitter
+        self.overlap = overlap
+        self.catch_up = catch_up
+        self.max_catch_up = max_catch_up
+        self.state_path = state_path
+        self.save_interval = save_interval
+        self.schedules: Dict[str, Schedule] = {}
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._counter = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_runs = self._load_state()
+        self._dirty = False
+        self._saved_at = 0.0
+
+    def _load_state(self) -> Dict[str, float]:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return {key: float(value) for key, value in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            logging.error(f"Could not read schedule state {self.state_path}: {str(e)}")
+            return {}
+
+    def _save_state(self, last_runs: Dict[str, float]):
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(last_runs, f)
+        os.replace(tmp_path, self.state_path)
+
+    async def _flush_state(self, force: bool = False):
+        if not self.state_path or not self._dirty:
+            return
+        if not force and time.monotonic() - self._saved_at < self.save_interval:
+            return
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        try:
+            await asyncio.to_thread(self._save_state, dict(self._last_runs))
+        except OSError as e:
+            logging.error(f"Could not save schedule state {self.state_path}: {str(e)}")
+
+    def jitter_for(self, scraper_id: str) -> float:
+        """Stable offset in [0, max_jitter) derived from the scraper id"""
+        if self.max_jitter <= 0:
+            return 0.0
+        digest = int(hashlib.md5(scraper_id.encode('utf-8')).hexdigest()[:8], 16)
+        return digest / 0xFFFFFFFF * self.max_jitter
+
+    def next_fire(self, schedule: Schedule, after: float) -> Optional[float]:
+        """Next cron time strictly after the cron time behind `after`, as a timestamp"""
+        # Compare on cron times, not jittered ones
+        base = datetime.fromtimestamp(after - schedule.jitter, self.timezone).replace(tzinfo=None)
+        moment = schedule.cron.next_after(base)
+        if moment is None:
+            return None
+        return self.timezone.localize(moment).timestamp() + schedule.jitter
+
+    def _push(self, schedule: Schedule, fire_at: Optional[float]):
+        schedule.generation += 1
+        schedule.next_run = fire_at
+        if fire_at is None:
+            return
+        heapq.heappush(self._heap, (fire_at, next(self._counter), schedule.scraper_id, schedule.generation))
+        if self._wakeup is not None and self._heap[0][2] == schedule.scraper_id:
+            self._wakeup.set()
+
+    def add(self, scraper_id: str, expression: str, parameters: Optional[Dict[str, Any]] = None,
+            overlap: Optional[str] = None) -> Schedule:
+        """Register or replace a scraper's schedule"""
+        overlap = overlap or self.overlap
+        if overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"Unknown overlap policy: {overlap}")
+        previous = self.schedules.get(scraper_id)
+        schedule = Schedule(scraper_id, CronExpression(expression), parameters or {},
+                            self.jitter_for(scraper_id), overlap)
+        if previous is not None:
+            schedule.running = previous.running
+            schedule.runs, schedule.skipped = previous.runs, previous.skipped
+            # Invalidate the old heap entry
+            schedule.generation = previous.generation
+        self.schedules[scraper_id] = schedule
+
+        now = time.time()
+        last_run = self._last_runs.get(scraper_id)
+        schedule.last_run = last_run
+        if last_run is None or self.catch_up == 'none':
+            self._push(schedule, self.next_fire(schedule, now))
+            return schedule
+
+        # Count the fires missed since the last recorded run
+        missed = 0
+        fire_at = self.next_fire(schedule, last_run)
+        while fire_at is not None and fire_at <= now and missed < self.max_catch_up:
+            missed += 1
+            fire_at = self.next_fire(schedule, fire_at)
+        if missed:
+            if self.catch_up == 'all':
+                schedule.pending += missed - 1
+            # Jittered too, so a restart doesn't start every overdue scraper at once
+            self._push(schedule, now + schedule.jitter)
+        else:
+            self._push(schedule, fire_at)
+        return schedule
+
+    def remove(self, scraper_id: str) -> bool:
+        schedule = self.schedules.pop(scraper_id, None)
+        if schedule is None:
+            return False
+        # Its heap entry is now orphaned and dropped when it surfaces
+        schedule.generation += 1
+        return True
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._loop())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        running = [s.running for s in self.schedules.values() if s.running is not None and not s.running.done()]
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        await self._flush_state(force=True)
+
+    async def _loop(self):
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, scraper_id, generation = heapq.heappop(self._heap)
+                schedule = self.schedules.get(scraper_id)
+                if schedule is None or schedule.generation != generation:
+                    continue
+                self._fire(schedule, now)
+            await self._flush_state()
+
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            if self.state_path and self._dirty:
+                timeout = min(timeout, self.save_interval) if timeout is not None else self.save_interval
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _fire(self, schedule: Schedule, now: float):
+        self._push(schedule, self.next_fire(schedule, now))
+        schedule.last_run = now
+        self._last_runs[schedule.scraper_id] = now
+        self._dirty = True
+        if schedule.running is not None and not schedule.running.done():
+            if schedule.overlap == 'queue':
+                schedule.pending += 1
+            else:
+                schedule.skipped += 1
+                logging.warning(f"Skipping run of {schedule.scraper_id}, previous run still going")
+            return
+        schedule.running = asyncio.create_task(self._execute(schedule))
+
+    async def _execute(self, schedule: Schedule):
+        while True:
+            schedule.runs += 1
+            try:
+                await self.runner(schedule.scraper_id, schedule.parameters)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Scheduled run of {schedule.scraper_id} failed: {str(e)}")
+            if schedule.pending <= 0 or self.schedules.get(schedule.scraper_id) is not schedule:
+                return
+            schedule.pending -= 1
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {scraper_id: schedule.to_dict() for scraper_id, schedule in self.schedules.items()}
+
+
+cron_scheduler = CronScheduler(
+    timezone=os.getenv('SCHEDULE_TIMEZONE', 'Asia/Kolkata'),
+    max_jitter=float(os.getenv('SCHEDULE_MAX_JITTER', 60)),
+    overlap=os.getenv('SCHEDULE_OVERLAP', 'skip'),
+    catch_up=os.getenv('SCHEDULE_CATCH_UP', 'once'),
+    state_path=os.getenv('SCHEDULE_STATE_PATH', 'cache/schedules.json')
+)
@@ -1,16 +1,94 @@
 import aiohttp
-from bs4 import BeautifulSoup
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime
-import re
-from urllib.parse import urljoin, urlparse
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import asyncio
-from dateutil import parser
+import os
+import time
+from contextlib import asynccontextmanager
 import pytz
+from .article_extractor import ArticleExtractor
+from .browser_pool import BrowserPool, create_browser_pool
+from .clustering import StoryClusterer, create_story_clusterer
+from .date_parser import DateNormalizer
+from .dedup import SeenStore, create_seen_store
+from .extraction_pool import ExtractionPool
+from .http_cache import HTTPCache
+from .listing_extractor import SUMMARY_PLACEHOLDER, ListingExtractor, clean_text
+from .metrics import ScrapeMetrics, metrics as default_metrics
+from .parsers import ParserBackend, compile_selectors, get_parser_backend
+from .politeness import PolitenessScheduler
+from .proxy_manager import ProxyRotator
+from .result_cache import ResultCache, normalize_url
+from .site_registry import ExtractionPlan, SiteRegistry
+
+SITE_CONFIG_DIR = os.path.join(os.path.dirname(__file__), 'sites')
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) Safari/605.1.15',
+    'Mozilla/5.0 (X11; Linux x86_64) Firefox/89.0'
+]
+
+PROXY_FAILURE_STATUSES = (403, 407, 429)
+
+SUMMARY_LENGTH = 300
+
+GOOGLE_MAPS_PLACE_URL = 'https://www.google.com/maps/place/?q=place_id:{place_id}'
+# Google Maps' generated class names; they change now and then and need updating here
+GOOGLE_MAPS_REVIEW_SELECTORS = {
+    'review': 'div.jftiEf',
+    'author': 'div.d4r55',
+    'rating': 'span.kvMYJc',
+    'text': 'span.wiI7pd',
+    'date': 'span.rsqaWe'
+}
+
+
+@asynccontextmanager
+async def _no_slot():
+    yield
 
 class ScrapingEngine:
-    def __init__(self):
+    def __init__(self, pool_limit: int = 100, pool_limit_per_host: int = 10,
+                 dns_cache_ttl: int = 300, keepalive_timeout: float = 30,
+                 http_cache: Optional[HTTPCache] = None,
+                 result_cache: Optional[ResultCache] = None,
+                 parser_backend: Optional[ParserBackend] = None,
+                 extraction_mode: str = 'inline', extraction_workers: Optional[int] = None,
+                 seen_store: Optional[SeenStore] = None,
+                 site_config_dir: Optional[str] = None, reload_interval: float = 5,
+                 scheduler: Optional[PolitenessScheduler] = None,
+                 article_scheduler: Optional[PolitenessScheduler] = None,
+                 proxy_pool: Optional[ProxyRotator] = None,
+                 article_cache: Optional[ResultCache] = None, article_concurrency: int = 8,
+                 clusterer: Optional[StoryClusterer] = None,
+                 metrics: Optional[ScrapeMetrics] = None,
+                 browser_pool: Optional[BrowserPool] = None):
+        # Connection pool settings, the session itself is opened in start()
+        self.pool_limit = pool_limit
+        self.pool_limit_per_host = pool_limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.session: Optional[aiohttp.ClientSession] = None
+
+        # Conditional-request cache for fetched pages
+        self.http_cache = http_cache
+
+        # Parsed article lists, shared between concurrent callers
+        self.result_cache = result_cache
+
+        # Per-host pacing of outbound requests
+        self.scheduler = scheduler
+        # Article pages get their own per-host budget so a deep scrape is not queued
+        # behind listing pacing; without one they share the listing scheduler
+        self.article_scheduler = article_scheduler
+        for pacer in (scheduler, article_scheduler):
+            if pacer is not None and pacer.fetch_text is None:
+                pacer.fetch_text = self._fetch_robots
+
+        # Outbound proxies, picked by health and fed back each request's outcome
+        self.proxy_pool = proxy_pool
+
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -19,246 +97,453 @@ class ScrapingEngine:
             'Pragma': 'no-cache'
         }
 
+        # HTML parser backend, site selectors are compiled for it once at load
+        self.parser = parser_backend or get_parser_backend(os.getenv('HTML_PARSER'))
+
+        # 'inline' parses on the event loop, 'process' in a warm worker pool
+        if extraction_mode not in ('inline', 'process'):
+            raise ValueError(f"Unknown extraction mode: {extraction_mode}")
+        self.extraction_pool = None
+        if extraction_mode == 'process':
+            self.extraction_pool = ExtractionPool(extraction_workers, site_config_dir or SITE_CONFIG_DIR, self.parser.name)
+
+        # Optional cross-run memory of articles already handed to a consumer
+        self.seen_store = seen_store
+
+        # Deep mode: article pages, cached by URL and fetched a few at a time per site
+        self.article_extractor = ArticleExtractor(self.parser)
+        self.article_cache = article_cache
+        self.article_concurrency = article_concurrency
+        self._article_limits: Dict[str, asyncio.Semaphore] = {}
+
+        # Groups the same story reported by several sites; each article gets a story_id
+        self.clusterer = clusterer
+
+        # Per-site, per-stage timings and fetch outcomes, exposed on /metrics
+        self.metrics = metrics or default_metrics
+
+        # Headless browsers for 'render: js' sites and listings whose static HTML has no articles
+        self.browser_pool = browser_pool
+        self.review_selectors = compile_selectors(GOOGLE_MAPS_REVIEW_SELECTORS, self.parser)
+
         # Set timezone to IST
         self.timezone = pytz.timezone('Asia/Kolkata')
+        self.date_normalizer = DateNormalizer(self.timezone)
+        self.listing_extractor = ListingExtractor(self.parser, self.date_normalizer, self.metrics)
 
-        self.site_configs = {
-            'indianexpress.com': {
-                'name': 'Indian Express',
-                'base_url': 'https://indianexpress.com',
-                'education_url': 'https://indianexpress.com/section/education/',
-                'selectors': {
-                    'article_wrapper': 'div.article-list article, div.nation div[class*="article"]',
-                    'title': 'h2.title a, h3 a',
-                    'link': 'h2.title a, h3 a',
-                    'description': ['p.preview', 'div.preview', 'p:not([class])'],
-                    'date': ['time', 'span.date', 'div.date-time', 'span.datetime'],
-                    'summary': ['p.preview', 'div.preview', 'p:not([class])']
-                },
-                'date_formats': [
-                    '%B %d, %Y %I:%M %p',
-                    '%B %d, %Y',
-                    'Updated: %B %d, %Y %I:%M %p',
-                    'Published: %B %d, %Y %I:%M %p',
-                    '%d %B %Y, %I:%M %p',
-                    '%d %B %Y'
-                ]
-            },
-            'careers360.com': {
-                'name': 'Careers360',
-                'base_url': 'https://news.careers360.com',
-                'education_url': 'https://news.careers360.com',
-                'selectors': {
-                    'article_wrapper': 'div.newsListBlock, article.news_article',
-                    'title': 'h3.headingText a, h2.title a',
-                    'link': 'h3.headingText a, h2.title a',
-                    'description': 'p.content, div.content',
-                    'date': ['span.date', 'time', 'div.date-info'],
-                    'summary': ['p.content', 'div.content']
-                },
-                'date_formats': [
-                    '%b %d, %Y %I:%M %p',
-                    '%b %d, %Y',
-                    '%d %b %Y, %I:%M %p',
-                    'Posted on %b %d, %Y',
-                    'Last updated: %b %d, %Y %I:%M %p'
-                ]
-            },
-            'shiksha.com': {
-                'name': 'Shiksha',
-                'base_url': 'https://www.shiksha.com',
-                'education_url': 'https://www.shiksha.com/news',
-                'selectors': {
-                    'article_wrapper': 'div.news-tuple, div.nws-tuple',
-                    'title': 'h2.news-title a, div.tuple-title a',
-                    'link': 'h2.news-title a, div.tuple-title a',
-                    'description': 'div.news-snippet, div.tuple-desc',
-                    'date': ['div.date-tuple', 'span.date-info', 'meta[property="article:published_time"]'],
-                    'summary': ['div.news-snippet', 'div.tuple-desc']
-                },
-                'date_formats': [
-                    '%d %b %Y',
-                    '%d %b %Y, %I:%M %p',
-                    '%Y-%m-%dT%H:%M:%S%z',
-                    'Posted: %d %b %Y',
-                    'Last Updated: %d %b %Y, %I:%M %p'
-                ]
-            },
-            'timesofindia.indiatimes.com': {
-                'name': 'Times of India',
-                'base_url': 'https://timesofindia.indiatimes.com',
-                'education_url': 'https://timesofindia.indiatimes.com/education',
-                'selectors': {
-                    'article_wrapper': 'div.list5.clearfix article, div.education-story',
-                    'title': 'span.w_tle a, h3 a',
-                    'link': 'span.w_tle a, h3 a',
-                    'description': 'p.desc',
-                    'date': ['span.date', 'time', 'meta[property="article:published_time"]'],
-                    'summary': ['p.desc', 'div.synopsis']
-                },
-                'date_formats': [
-                    '%b %d, %Y, %I:%M %p IST',
-                    '%d %b %Y, %I:%M %p',
-                    '%Y-%m-%dT%H:%M:%S%z',
-                    'Updated: %b %d, %Y, %I:%M %p IST',
-                    '%d %b %Y'
-                ]
-            }
-        }
+        # Site definitions, one file per site, reloaded when the files change
+        self.registry = SiteRegistry(site_config_dir or SITE_CONFIG_DIR, self.parser)
+        self.reload_interval = reload_interval
+
+    @property
+    def site_configs(self) -> Dict[str, Dict]:
+        """Raw configs of the currently loaded sites, keyed by domain"""
+        return self.registry.configs()
+
+    async def start(self):
+        """Open the shared connection pool and extraction workers"""
+        if self.session is not None and not self.session.closed:
+            return
+        self.registry.start_watching(self.reload_interval)
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_limit,
+            limit_per_host=self.pool_limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+        if self.extraction_pool is not None:
+            await self.extraction_pool.start()
+        if self.proxy_pool is not None:
+            await self.proxy_pool.start()
+        if self.browser_pool is not None:
+            await self.browser_pool.start()
 
-    async def fetch_with_retry(self, url: str, max_retries: int = 3) -> Optional[str]:
-        """Fetch URL content with retry mechanism"""
-        for attempt in range(max_retries):
+    async def close(self):
+        """Close the shared connection pool and extraction workers"""
+        await self.registry.stop_watching()
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        if self.http_cache is not None:
+            self.http_cache.close()
+        if self.extraction_pool is not None:
+            await self.extraction_pool.close()
+        if self.seen_store is not None:
+            self.seen_store.close()
+        if self.proxy_pool is not None:
+            await self.proxy_pool.close()
+        if self.browser_pool is not None:
+            await self.browser_pool.close()
+
+    async def _get(self, session: aiohttp.ClientSession, url: str, headers: Dict[str, str],
+                   scheduler: Optional[PolitenessScheduler] = None) -> Tuple[Optional[str], int]:
+        """Issue a single GET, returning the body (None on a retryable status) and the status"""
+        cached = None
+        if self.http_cache is not None:
+            cached = await self.http_cache.get(url)
+            if cached is not None:
+                if cached.is_fresh(self.http_cache.ttl):
+                    self.http_cache.record_hit(cached)
+                    self.metrics.responses.inc(self.site_label(url), 'cache')
+                    return cached.body, 200
+                headers = {**headers, **cached.conditional_headers()}
+
+        proxy = await self.proxy_pool.get_next_proxy() if self.proxy_pool is not None else None
+        scheduler = scheduler or self.scheduler
+        slot = scheduler.slot(url) if scheduler is not None else _no_slot()
+        async with slot:
+            started = time.monotonic()
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, headers=self.headers, timeout=30) as response:
-                        if response.status == 200:
-                            return await response.text()
-                        elif response.status == 403:
-                            # Rotate User-Agent on 403
-                            user_agents = [
-                                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124 Safari/537.36',
-                                'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) Safari/605.1.15',
-                                'Mozilla/5.0 (X11; Linux x86_64) Firefox/89.0'
-                            ]
-                            self.headers['User-Agent'] = user_agents[attempt % len(user_agents)]
-                            continue
-            except Exception as e:
-                logging.error(f"Attempt {attempt + 1} failed for {url}: {str(e)}")
-                if attempt == max_retries - 1:
-                    raise
-                await asyncio.sleep(1)
-        return None
+                async with session.get(url, headers=headers, proxy=proxy, timeout=30) as response:
+                    if proxy is not None:
+                        # Blocks and upstream errors count against the proxy, other statuses mean it works
+                        failed = response.status in PROXY_FAILURE_STATUSES or response.status >= 500
+                        self.proxy_pool.report(proxy, not failed, time.monotonic() - started)
+                        proxy = None
+                    if scheduler is not None:
+                        scheduler.report(url, response.status, response.headers.get('Retry-After'))
+                    site = self.site_label(url)
+                    self.metrics.responses.inc(site, str(response.status))
+                    if response.status == 304 and cached is not None:
+                        self.http_cache.record_revalidation(cached)
+                        await self.http_cache.refresh(url)
+                        return cached.body, response.status
+                    if response.status == 200:
+                        # text() decodes the body read() has already buffered
+                        body = await response.read()
+                        self.metrics.response_bytes.observe(len(body), site)
+                        html = await response.text()
+                        if self.http_cache is not None:
+                            self.http_cache.record_miss()
+                            await self.http_cache.put(
+                                url, html,
+                                etag=response.headers.get('ETag'),
+                                last_modified=response.headers.get('Last-Modified')
+                            )
+                        return html, response.status
+                    return None, response.status
+            except Exception:
+                self.metrics.responses.inc(self.site_label(url), 'error')
+                if proxy is not None:
+                    self.proxy_pool.report(proxy, False)
+                raise
+
+    async def _fetch_robots(self, url: str) -> Optional[str]:
+        """Download robots.txt for the politeness scheduler, bypassing it"""
+        async def get(session):
+            async with session.get(url, headers=self.headers, timeout=10) as response:
+                return await response.text() if response.status == 200 else None
+
+        if self.session is not None and not self.session.closed:
+            return await get(self.session)
+        async with aiohttp.ClientSession() as session:
+            return await get(session)
+
+    async def fetch_with_retry(self, url: str, max_retries: int = 3,
+                               scheduler: Optional[PolitenessScheduler] = None) -> Optional[str]:
+        """Fetch URL content with retry mechanism, paced by `scheduler` or the engine's own"""
+        # Headers are per request; a rotated User-Agent never leaks into other fetches
+        headers = self.headers
+        site = self.site_label(url)
+        self.metrics.in_flight.inc(site)
+        try:
+            for attempt in range(max_retries):
+                if attempt:
+                    self.metrics.retries.inc(site)
+                try:
+                    with self.metrics.time('fetch', site):
+                        if self.session is not None and not self.session.closed:
+                            html, status = await self._get(self.session, url, headers, scheduler)
+                        else:
+                            # No pool opened (e.g. scripts outside the app), use a one-off session
+                            async with aiohttp.ClientSession() as session:
+                                html, status = await self._get(session, url, headers, scheduler)
+                    if html is not None:
+                        return html
+                    if status == 403:
+                        # Rotate User-Agent on 403
+                        headers = {**self.headers, 'User-Agent': USER_AGENTS[attempt % len(USER_AGENTS)]}
+                except Exception as e:
+                    logging.error(f"Attempt {attempt + 1} failed for {url}: {str(e)}")
+                    if attempt == max_retries - 1:
+                        raise
+                    await asyncio.sleep(1)
+            return None
+        finally:
+            self.metrics.in_flight.dec(site)
+
+    def get_site_plan(self, url: str) -> Optional[ExtractionPlan]:
+        """Get the compiled extraction plan for given URL"""
+        return self.registry.get(url)
+
+    def site_label(self, url: str) -> str:
+        """Metrics label for a URL: its site's domain, so label values stay bounded"""
+        plan = self.registry.get(url)
+        return plan.domain if plan else 'other'
 
     def get_site_config(self, url: str) -> Optional[Dict]:
         """Get configuration for given URL"""
-        domain = urlparse(url).netloc.lower()
-        return next((config for site, config in self.site_configs.items() if site in domain), None)
+        plan = self.registry.get(url)
+        return plan.config if plan else None
 
     def clean_text(self, text: str) -> str:
         """Clean and normalize text content"""
-        if not text:
-            return ""
-        # Remove extra whitespace and normalize
-        text = re.sub(r'\s+', ' ', text.strip())
-        # Remove special characters
-        text = re.sub(r'[\n\r\t]', '', text)
-        return text
-
-    def parse_date(self, date_str: str, formats: List[str]) -> Optional[str]:
+        return clean_text(text)
+
+    def parse_date(self, date_str: str, formats: List[str], site: Optional[str] = None) -> Optional[str]:
         """Parse date string to formatted datetime"""
-        if not date_str:
-            return None
+        return self.date_normalizer.parse(date_str, formats, site)
 
-        # Clean the date string
-        date_str = re.sub(r'\s+', ' ', date_str.strip())
-        
-        # Remove common prefixes
-        date_str = re.sub(r'^(Updated:|Published:|Posted:|Last Updated:|Updated on:|Published on:)\s*', '', date_str)
-        
-        # Try parsing with dateutil first
-        try:
-            parsed_date = parser.parse(date_str, fuzzy=True)
-            if parsed_date.tzinfo is None:
-                parsed_date = self.timezone.localize(parsed_date)
-            return parsed_date.strftime('%Y-%m-%d %I:%M %p IST')
-        except:
-            # Try specific formats
-            for fmt in formats:
-                try:
-                    parsed_date = datetime.strptime(date_str, fmt)
-                    parsed_date = self.timezone.localize(parsed_date)
-                    return parsed_date.strftime('%Y-%m-%d %I:%M %p IST')
-                except:
-                    continue
-        
-        return date_str
-
-    def extract_text_from_selectors(self, article: BeautifulSoup, selectors: List[str]) -> Optional[str]:
-        """Try multiple selectors to extract text"""
-        for selector in selectors:
-            element = article.select_one(selector)
-            if element:
-                return self.clean_text(element.get_text())
-        return None
+    def extract_text_from_selectors(self, article, selectors: List) -> Optional[str]:
+        """Try multiple compiled selectors to extract text"""
+        return self.listing_extractor.text_from_selectors(article, selectors)
+
+    def extract_articles(self, html: str, plan: ExtractionPlan) -> List[Dict]:
+        """Parse a listing page and extract its articles"""
+        return self.listing_extractor.extract(html, plan)
 
     async def scrape_website(self, url: str) -> List[Dict]:
         """Main scraping function"""
         try:
-            config = self.get_site_config(url)
-            if not config:
+            # Hold on to this plan, a concurrent reload swaps in new ones without touching it
+            plan = self.get_site_plan(url)
+            if not plan:
                 raise ValueError(f"Unsupported website: {url}")
 
-            html = await self.fetch_with_retry(url)
+            started = time.perf_counter()
+            rendered = plan.render == 'js' and self.browser_pool is not None
+            html = await self.render_page(url, plan) if rendered else await self.fetch_with_retry(url)
             if not html:
                 raise ValueError(f"Failed to fetch content from {url}")
 
-            soup = BeautifulSoup(html, 'html.parser')
-            articles = []
-
-            # Find all article elements
-            article_elements = soup.select(config['selectors']['article_wrapper'])
-            
-            for article in article_elements:
+            articles = await self._extract_listing(html, plan)
+            if not articles and not rendered and self.browser_pool is not None:
+                # Listing probably filled in by scripts; worth one browser render
                 try:
-                    # Extract title and link
-                    title_elem = article.select_one(config['selectors']['title'])
-                    if not title_elem:
-                        continue
-
-                    title = self.clean_text(title_elem.get_text())
-                    link = title_elem.get('href', '')
-                    
-                    # Make link absolute if it's relative
-                    if link and not link.startswith('http'):
-                        link = urljoin(config['base_url'], link)
-
-                    # Extract summary
-                    summary = self.extract_text_from_selectors(article, config['selectors']['summary'])
-
-                    # Extract date
-                    date_str = None
-                    for date_selector in config['selectors']['date']:
-                        date_elem = article.select_one(date_selector)
-                        if date_elem:
-                            date_str = (
-                                date_elem.get('datetime') or 
-                                date_elem.get('data-datetime') or 
-                                date_elem.get_text()
-                            )
-                            if date_str:
-                                break
-
-                    # Parse the date
-                    formatted_date = self.parse_date(date_str, config.get('date_formats', []))
-
-                    # Only add articles with at least a title
-                    if title:
-                        article_data = {
-                            'title': title,
-                            'link': link,
-                            'summary': summary if summary else "Click to read more...",
-                            'published_date': formatted_date,
-                            'source': config['name']
-                        }
-                        
-                        # Avoid duplicates
-                        if article_data not in articles:
-                            articles.append(article_data)
-
+                    html = await self.render_page(url, plan)
+                    articles = await self._extract_listing(html, plan)
                 except Exception as e:
-                    logging.error(f"Error extracting article: {str(e)}")
-                    continue
+                    logging.error(f"Browser fallback failed for {url}: {str(e)}")
+            self.metrics.observe('scrape', plan.domain, time.perf_counter() - started)
+            self.metrics.articles.inc(plan.domain, amount=len(articles))
 
             if not articles:
                 logging.warning(f"No articles found on {url}")
                 return []
 
+            if self.clusterer is not None:
+                for article, story_id in zip(articles, self.clusterer.add_many(articles)):
+                    article['story_id'] = story_id
+
             return articles
 
         except Exception as e:
             logging.error(f"Error scraping {url}: {str(e)}")
             raise
 
+    async def _extract_listing(self, html: str, plan: ExtractionPlan) -> List[Dict]:
+        if self.extraction_pool is not None:
+            # Worker processes keep their own timings; only the round trip is seen here
+            with self.metrics.time('extract', plan.domain):
+                return await self.extraction_pool.extract(plan.domain, html, self.registry.version)
+        return self.extract_articles(html, plan)
+
+    async def _extract_article(self, html: str, plan: ExtractionPlan) -> Dict:
+        if self.extraction_pool is not None:
+            with self.metrics.time('extract', plan.domain):
+                return await self.extraction_pool.extract_article(plan.domain, html, self.registry.version)
+        return self.article_extractor.extract(html, plan.article_selectors)
+
+    async def render_page(self, url: str, plan: Optional[ExtractionPlan] = None) -> str:
+        """Load a page in a pooled headless browser, waiting for the site's articles to appear"""
+        if self.browser_pool is None:
+            raise RuntimeError("JavaScript rendering is not configured")
+        wait_selector = None
+        if plan is not None:
+            wrapper = plan.config['selectors']['article_wrapper']
+            wait_selector = ', '.join(wrapper) if isinstance(wrapper, list) else wrapper
+        with self.metrics.time('render', plan.domain if plan else self.site_label(url)):
+            return await self.browser_pool.render(url, wait_selector)
+
+    async def scrape_google_maps_reviews(self, place_id: str) -> List[Dict]:
+        """Reviews shown on a Google Maps place page, which only exist once rendered"""
+        url = GOOGLE_MAPS_PLACE_URL.format(place_id=place_id)
+        if self.browser_pool is None:
+            raise RuntimeError("JavaScript rendering is not configured")
+        with self.metrics.time('render', 'google.com'):
+            html = await self.browser_pool.render(url, GOOGLE_MAPS_REVIEW_SELECTORS['review'])
+        selectors = self.review_selectors
+        root = self.parser.parse(html)
+        reviews = []
+        for review in self.parser.select(root, selectors['review']):
+            rating = self.parser.select_one(review, selectors['rating'])
+            reviews.append({
+                'author': self.extract_text_from_selectors(review, [selectors['author']]),
+                # Only the aria-label carries the score, e.g. "4 stars"
+                'rating': self.parser.attr(rating, 'aria-label') if rating is not None else None,
+                'text': self.extract_text_from_selectors(review, [selectors['text']]),
+                'date': self.extract_text_from_selectors(review, [selectors['date']]),
+                'place_id': place_id
+            })
+        return reviews
+
+    async def scrape_cached(self, url: str) -> List[Dict]:
+        """Scrape through the result cache, coalescing concurrent scrapes of one URL"""
+        if self.result_cache is None:
+            return await self.scrape_website(url)
+        return await self.result_cache.get_or_load(normalize_url(url), lambda: self.scrape_website(url))
+
+    async def fetch_article(self, link: str, plan: ExtractionPlan) -> Dict:
+        """Fetch one article page and extract its details, at most once per URL while cached"""
+        async def load() -> Dict:
+            limit = self._article_limits.get(plan.domain)
+            if limit is None:
+                limit = self._article_limits[plan.domain] = asyncio.Semaphore(self.article_concurrency)
+            async with limit:
+                html = await self.fetch_with_retry(link, scheduler=self.article_scheduler)
+            if not html:
+                raise ValueError(f"Failed to fetch content from {link}")
+            details = await self._extract_article(html, plan)
+            details['published_date'] = self.parse_date(details.pop('published'), plan.date_formats, plan.name)
+            return details
+
+        if self.article_cache is None:
+            return await load()
+        return await self.article_cache.get_or_load(normalize_url(link), load)
+
+    @staticmethod
+    def merge_article(article: Dict, details: Dict) -> Dict:
+        """Listing article updated with what its own page says"""
+        enriched = dict(article)
+        enriched['body'] = details['body']
+        enriched['author'] = details['author']
+        enriched['tags'] = details['tags']
+        if details['canonical_url']:
+            enriched['canonical_url'] = details['canonical_url']
+        if details['published_date']:
+            enriched['published_date'] = details['published_date']
+        if enriched.get('summary') == SUMMARY_PLACEHOLDER and details['body']:
+            enriched['summary'] = details['body'].split('\n\n', 1)[0][:SUMMARY_LENGTH]
+        return enriched
+
+    async def enrich_articles(self, articles: List[Dict], plan: ExtractionPlan) -> AsyncIterator[Dict]:
+        """Fetch all article pages concurrently, yielding each enriched article as it completes"""
+        async def enrich(article: Dict) -> Dict:
+            try:
+                details = await self.fetch_article(article['link'], plan)
+            except Exception as e:
+                logging.error(f"Error fetching article {article['link']}: {str(e)}")
+                return {**article, 'body': None, 'error': str(e)}
+            return self.merge_article(article, details)
+
+        tasks = [asyncio.ensure_future(enrich(article)) for article in articles if article.get('link')]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def scrape_deep(self, url: str) -> AsyncIterator[Dict]:
+        """Yield the listing first, then each article once its page has been fetched"""
+        plan = self.get_site_plan(url)
+        if not plan:
+            raise ValueError(f"Unsupported website: {url}")
+        articles = await self.scrape_cached(url)
+        yield {'type': 'listing', 'data': articles}
+        async for article in self.enrich_articles(articles, plan):
+            yield {'type': 'article', 'data': article}
+
+    async def scrape_website_deep(self, url: str) -> List[Dict]:
+        """Deep scrape collected into one list in listing order"""
+        articles: List[Dict] = []
+        enriched: Dict[str, Dict] = {}
+        async for event in self.scrape_deep(url):
+            if event['type'] == 'listing':
+                articles = event['data']
+            else:
+                enriched[event['data']['link']] = event['data']
+        return [enriched.get(article.get('link'), article) for article in articles]
+
+    async def filter_unseen(self, consumer: str, articles: List[Dict]) -> List[Dict]:
+        """Keep only articles this consumer has not been given before"""
+        if self.seen_store is None:
+            raise ValueError("No seen store configured")
+        return await self.seen_store.filter_unseen(consumer, articles)
+
+    async def scrape_sites(self, sites: Optional[List[str]] = None,
+                           concurrency: int = 4) -> AsyncIterator[Dict]:
+        """Scrape several configured sites concurrently, yielding each as it finishes"""
+        plans = self.registry.plans
+        sites = sites or list(plans)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def scrape_one(site: str) -> Dict:
+            plan = plans.get(site)
+            if not plan:
+                return {'site': site, 'status': 'error', 'message': f"Unsupported site: {site}", 'data': []}
+            async with semaphore:
+                try:
+                    articles = await self.scrape_cached(plan.config['education_url'])
+                    return {'site': site, 'name': plan.name, 'status': 'success', 'data': articles}
+                except Exception as e:
+                    return {'site': site, 'name': plan.name, 'status': 'error', 'message': str(e), 'data': []}
+
+        tasks = [asyncio.ensure_future(scrape_one(site)) for site in sites]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Client went away or the consumer stopped early
+            for task in tasks:
+                task.cancel()
+
 # Initialize scraping engine
-scraping_engine = ScrapingEngine()
\ No newline at end of file
+scraping_engine = ScrapingEngine(
+    http_cache=HTTPCache(
+        os.getenv('HTTP_CACHE_PATH', 'cache/http_cache.db'),
+        max_bytes=int(os.getenv('HTTP_CACHE_MAX_BYTES', 100 * 1024 * 1024)),
+        ttl=float(os.getenv('HTTP_CACHE_TTL', 300))
+    ),
+    result_cache=ResultCache(
+        ttl=float(os.getenv('RESULT_CACHE_TTL', 60)),
+        stale_ttl=float(os.getenv('RESULT_CACHE_STALE_TTL', 600)),
+        max_entries=int(os.getenv('RESULT_CACHE_MAX_ENTRIES', 256))
+    ),
+    extraction_mode=os.getenv('EXTRACTION_MODE', 'inline'),
+    extraction_workers=int(os.getenv('EXTRACTION_WORKERS', 0)) or None,
+    seen_store=create_seen_store(
+        os.getenv('SEEN_STORE', 'bloom'),
+        path=os.getenv('SEEN_STORE_PATH', 'cache/seen.bloom'),
+        capacity=int(os.getenv('SEEN_STORE_CAPACITY', 100000))
+    ),
+    scheduler=PolitenessScheduler(
+        concurrency=int(os.getenv('HOST_CONCURRENCY', 2)),
+        min_interval=float(os.getenv('HOST_MIN_INTERVAL', 0.5))
+    ),
+    # Deep mode's article pages: a few at once per host, robots.txt Crawl-delay still honored
+    article_scheduler=PolitenessScheduler(
+        concurrency=int(os.getenv('ARTICLE_HOST_CONCURRENCY', 8)),
+        min_interval=float(os.getenv('ARTICLE_HOST_MIN_INTERVAL', 0))
+    ),
+    # Direct connections unless proxy providers are configured
+    proxy_pool=ProxyRotator(
+        providers=os.getenv('PROXY_PROVIDERS').split(','),
+        check_url=os.getenv('PROXY_CHECK_URL', 'https://httpbin.org/ip'),
+        check_interval=float(os.getenv('PROXY_CHECK_INTERVAL', 300)),
+        # Off unless the server's own address may be exposed when every proxy is down
+        fallback_direct=os.getenv('PROXY_FALLBACK_DIRECT', '').lower() in ('1', 'true', 'yes')
+    ) if os.getenv('PROXY_PROVIDERS') else None,
+    article_cache=ResultCache(
+        ttl=float(os.getenv('ARTICLE_CACHE_TTL', 7 * 24 * 3600)),
+        stale_ttl=0,
+        max_entries=int(os.getenv('ARTICLE_CACHE_MAX_ENTRIES', 5000))
+    ),
+    article_concurrency=int(os.getenv('ARTICLE_CONCURRENCY', 8)),
+    browser_pool=create_browser_pool(),
+    clusterer=create_story_clusterer()
+)
\ No newline at end of file
@@ -1,62 +1,118 @@
-from typing import Dict, Any
-from bs4 import BeautifulSoup
+from typing import Dict, Any, AsyncIterator, Optional
+from .html_stream import Source, StreamingParser
+from .parsers import LxmlBackend, ParserBackend, compile_selectors, get_parser_backend
 import json
 
 class ScrapingTemplate:
-    def __init__(self, config: Dict[str, Any]):
+    # Fixed per-record selectors, compiled alongside the configured ones
+    field_selectors: Dict[str, str] = {}
+    # Config selector matching one record (review, post, job) per element
+    record_selector: str = ''
+    # Page-level fields copied into every streamed record: output name -> config selector
+    context_fields: Dict[str, str] = {}
+
+    def __init__(self, config: Dict[str, Any], parser_backend: Optional[ParserBackend] = None):
         self.config = config
+        self.parser = parser_backend or get_parser_backend()
+        self.selectors = compile_selectors(config.get('selectors', {}), self.parser)
+        self.fields = compile_selectors(self.field_selectors, self.parser)
+        self._streaming = None
+
+    def text(self, node: Any, selector: Any, parser: Optional[ParserBackend] = None) -> Optional[str]:
+        """Text of the first match, None when the element is missing"""
+        parser = parser or self.parser
+        element = parser.select_one(node, selector)
+        return parser.text(element) if element is not None else None
+
+    def record(self, node: Any, fields: Optional[Dict[str, Any]] = None,
+               parser: Optional[ParserBackend] = None) -> Dict[str, Optional[str]]:
+        return {field: self.text(node, selector, parser) for field, selector in (fields or self.fields).items()}
 
     async def extract_data(self, html: str) -> Dict[str, Any]:
         raise NotImplementedError
 
+    async def stream_records(self, source: Source) -> AsyncIterator[Dict[str, Any]]:
+        """Yield records as their elements close while the page is still being parsed.
+
+        `source` is the HTML, or sync or async chunks of it such as an aiohttp
+        response's `content.iter_chunked()`. Memory stays around one record
+        rather than the whole document; missing fields come out as None.
+        """
+        if self._streaming is None:
+            backend = LxmlBackend()
+            selectors = self.config.get('selectors', {})
+            self._streaming = (
+                backend,
+                compile_selectors(self.field_selectors, backend),
+                StreamingParser(
+                    selectors[self.record_selector],
+                    {name: selectors[key] for name, key in self.context_fields.items() if key in selectors}
+                )
+            )
+        backend, fields, parser = self._streaming
+
+        context = dict.fromkeys(self.context_fields)
+        async for name, element in parser.elements(source):
+            if name != 'record':
+                if context[name] is None:
+                    context[name] = backend.text(element)
+                continue
+            record = self.record(element, fields, backend)
+            record.update(context)
+            yield record
+
 class EcommerceScraper(ScrapingTemplate):
+    field_selectors = {
+        'rating': '.rating',
+        'comment': '.comment',
+        'author': '.author'
+    }
+    record_selector = 'reviews'
+    context_fields = {
+        'product_name': 'name',
+        'price': 'price'
+    }
+
     async def extract_data(self, html: str) -> Dict[str, Any]:
-        soup = BeautifulSoup(html, 'html.parser')
+        root = self.parser.parse(html)
         data = {
-            'product_name': soup.select_one(self.config['selectors']['name']).text,
-            'price': soup.select_one(self.config['selectors']['price']).text,
-            'description': soup.select_one(self.config['selectors']['description']).text,
-            'images': [img['src'] for img in soup.select(self.config['selectors']['images'])],
-            'reviews': [
-                {
-                    'rating': review.select_one('.rating').text,
-                    'comment': review.select_one('.comment').text,
-                    'author': review.select_one('.author').text
-                }
-                for review in soup.select(self.config['selectors']['reviews'])
-            ]
+            'product_name': self.text(root, self.selectors['name']),
+            'price': self.text(root, self.selectors['price']),
+            'description': self.text(root, self.selectors['description']),
+            'images': [self.parser.attr(img, 'src') for img in self.parser.select(root, self.selectors['images'])],
+            'reviews': [self.record(review) for review in self.parser.select(root, self.selectors['reviews'])]
         }
         return data
 
 class SocialMediaScraper(ScrapingTemplate):
+    field_selectors = {
+        'content': '.content',
+        'likes': '.likes',
+        'comments': '.comments',
+        'timestamp': '.timestamp'
+    }
+    record_selector = 'posts'
+
     async def extract_data(self, html: str) -> Dict[str, Any]:
-        soup = BeautifulSoup(html, 'html.parser')
+        root = self.parser.parse(html)
         data = {
-            'posts': [
-                {
-                    'content': post.select_one('.content').text,
-                    'likes': post.select_one('.likes').text,
-                    'comments': post.select_one('.comments').text,
-                    'timestamp': post.select_one('.timestamp').text
-                }
-                for post in soup.select(self.config['selectors']['posts'])
-            ]
+            'posts': [self.record(post) for post in self.parser.select(root, self.selectors['posts'])]
         }
         return data
 
 class JobBoardScraper(ScrapingTemplate):
+    field_selectors = {
+        'title': '.title',
+        'company': '.company',
+        'location': '.location',
+        'salary': '.salary',
+        'description': '.description'
+    }
+    record_selector = 'jobs'
+
     async def extract_data(self, html: str) -> Dict[str, Any]:
-        soup = BeautifulSoup(html, 'html.parser')
+        root = self.parser.parse(html)
         data = {
-            'jobs': [
-                {
-                    'title': job.select_one('.title').text,
-                    'company': job.select_one('.company').text,
-                    'location': job.select_one('.location').text,
-                    'salary': job.select_one('.salary').text,
-                    'description': job.select_one('.description').text
-                }
-                for job in soup.select(self.config['selectors']['jobs'])
-            ]
+            'jobs': [self.record(job) for job in self.parser.select(root, self.selectors['jobs'])]
         }
-        return data 
\ No newline at end of file
+        return data
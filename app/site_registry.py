@@ -0,0 +1,164 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from .parsers import ParserBackend, compile_selectors
+
+try:
+    import yaml
+except ImportError:  # YAML site files are optional
+    yaml = None
+
+REQUIRED_FIELDS = ('domain', 'name', 'base_url', 'education_url', 'selectors')
+REQUIRED_SELECTORS = ('article_wrapper', 'title', 'date', 'summary')
+LIST_SELECTORS = ('date', 'summary')
+RENDER_MODES = ('static', 'js')
+
+
+class ExtractionPlan:
+    """A site config validated and compiled once for a parser backend"""
+
+    def __init__(self, config: Dict[str, Any], parser: ParserBackend, path: Optional[str] = None):
+        for field in REQUIRED_FIELDS:
+            if field not in config:
+                raise ValueError(f"Missing required field: {field}")
+        for key in REQUIRED_SELECTORS:
+            if key not in config['selectors']:
+                raise ValueError(f"Missing required selector: {key}")
+
+        selectors = dict(config['selectors'])
+        for key in LIST_SELECTORS:
+            if isinstance(selectors[key], str):
+                selectors[key] = [selectors[key]]
+
+        date_formats = list(config.get('date_formats', []))
+        for fmt in date_formats:
+            if '%' not in fmt:
+                raise ValueError(f"Date format has no directives: {fmt!r}")
+            datetime(2000, 1, 1).strftime(fmt)
+
+        render = config.get('render', 'static')
+        if render not in RENDER_MODES:
+            raise ValueError(f"Unknown render mode: {render}")
+
+        self.config = config
+        self.path = path
+        # 'js' sites only have their articles once a browser runs the page's scripts
+        self.render = render
+        self.domain = config['domain'].lower()
+        self.name = config['name']
+        self.base_url = config['base_url']
+        self.date_formats = date_formats
+        # Raises on invalid CSS, rejecting the whole config
+        self.selectors = compile_selectors(selectors, parser)
+        # Optional selectors for article pages in deep mode, each a list
+        article_selectors = {
+            key: [value] if isinstance(value, str) else value
+            for key, value in config.get('article_selectors', {}).items()
+        }
+        self.article_selectors = compile_selectors(article_selectors, parser)
+
+
+def load_config_file(path: str) -> Dict[str, Any]:
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.json'):
+            return json.load(f)
+        if yaml is None:
+            raise ImportError("PyYAML is required for YAML site configs")
+        return yaml.safe_load(f)
+
+
+class SiteRegistry:
+    """Site configs loaded from a directory, indexed by domain suffix, hot reloadable"""
+
+    extensions = ('.json', '.yaml', '.yml')
+
+    def __init__(self, directory: str, parser: ParserBackend):
+        self.directory = directory
+        self.parser = parser
+        self.plans: Dict[str, ExtractionPlan] = {}
+        self.version: Tuple = ()
+        self._watch_task: Optional[asyncio.Task] = None
+        self.load()
+
+    def _signature(self) -> Tuple:
+        """Filenames with mtimes and sizes; changes whenever a config changes"""
+        entries = []
+        for filename in sorted(os.listdir(self.directory)):
+            if filename.endswith(self.extensions):
+                stat = os.stat(os.path.join(self.directory, filename))
+                entries.append((filename, stat.st_mtime_ns, stat.st_size))
+        return tuple(entries)
+
+    def _build(self) -> Tuple[Dict[str, ExtractionPlan], Tuple]:
+        signature = self._signature()
+        previous = {plan.path: plan for plan in self.plans.values()}
+        plans = {}
+        for filename, _, _ in signature:
+            path = os.path.join(self.directory, filename)
+            try:
+                plan = ExtractionPlan(load_config_file(path), self.parser, path)
+            except Exception as e:
+                logging.error(f"Invalid site config {path}: {str(e)}")
+                plan = previous.get(path)
+                if plan is None:
+                    continue
+            if plan.domain in plans:
+                logging.error(f"Duplicate site config for {plan.domain} in {path}")
+                continue
+            plans[plan.domain] = plan
+        return plans, signature
+
+    def load(self):
+        """(Re)load every config; the swap is a single assignment so readers never see a partial registry"""
+        self.plans, self.version = self._build()
+
+    async def reload_if_changed(self) -> bool:
+        signature = await asyncio.to_thread(self._signature)
+        if signature == self.version:
+            return False
+        plans, version = await asyncio.to_thread(self._build)
+        self.plans, self.version = plans, version
+        logging.info(f"Reloaded {len(plans)} site configs from {self.directory}")
+        return True
+
+    async def _watch(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reload_if_changed()
+            except Exception as e:
+                logging.error(f"Site config reload failed: {str(e)}")
+
+    def start_watching(self, interval: float = 5):
+        if self._watch_task is None:
+            self._watch_task = asyncio.ensure_future(self._watch(interval))
+
+    async def stop_watching(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    def get(self, url: str) -> Optional[ExtractionPlan]:
+        """Look up a URL's plan by its host, then each parent domain"""
+        plans = self.plans
+        host = (urlparse(url).hostname or '').lower()
+        labels = host.split('.')
+        for i in range(len(labels) - 1):
+            plan = plans.get('.'.join(labels[i:]))
+            if plan is not None:
+                return plan
+        return None
+
+    def configs(self) -> Dict[str, Dict[str, Any]]:
+        return {domain: plan.config for domain, plan in self.plans.items()}
+
+    def __len__(self) -> int:
+        return len(self.plans)
@@ -171,21 +171,7 @@ async function scrapeWebsite() {
 
         // Display results
         contentList.innerHTML = '';
-        data.data.forEach(item => {
-            const article = document.createElement('div');
-            article.className = 'mb-4 p-4 bg-white rounded shadow';
-            article.innerHTML = `
-                <h3 class="text-xl font-bold mb-2">${item.title}</h3>
-                <p class="text-gray-600 mb-2">${item.summary}</p>
-                <div class="text-sm text-gray-500 mb-2">
-                    ${item.published_date ? `Published: ${item.published_date}` : ''}
-                </div>
-                <div class="text-sm text-gray-500 mb-2">Source: ${item.source}</div>
-                <a href="${item.link}" target="_blank" 
-                   class="text-blue-600 hover:text-blue-800">Read More</a>
-            `;
-            contentList.appendChild(article);
-        });
+        data.data.forEach(appendArticle);
 
         results.classList.remove('hidden');
 
@@ -197,6 +183,72 @@ async function scrapeWebsite() {
     }
 }
 
+function appendArticle(item) {
+    const article = document.createElement('div');
+    article.className = 'mb-4 p-4 bg-white rounded shadow';
+    article.innerHTML = `
+        <h3 class="text-xl font-bold mb-2">${item.title}</h3>
+        <p class="text-gray-600 mb-2">${item.summary}</p>
+        <div class="text-sm text-gray-500 mb-2">
+            ${item.published_date ? `Published: ${item.published_date}` : ''}
+        </div>
+        <div class="text-sm text-gray-500 mb-2">Source: ${item.source}</div>
+        <a href="${item.link}" target="_blank" 
+           class="text-blue-600 hover:text-blue-800">Read More</a>
+    `;
+    document.getElementById('contentList').appendChild(article);
+}
+
+async function scrapeAllSites() {
+    const loading = document.getElementById('loading');
+    const results = document.getElementById('results');
+    const error = document.getElementById('error');
+    const contentList = document.getElementById('contentList');
+    const failures = [];
+
+    contentList.innerHTML = '';
+    error.classList.add('hidden');
+    loading.classList.remove('hidden');
+
+    try {
+        // Results arrive as NDJSON, one line per site as soon as it finishes
+        const response = await fetch('/scrape/all?format=ndjson');
+        if (!response.ok) throw new Error('Failed to scrape sites');
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            for (const line of lines) {
+                if (!line.trim()) continue;
+                const site = JSON.parse(line);
+                if (site.status === 'error') {
+                    failures.push(`${site.name || site.site}: ${site.message}`);
+                    continue;
+                }
+                site.data.forEach(appendArticle);
+                results.classList.remove('hidden');
+            }
+        }
+
+        if (failures.length) {
+            showError(`Some sites failed: ${failures.join('; ')}`);
+        }
+    } catch (err) {
+        showError(err.message || 'An error occurred while scraping');
+        console.error(err);
+    } finally {
+        loading.classList.add('hidden');
+    }
+}
+
 // Add event listener to the form
 document.getElementById('scrapeForm').addEventListener('submit', function(e) {
     e.preventDefault();
@@ -0,0 +1,296 @@
+import asyncio
+import base64
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import pytz
+from .date_parser import OUTPUT_FORMAT
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS scrapers ('
+    'id TEXT PRIMARY KEY, user TEXT NOT NULL, name TEXT NOT NULL, type TEXT NOT NULL, '
+    'target_url TEXT NOT NULL, selectors TEXT NOT NULL, schedule TEXT, proxy_config TEXT, '
+    'created_at REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS scrapers_user ON scrapers (user, created_at, id)',
+    'CREATE TABLE IF NOT EXISTS runs ('
+    'id TEXT PRIMARY KEY, scraper_id TEXT NOT NULL, status TEXT NOT NULL, started_at REAL NOT NULL, '
+    'ended_at REAL, article_count INTEGER NOT NULL DEFAULT 0, error TEXT)',
+    'CREATE INDEX IF NOT EXISTS runs_scraper ON runs (scraper_id, started_at, id)',
+    # published_at is the parsed publish time (0 when unknown) so it can be indexed and sorted
+    'CREATE TABLE IF NOT EXISTS results ('
+    'id INTEGER PRIMARY KEY, run_id TEXT NOT NULL, scraper_id TEXT NOT NULL, title TEXT NOT NULL, '
+    'link TEXT, summary TEXT, published_date TEXT, published_at REAL NOT NULL, source TEXT, '
+    'data TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS results_run ON results (run_id, id)',
+    'CREATE INDEX IF NOT EXISTS results_scraper ON results (scraper_id, id)',
+    'CREATE INDEX IF NOT EXISTS results_source ON results (source, published_at, id)',
+    'CREATE INDEX IF NOT EXISTS results_published ON results (published_at, id)',
+    "CREATE VIRTUAL TABLE IF NOT EXISTS results_fts USING fts5("
+    "title, summary, content='results', content_rowid='id')",
+    'CREATE TRIGGER IF NOT EXISTS results_fts_insert AFTER INSERT ON results BEGIN '
+    'INSERT INTO results_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary); END',
+    'CREATE TRIGGER IF NOT EXISTS results_fts_delete AFTER DELETE ON results BEGIN '
+    "INSERT INTO results_fts (results_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary); END"
+]
+
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def encode_cursor(*values: Any) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[List[Any]]:
+    if not cursor:
+        return None
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+
+def fts_query(text: str) -> str:
+    """Quote each term so user input can't break FTS5 query syntax; terms are ANDed"""
+    return ' '.join(f'"{term}"' for term in TERM_RE.findall(text))
+
+
+class ResultStore:
+    """Scrapers, runs and article results in SQLite (WAL), queried off the event loop.
+
+    List methods use keyset pagination: each page returns an opaque cursor
+    holding the last row's sort key, so any page costs one index seek.
+    """
+
+    def __init__(self, path: str, timezone: str = 'Asia/Kolkata'):
+        self.path = path
+        self.timezone = pytz.timezone(timezone)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            for statement in SCHEMA:
+                self._conn.execute(statement)
+            self._conn.commit()
+        return self._conn
+
+    def _execute(self, sql: str, params: Sequence = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(sql, params).fetchall()
+            conn.commit()
+            return rows
+
+    async def _run(self, sql: str, params: Sequence = ()) -> List[sqlite3.Row]:
+        return await asyncio.to_thread(self._execute, sql, params)
+
+    def published_at(self, published_date: Optional[str]) -> float:
+        """Sortable timestamp for an engine-formatted publish date, 0 if unparseable"""
+        if not published_date:
+            return 0.0
+        try:
+            parsed = datetime.strptime(published_date, OUTPUT_FORMAT)
+        except ValueError:
+            return 0.0
+        return self.timezone.localize(parsed).timestamp()
+
+    @staticmethod
+    def _scraper(row: sqlite3.Row) -> Dict[str, Any]:
+        scraper = dict(row)
+        scraper['selectors'] = json.loads(scraper['selectors'])
+        scraper['proxy_config'] = json.loads(scraper['proxy_config']) if scraper['proxy_config'] else None
+        return scraper
+
+    @staticmethod
+    def _result(row: sqlite3.Row) -> Dict[str, Any]:
+        result = json.loads(row['data'])
+        result['id'] = row['id']
+        result['run_id'] = row['run_id']
+        result['scraper_id'] = row['scraper_id']
+        return result
+
+    # Scrapers
+
+    async def create_scraper(self, user: str, scraper: Dict[str, Any]) -> Dict[str, Any]:
+        scraper_id = uuid.uuid4().hex
+        await self._run(
+            'INSERT INTO scrapers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (scraper_id, user, scraper['name'], scraper['type'], scraper['target_url'],
+             json.dumps(scraper.get('selectors') or {}), scraper.get('schedule'),
+             json.dumps(scraper['proxy_config']) if scraper.get('proxy_config') else None, time.time())
+        )
+        return await self.get_scraper(scraper_id)
+
+    async def get_scraper(self, scraper_id: str) -> Optional[Dict[str, Any]]:
+        rows = await self._run('SELECT * FROM scrapers WHERE id = ?', (scraper_id,))
+        return self._scraper(rows[0]) if rows else None
+
+    async def list_scrapers(self, user: str, cursor: Optional[str] = None,
+                            limit: int = 50) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        after = decode_cursor(cursor)
+        if after is None:
+            rows = await self._run(
+                'SELECT * FROM scrapers WHERE user = ? ORDER BY created_at, id LIMIT ?', (user, limit)
+            )
+        else:
+            rows = await self._run(
+                'SELECT * FROM scrapers WHERE user = ? AND (created_at, id) > (?, ?) '
+                'ORDER BY created_at, id LIMIT ?', (user, after[0], after[1], limit)
+            )
+        next_cursor = encode_cursor(rows[-1]['created_at'], rows[-1]['id']) if len(rows) == limit else None
+        return [self._scraper(row) for row in rows], next_cursor
+
+    async def set_schedule(self, scraper_id: str, schedule: Optional[str],
+                           target_url: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Store a scraper's cron schedule (None unschedules it) and optionally a new target URL"""
+        await self._run(
+            'UPDATE scrapers SET schedule = ?, target_url = COALESCE(?, target_url) WHERE id = ?',
+            (schedule, target_url, scraper_id)
+        )
+        return await self.get_scraper(scraper_id)
+
+    async def scheduled_scrapers(self) -> List[Dict[str, Any]]:
+        rows = await self._run('SELECT * FROM scrapers WHERE schedule IS NOT NULL')
+        return [self._scraper(row) for row in rows]
+
+    # Runs
+
+    async def start_run(self, run_id: str, scraper_id: str):
+        await self._run(
+            "INSERT OR REPLACE INTO runs (id, scraper_id, status, started_at) VALUES (?, ?, 'running', ?)",
+            (run_id, scraper_id, time.time())
+        )
+
+    def _finish_run(self, run_id: str, scraper_id: str, articles: List[Dict[str, Any]]):
+        rows = [
+            (run_id, scraper_id, article.get('title') or '', article.get('link'), article.get('summary'),
+             article.get('published_date'), self.published_at(article.get('published_date')),
+             article.get('source'), json.dumps(article, ensure_ascii=False))
+            for article in articles
+        ]
+        with self._lock:
+            conn = self._connect()
+            # One transaction per run: the results and the run status land together
+            with conn:
+                conn.executemany(
+                    'INSERT INTO results (run_id, scraper_id, title, link, summary, published_date, '
+                    'published_at, source, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows
+                )
+                conn.execute(
+                    "UPDATE runs SET status = 'finished', ended_at = ?, article_count = ? WHERE id = ?",
+                    (time.time(), len(rows), run_id)
+                )
+
+    async def finish_run(self, run_id: str, scraper_id: str, articles: List[Dict[str, Any]]):
+        """Bulk insert a run's articles and mark it finished"""
+        await asyncio.to_thread(self._finish_run, run_id, scraper_id, articles)
+
+    async def fail_run(self, run_id: str, error: str):
+        await self._run(
+            "UPDATE runs SET status = 'failed', ended_at = ?, error = ? WHERE id = ?",
+            (time.time(), error, run_id)
+        )
+
+    async def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        rows = await self._run('SELECT * FROM runs WHERE id = ?', (run_id,))
+        return dict(rows[0]) if rows else None
+
+    async def list_runs(self, scraper_id: str, cursor: Optional[str] = None,
+                        limit: int = 50) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Runs newest first"""
+        after = decode_cursor(cursor)
+        if after is None:
+            rows = await self._run(
+                'SELECT * FROM runs WHERE scraper_id = ? ORDER BY started_at DESC, id DESC LIMIT ?',
+                (scraper_id, limit)
+            )
+        else:
+            rows = await self._run(
+                'SELECT * FROM runs WHERE scraper_id = ? AND (started_at, id) < (?, ?) '
+                'ORDER BY started_at DESC, id DESC LIMIT ?', (scraper_id, after[0], after[1], limit)
+            )
+        next_cursor = encode_cursor(rows[-1]['started_at'], rows[-1]['id']) if len(rows) == limit else None
+        return [dict(row) for row in rows], next_cursor
+
+    # Results
+
+    async def list_results(self, run_id: Optional[str] = None, source: Optional[str] = None,
+                           cursor: Optional[str] = None, limit: int = 50,
+                           user: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """A run's results in scrape order, or results newest-published first, optionally for one source.
+
+        With `user`, only results of that user's scrapers are listed.
+        """
+        after = decode_cursor(cursor)
+        if run_id is not None:
+            where, params = ['run_id = ?'], [run_id]
+            if after is not None:
+                where.append('id > ?')
+                params.append(after[0])
+            order = 'id'
+        else:
+            where, params = [], []
+            if source is not None:
+                where.append('source = ?')
+                params.append(source)
+            if after is not None:
+                where.append('(published_at, id) < (?, ?)')
+                params.extend(after)
+            order = 'published_at DESC, id DESC'
+        if user is not None:
+            where.append('scraper_id IN (SELECT id FROM scrapers WHERE user = ?)')
+            params.append(user)
+
+        sql = 'SELECT * FROM results'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        rows = await self._run(f"{sql} ORDER BY {order} LIMIT ?", params + [limit])
+        next_cursor = None
+        if len(rows) == limit:
+            last = rows[-1]
+            next_cursor = encode_cursor(last['id']) if run_id is not None else encode_cursor(last['published_at'], last['id'])
+        return [self._result(row) for row in rows], next_cursor
+
+    async def search(self, text: str, cursor: Optional[str] = None, limit: int = 50,
+                     user: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Full-text search over titles and summaries, best matches first, optionally one user's"""
+        query = fts_query(text)
+        if not query:
+            return [], None
+        after = decode_cursor(cursor)
+        sql = (
+            'SELECT results.*, results_fts.rank AS score FROM results_fts '
+            'JOIN results ON results.id = results_fts.rowid WHERE results_fts MATCH ?'
+        )
+        params: List[Any] = [query]
+        if user is not None:
+            sql += ' AND results.scraper_id IN (SELECT id FROM scrapers WHERE user = ?)'
+            params.append(user)
+        if after is not None:
+            sql += ' AND (results_fts.rank, results.id) > (?, ?)'
+            params.extend(after)
+        rows = await self._run(sql + ' ORDER BY results_fts.rank, results.id LIMIT ?', params + [limit])
+        next_cursor = encode_cursor(rows[-1]['score'], rows[-1]['id']) if len(rows) == limit else None
+        return [self._result(row) for row in rows], next_cursor
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+result_store = ResultStore(os.getenv('RESULT_STORE_PATH', 'cache/results.db'))
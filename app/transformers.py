@@ -1,11 +1,107 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterable, AsyncIterator, Optional, Sequence, Tuple, Union
 import pandas as pd
 from datetime import datetime
 import re
 
+TAG_RE = re.compile(r'<[^>]+>')
+NUMBER_RE = re.compile(r'\d+\.?\d*')
+
+
+class KeywordMatcher:
+    """Finds the first category (in config order) with a keyword in a text.
+
+    Few keywords are checked with plain substring tests; larger sets use an
+    Aho-Corasick automaton so one pass over the text covers every keyword.
+    """
+
+    automaton_threshold = 32
+
+    def __init__(self, categories: Dict[str, Sequence[str]]):
+        self.categories = list(categories)
+        self.keywords: List[Tuple[str, int]] = [
+            (keyword.lower(), index)
+            for index, keywords in enumerate(categories.values())
+            for keyword in keywords
+        ]
+        # An empty keyword matches any text
+        self.always = min((index for keyword, index in self.keywords if not keyword), default=None)
+        self.use_automaton = len(self.keywords) > self.automaton_threshold
+        if self.use_automaton:
+            self._build([(keyword, index) for keyword, index in self.keywords if keyword])
+
+    def _build(self, keywords: List[Tuple[str, int]]):
+        # Trie, then failure links turned into a full transition table (a DFA)
+        goto: List[Dict[str, int]] = [{}]
+        best: List[Optional[int]] = [None]
+        for keyword, index in keywords:
+            state = 0
+            for char in keyword:
+                if char not in goto[state]:
+                    goto.append({})
+                    best.append(None)
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            if best[state] is None or index < best[state]:
+                best[state] = index
+
+        alphabet = {char for keyword, _ in keywords for char in keyword}
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict() for _ in goto]
+        queue = []
+        for char in alphabet:
+            child = goto[0].get(char)
+            if child is not None:
+                delta[0][char] = child
+                queue.append(child)
+        for state in queue:
+            # BFS order guarantees fail[state] is complete before its children
+            inherited = best[fail[state]]
+            if inherited is not None and (best[state] is None or inherited < best[state]):
+                best[state] = inherited
+            for char in alphabet:
+                child = goto[state].get(char)
+                if child is not None:
+                    fail[child] = delta[fail[state]].get(char, 0)
+                    delta[state][char] = child
+                    queue.append(child)
+                else:
+                    target = delta[fail[state]].get(char, 0)
+                    if target:
+                        delta[state][char] = target
+        self.delta = delta
+        self.best = best
+
+    def match(self, text: str) -> Optional[str]:
+        text = text.lower()
+        found = self.always
+        if found == 0:
+            return self.categories[0]
+
+        if not self.use_automaton:
+            for keyword, index in self.keywords:
+                if found is not None and index >= found:
+                    break
+                if keyword in text:
+                    found = index
+                    break
+        else:
+            delta, best = self.delta, self.best
+            state = 0
+            for char in text:
+                state = delta[state].get(char, 0)
+                index = best[state]
+                if index is not None and (found is None or index < found):
+                    found = index
+                    if found == 0:
+                        break
+
+        return self.categories[found] if found is not None else None
+
+
 class DataTransformationPipeline:
     def __init__(self, steps: List[Dict[str, Any]]):
         self.steps = steps
+        self._matchers: Dict[Tuple[int, str], KeywordMatcher] = {}
 
     async def transform(self, data: Dict[str, Any]) -> Dict[str, Any]:
         transformed_data = data.copy()
@@ -14,6 +110,29 @@ class DataTransformationPipeline:
             transformed_data = await transformer(transformed_data, step['config'])
         return transformed_data
 
+    async def transform_batch(self, records: Union[List[Dict[str, Any]], pd.DataFrame]) -> Union[List[Dict[str, Any]], pd.DataFrame]:
+        """Run every step column-wise over a batch; same output as transform() per record"""
+        is_frame = isinstance(records, pd.DataFrame)
+        batch = records.to_dict('records') if is_frame else [record.copy() for record in records]
+        for step in self.steps:
+            transformer = self.get_batch_transformer(step['type'])
+            transformer(batch, step['config'])
+        return pd.DataFrame(batch) if is_frame else batch
+
+    async def transform_stream(self, records: AsyncIterable[Dict[str, Any]],
+                               batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        """Transform an async stream of records in batches, yielding them in order"""
+        batch = []
+        async for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                for transformed in await self.transform_batch(batch):
+                    yield transformed
+                batch = []
+        if batch:
+            for transformed in await self.transform_batch(batch):
+                yield transformed
+
     def get_transformer(self, transformer_type: str):
         transformers = {
             'clean_text': self.clean_text,
@@ -23,37 +142,107 @@ class DataTransformationPipeline:
         }
         return transformers.get(transformer_type)
 
+    def get_batch_transformer(self, transformer_type: str):
+        transformers = {
+            'clean_text': self.clean_text_batch,
+            'normalize_dates': self.normalize_dates_batch,
+            'extract_numbers': self.extract_numbers_batch,
+            'categorize': self.categorize_batch
+        }
+        return transformers.get(transformer_type)
+
+    def get_matcher(self, config: Dict[str, Any], field: str) -> KeywordMatcher:
+        key = (id(config), field)
+        if key not in self._matchers:
+            self._matchers[key] = KeywordMatcher(config['categories'][field])
+        return self._matchers[key]
+
+    @staticmethod
+    def _column(batch: List[Dict[str, Any]], field: str, skip_none: bool = False) -> Tuple[List[int], pd.Series]:
+        """Positions of records that have the field, and their values"""
+        positions = [i for i, record in enumerate(batch)
+                     if field in record and not (skip_none and record[field] is None)]
+        return positions, pd.Series([batch[i][field] for i in positions], dtype=object)
+
+    @staticmethod
+    def _to_iso(value: Any) -> Any:
+        try:
+            return pd.to_datetime(value).isoformat()
+        except:
+            return value
+
     async def clean_text(self, data: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
         for field in config['fields']:
-            if field in data:
+            # Missing values stay null rather than becoming the string "None"
+            if data.get(field) is not None:
                 # Remove HTML tags
-                data[field] = re.sub(r'<[^>]+>', '', str(data[field]))
+                data[field] = TAG_RE.sub('', str(data[field]))
                 # Remove extra whitespace
                 data[field] = ' '.join(data[field].split())
         return data
 
+    def clean_text_batch(self, batch: List[Dict[str, Any]], config: Dict[str, Any]):
+        for field in config['fields']:
+            positions, values = self._column(batch, field, skip_none=True)
+            if not positions:
+                continue
+            cleaned = values.map(str).str.replace(TAG_RE, '', regex=True).str.split().str.join(' ')
+            for i, value in zip(positions, cleaned):
+                batch[i][field] = value
+
     async def normalize_dates(self, data: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
         for field in config['fields']:
             if field in data:
-                try:
-                    date = pd.to_datetime(data[field])
-                    data[field] = date.isoformat()
-                except:
-                    pass
+                data[field] = self._to_iso(data[field])
         return data
 
+    def normalize_dates_batch(self, batch: List[Dict[str, Any]], config: Dict[str, Any]):
+        for field in config['fields']:
+            positions, values = self._column(batch, field)
+            if not positions:
+                continue
+            # Scraped dates repeat a lot, so convert each distinct string once. Each one is
+            # parsed on its own, as in normalize_dates: a vectorized to_datetime infers a
+            # single format from the first value and reads 01/02 and 13/01 inconsistently.
+            converted: Dict[str, Any] = {}
+            for i, value in zip(positions, values):
+                if isinstance(value, str):
+                    if value not in converted:
+                        converted[value] = self._to_iso(value)
+                    batch[i][field] = converted[value]
+                else:
+                    batch[i][field] = self._to_iso(value)
+
     async def extract_numbers(self, data: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
         for field in config['fields']:
             if field in data:
-                numbers = re.findall(r'\d+\.?\d*', str(data[field]))
+                numbers = NUMBER_RE.findall(str(data[field]))
                 data[f"{field}_numbers"] = [float(n) for n in numbers]
         return data
 
+    def extract_numbers_batch(self, batch: List[Dict[str, Any]], config: Dict[str, Any]):
+        for field in config['fields']:
+            positions, values = self._column(batch, field)
+            if not positions:
+                continue
+            found = values.map(str).str.findall(NUMBER_RE)
+            for i, numbers in zip(positions, found):
+                batch[i][f"{field}_numbers"] = [float(n) for n in numbers]
+
     async def categorize(self, data: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
-        for field, categories in config['categories'].items():
+        for field in config['categories']:
             if field in data:
-                for category, keywords in categories.items():
-                    if any(keyword.lower() in str(data[field]).lower() for keyword in keywords):
-                        data[f"{field}_category"] = category
-                        break
-        return data 
\ No newline at end of file
+                category = self.get_matcher(config, field).match(str(data[field]))
+                if category is not None:
+                    data[f"{field}_category"] = category
+        return data
+
+    def categorize_batch(self, batch: List[Dict[str, Any]], config: Dict[str, Any]):
+        for field in config['categories']:
+            positions, values = self._column(batch, field)
+            if not positions:
+                continue
+            matcher = self.get_matcher(config, field)
+            for i, category in zip(positions, values.map(str).map(matcher.match)):
+                if category is not None:
+                    batch[i][f"{field}_category"] = category
@@ -1,6 +1,9 @@
 from pydantic import BaseModel, validator, HttpUrl
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, List, Optional, Union
 from datetime import datetime
+import re
+
+REQUIRED_DATA_FIELDS = ('title', 'content')
 
 class ScrapedDataValidator(BaseModel):
     source_url: HttpUrl
@@ -10,8 +13,7 @@ class ScrapedDataValidator(BaseModel):
 
     @validator('data')
     def validate_data_structure(cls, v):
-        required_fields = ['title', 'content']
-        for field in required_fields:
+        for field in REQUIRED_DATA_FIELDS:
             if field not in v:
                 raise ValueError(f"Missing required field: {field}")
         return v
@@ -22,23 +24,145 @@ class ScrapedDataValidator(BaseModel):
             raise ValueError("Metadata must include scraper_version")
         return v
 
+    @classmethod
+    def validate_bulk(cls, items: Iterable[Dict[str, Any]], trusted: bool = False) -> List['ScrapedDataValidator']:
+        """Validate many items; trusted engine output skips field coercion and only checks structure"""
+        if not trusted:
+            return [cls(**item) for item in items]
+
+        required = set(REQUIRED_DATA_FIELDS)
+        validated = []
+        for item in items:
+            missing = required.difference(item['data'])
+            if missing:
+                raise ValueError(f"Missing required field: {sorted(missing)[0]}")
+            metadata = item.get('metadata')
+            if metadata and 'scraper_version' not in metadata:
+                raise ValueError("Metadata must include scraper_version")
+            validated.append(cls.construct(**item))
+        return validated
+
+
+def compile_rule(rule: Dict[str, Any]) -> Callable[[Any], bool]:
+    """Turn a rule config into a predicate, compiling any pattern once"""
+    if rule['type'] == 'length':
+        min_length = rule['min_length']
+        return lambda value: len(str(value)) >= min_length
+    elif rule['type'] == 'range':
+        low, high = rule['min'], rule['max']
+        return lambda value: low <= float(value) <= high
+    elif rule['type'] == 'regex':
+        pattern = re.compile(rule['pattern'])
+        return lambda value: bool(pattern.match(str(value)))
+    return lambda value: True
+
+
+class FieldStats:
+    def __init__(self, sample_size: int):
+        self.sample_size = sample_size
+        self.total = 0
+        self.nulls = 0
+        self.passed = 0
+        self.failed = 0
+        self.samples: List[Any] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        checked = self.passed + self.failed
+        return {
+            'total': self.total,
+            'nulls': self.nulls,
+            'passed': self.passed,
+            'failed': self.failed,
+            'null_rate': self.nulls / self.total if self.total else 0.0,
+            'pass_rate': self.passed / checked if checked else 1.0,
+            'sample_failures': list(self.samples)
+        }
+
+
+class QualityReport:
+    """Aggregated pass and null rates per site and field, with bounded failure samples"""
+
+    def __init__(self, site_field: str = 'source', sample_size: int = 5):
+        self.site_field = site_field
+        self.sample_size = sample_size
+        self.records = 0
+        self.sites: Dict[str, Dict[str, FieldStats]] = {}
+
+    def stats(self, site: str, field: str) -> FieldStats:
+        fields = self.sites.setdefault(site, {})
+        if field not in fields:
+            fields[field] = FieldStats(self.sample_size)
+        return fields[field]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'records': self.records,
+            'sites': {
+                site: {field: stats.to_dict() for field, stats in fields.items()}
+                for site, fields in self.sites.items()
+            }
+        }
+
+    def passes(self, min_pass_rate: float = 1.0, max_null_rate: float = 1.0) -> bool:
+        """Gate a run: every site and field must meet both thresholds"""
+        for fields in self.sites.values():
+            for stats in fields.values():
+                summary = stats.to_dict()
+                if summary['pass_rate'] < min_pass_rate or summary['null_rate'] > max_null_rate:
+                    return False
+        return True
+
+
 class DataQualityChecker:
     def __init__(self, rules: Dict[str, Any]):
         self.rules = rules
+        self.compiled = {field: compile_rule(rule) for field, rule in rules.items()}
 
     async def check_quality(self, data: Dict[str, Any]) -> Dict[str, bool]:
         results = {}
-        for field, rule in self.rules.items():
+        for field, check in self.compiled.items():
             if field in data:
-                results[field] = self.apply_rule(data[field], rule)
+                results[field] = check(data[field])
         return results
 
     def apply_rule(self, value: Any, rule: Dict[str, Any]) -> bool:
-        if rule['type'] == 'length':
-            return len(str(value)) >= rule['min_length']
-        elif rule['type'] == 'range':
-            return rule['min'] <= float(value) <= rule['max']
-        elif rule['type'] == 'regex':
-            import re
-            return bool(re.match(rule['pattern'], str(value)))
-        return True 
\ No newline at end of file
+        return compile_rule(rule)(value)
+
+    def add_to_report(self, report: QualityReport, record: Dict[str, Any]):
+        report.records += 1
+        site = str(record.get(report.site_field) or 'unknown')
+        for field, check in self.compiled.items():
+            stats = report.stats(site, field)
+            stats.total += 1
+            value = record.get(field)
+            if value is None or value == '':
+                stats.nulls += 1
+                continue
+            try:
+                ok = check(value)
+            except (TypeError, ValueError):
+                ok = False
+            if ok:
+                stats.passed += 1
+            else:
+                stats.failed += 1
+                if len(stats.samples) < stats.sample_size:
+                    stats.samples.append(value)
+
+    def check_batch(self, records: Iterable[Dict[str, Any]], site_field: str = 'source',
+                    sample_size: int = 5) -> QualityReport:
+        report = QualityReport(site_field, sample_size)
+        for record in records:
+            self.add_to_report(report, record)
+        return report
+
+    async def check_stream(self, records: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+                           site_field: str = 'source', sample_size: int = 5) -> QualityReport:
+        report = QualityReport(site_field, sample_size)
+        if hasattr(records, '__aiter__'):
+            async for record in records:
+                self.add_to_report(report, record)
+        else:
+            for record in records:
+                self.add_to_report(report, record)
+        return report
@@ -0,0 +1,50 @@
+"""Compare fetch_with_retry with and without the shared connection pool.
+
+Usage: python -m benchmarks.bench_connection_pool [pages] [concurrency]
+"""
+import asyncio
+import sys
+import time
+
+from app.scraping_engine import ScrapingEngine
+from benchmarks.server import LocalServer
+
+PAGE = '<html><body>' + '<p>education news</p>' * 500 + '</body></html>'
+
+
+async def run(engine: ScrapingEngine, urls, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(url):
+        async with semaphore:
+            await engine.fetch_with_retry(url)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(fetch(url) for url in urls))
+    return time.perf_counter() - start
+
+
+async def main(pages: int, concurrency: int):
+    async with LocalServer({'/page': PAGE}) as server:
+        urls = [server.url('/page')] * pages
+
+        unpooled = ScrapingEngine()
+        unpooled_time = await run(unpooled, urls, concurrency)
+
+        pooled = ScrapingEngine()
+        await pooled.start()
+        try:
+            pooled_time = await run(pooled, urls, concurrency)
+        finally:
+            await pooled.close()
+
+    print(f"pages={pages} concurrency={concurrency}")
+    print(f"without pool: {unpooled_time:.3f}s ({pages / unpooled_time:.0f} pages/s)")
+    print(f"with pool:    {pooled_time:.3f}s ({pages / pooled_time:.0f} pages/s)")
+    print(f"speedup:      {unpooled_time / pooled_time:.2f}x")
+
+
+if __name__ == '__main__':
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    asyncio.run(main(pages, concurrency))
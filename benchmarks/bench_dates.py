@@ -0,0 +1,101 @@
+"""Micro-benchmark of date normalization over date strings from the configured sites.
+
+Usage: python -m benchmarks.bench_dates [rounds]
+"""
+import re
+import sys
+import time
+import warnings
+from datetime import datetime
+
+import pytz
+from dateutil import parser
+
+from app.date_parser import DateNormalizer
+from app.scraping_engine import ScrapingEngine
+
+# Date strings as they appear in each site's listing markup
+CORPUS = {
+    'indianexpress.com': [
+        '2026-10-12T10:15:00+05:30',
+        'Updated: October 12, 2026 10:15 AM',
+        'October 12, 2026 10:15 IST',
+        'October 3, 2026',
+        'Published: September 28, 2026 06:40 PM',
+    ],
+    'careers360.com': [
+        'Oct 12, 2026 10:15 AM',
+        'Posted on Oct 11, 2026',
+        'Sep 30, 2026 04:05 PM',
+        'Last updated: Oct 02, 2026 11:30 AM',
+    ],
+    'shiksha.com': [
+        '12 Oct 2026',
+        'Last Updated: 12 Oct 2026, 09:20 AM',
+        '2026-10-10T18:45:00+05:30',
+        '29 Sep 2026',
+    ],
+    'timesofindia.indiatimes.com': [
+        'Oct 12, 2026, 10:15 AM IST',
+        'Updated: Oct 12, 2026, 10:15 AM IST',
+        'Oct 9, 2026, 07:02 PM IST',
+        '2026-10-01T09:30:00+05:30',
+    ],
+}
+
+
+def legacy_parse_date(date_str, formats, timezone):
+    """The original dateutil-first implementation, kept as the reference"""
+    date_str = re.sub(r'\s+', ' ', date_str.strip())
+    date_str = re.sub(r'^(Updated:|Published:|Posted:|Last Updated:|Updated on:|Published on:)\s*', '', date_str)
+    try:
+        parsed_date = parser.parse(date_str, fuzzy=True)
+        if parsed_date.tzinfo is None:
+            parsed_date = timezone.localize(parsed_date)
+        return parsed_date.strftime('%Y-%m-%d %I:%M %p IST')
+    except Exception:
+        for fmt in formats:
+            try:
+                return timezone.localize(datetime.strptime(date_str, fmt)).strftime('%Y-%m-%d %I:%M %p IST')
+            except Exception:
+                continue
+    return date_str
+
+
+def bench(label, fn, samples, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for site, date_str, formats in samples:
+            fn(date_str, formats, site)
+    elapsed = time.perf_counter() - start
+    per_call = elapsed / (rounds * len(samples)) * 1e6
+    print(f"{label:<28} {per_call:>8.1f} us/date")
+
+
+def main(rounds: int):
+    warnings.simplefilter('ignore')
+    engine = ScrapingEngine()
+    timezone = pytz.timezone('Asia/Kolkata')
+    samples = [
+        (engine.site_configs[site]['name'], date_str, engine.site_configs[site]['date_formats'])
+        for site, dates in CORPUS.items() for date_str in dates
+    ]
+
+    uncached = DateNormalizer(timezone, cache_size=0)
+    cached = DateNormalizer(timezone)
+    mismatches = [
+        (date_str, legacy_parse_date(date_str, formats, timezone), uncached.parse(date_str, formats, site))
+        for site, date_str, formats in samples
+        if legacy_parse_date(date_str, formats, timezone) != uncached.parse(date_str, formats, site)
+    ]
+
+    bench('legacy (dateutil first)', lambda d, f, s: legacy_parse_date(d, f, timezone), samples, rounds)
+    bench('normalizer, no memo', uncached.parse, samples, rounds)
+    bench('normalizer, memoized', cached.parse, samples, rounds)
+    print(f"learned formats: {uncached.learned_formats()}")
+    for date_str, expected, got in mismatches:
+        print(f"MISMATCH {date_str!r}: legacy={expected!r} normalizer={got!r}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,120 @@
+"""Deep-scrape latency against one-by-one article fetches.
+
+A local server answers every page after a fixed delay. Fetching articles
+one after another costs roughly one delay per article; deep mode should
+finish in about the listing plus the slowest single article.
+
+Runs with the production politeness defaults: listings paced at 2 per host
+and 0.5 s apart, and either the same pacing for article pages (shared) or
+their own per-host article budget.
+
+Usage: python -m benchmarks.bench_deep_scrape [articles] [latency_ms]
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Dict
+
+from app.politeness import PolitenessScheduler
+from app.result_cache import ResultCache
+from app.scraping_engine import ScrapingEngine
+from benchmarks.server import LocalServer
+
+SITE_CONFIG = {
+    'domain': '127.0.0.1',
+    'name': 'Local',
+    'base_url': '',
+    'education_url': '',
+    'selectors': {
+        'article_wrapper': 'div.item',
+        'title': 'h2 a',
+        'date': ['time'],
+        'summary': ['p.summary']
+    }
+}
+ARTICLE = (
+    '<html><head><meta name="author" content="Staff Reporter">'
+    '<meta property="article:published_time" content="2024-03-01T10:30:00+05:30">'
+    '<meta property="article:tag" content="exams"></head>'
+    '<body><article>' + '<p>Full article paragraph.</p>' * 30 + '</article></body></html>'
+)
+
+
+def pages(articles: int):
+    listing = ''.join(
+        f'<div class="item"><h2><a href="/article/{i}">Article {i}</a></h2></div>'
+        for i in range(articles)
+    )
+    site = {'/': f'<html><body>{listing}</body></html>'}
+    site.update({f'/article/{i}': ARTICLE for i in range(articles)})
+    return site
+
+
+def listing_scheduler() -> PolitenessScheduler:
+    return PolitenessScheduler(concurrency=2, min_interval=0.5)
+
+
+def article_scheduler() -> PolitenessScheduler:
+    return PolitenessScheduler(concurrency=8, min_interval=0)
+
+
+async def run(server: LocalServer, site_dir: str, articles: int, shared: bool) -> Dict[str, float]:
+    engine = ScrapingEngine(site_config_dir=site_dir, article_concurrency=articles,
+                            article_cache=ResultCache(ttl=3600, stale_ttl=0, max_entries=articles),
+                            scheduler=listing_scheduler(),
+                            article_scheduler=None if shared else article_scheduler())
+    await engine.start()
+    try:
+        timings = {}
+        if shared:
+            start = time.perf_counter()
+            listing = await engine.scrape_website(server.url('/'))
+            for article in listing:
+                await engine.fetch_with_retry(article['link'])
+            timings['sequential'] = time.perf_counter() - start
+            # Start the deep scrape on a fresh pacing window, as a new request would
+            engine.scheduler = listing_scheduler()
+
+        start = time.perf_counter()
+        first = None
+        count = 0
+        async for event in engine.scrape_deep(server.url('/')):
+            if first is None:
+                first = time.perf_counter() - start
+            count += event['type'] == 'article'
+        timings['deep'] = time.perf_counter() - start
+        timings['first'] = first
+        timings['count'] = count
+
+        start = time.perf_counter()
+        await engine.scrape_website_deep(server.url('/'))
+        timings['cached'] = time.perf_counter() - start
+        return timings
+    finally:
+        await engine.close()
+
+
+async def main(articles: int, latency_ms: float):
+    async with LocalServer(pages(articles), delay=latency_ms / 1000) as server:
+        with tempfile.TemporaryDirectory() as site_dir:
+            config = dict(SITE_CONFIG, base_url=server.url('/'), education_url=server.url('/'))
+            with open(os.path.join(site_dir, 'local.json'), 'w') as f:
+                json.dump(config, f)
+            shared = await run(server, site_dir, articles, shared=True)
+            separate = await run(server, site_dir, articles, shared=False)
+
+    print(f"articles={articles} server latency={latency_ms:.0f}ms, politeness scheduler on")
+    print(f"sequential fetches:                 {shared['sequential']:.3f}s")
+    for label, timings in (('shared host budget', shared), ('separate article budget', separate)):
+        print(f"deep mode, {label + ':':<25}{timings['deep']:.3f}s "
+              f"(listing after {timings['first']:.3f}s, {timings['count']} articles)")
+    print(f"deep mode, cached:                  {separate['cached']:.3f}s")
+
+
+if __name__ == '__main__':
+    articles = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 100
+    asyncio.run(main(articles, latency_ms))
@@ -0,0 +1,61 @@
+"""Job throughput of the worker pool as the number of workers grows.
+
+Each job fetches a page from a local server with simulated latency, so
+throughput should scale with workers until the server or loop saturates.
+
+Usage: python -m benchmarks.bench_job_queue [jobs] [latency_ms]
+"""
+import asyncio
+import sys
+import time
+
+from app.models import ScraperRun
+from app.queue_manager import MemoryJobBackend, QueueManager
+from app.scraping_engine import ScrapingEngine
+from benchmarks.server import LocalServer
+
+PAGE = '<html><body>' + '<p>education news</p>' * 200 + '</body></html>'
+WORKER_COUNTS = (1, 2, 4, 8, 16, 32)
+
+
+async def run(engine: ScrapingEngine, url: str, jobs: int, workers: int) -> float:
+    async def handler(job):
+        html = await engine.fetch_with_retry(job['parameters']['url'])
+        return len(html or '')
+
+    manager = QueueManager(MemoryJobBackend(), handler=handler, workers=workers)
+    runs = [ScraperRun(scraper_id='bench', parameters={'url': url}) for _ in range(jobs)]
+
+    start = time.perf_counter()
+    job_ids = await manager.add_jobs(runs)
+    await manager.start()
+    while manager.pool.processed + manager.pool.failed < jobs:
+        await asyncio.sleep(0.005)
+    elapsed = time.perf_counter() - start
+    await manager.close()
+
+    statuses = [await manager.get_job_status(job_id) for job_id in job_ids]
+    assert all(status['status'] == 'finished' for status in statuses)
+    return elapsed
+
+
+async def main(jobs: int, latency_ms: float):
+    async with LocalServer({'/page': PAGE}, delay=latency_ms / 1000) as server:
+        engine = ScrapingEngine()
+        await engine.start()
+        try:
+            print(f"jobs={jobs} server latency={latency_ms:.0f}ms")
+            baseline = None
+            for workers in WORKER_COUNTS:
+                elapsed = await run(engine, server.url('/page'), jobs, workers)
+                baseline = baseline or elapsed
+                print(f"workers={workers:<3} {elapsed:.3f}s ({jobs / elapsed:.0f} jobs/s, "
+                      f"{baseline / elapsed:.1f}x)")
+        finally:
+            await engine.close()
+
+
+if __name__ == '__main__':
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 20
+    asyncio.run(main(jobs, latency_ms))
@@ -0,0 +1,46 @@
+"""Parse and extract time per parser backend over the recorded fixture pages.
+
+Usage: python -m benchmarks.bench_parsers [iterations]
+"""
+import sys
+import time
+
+from app.parsers import get_parser_backend, parser_backends
+from app.scraping_engine import ScrapingEngine
+from benchmarks.fixtures import load_fixtures
+
+
+def timed(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main(iterations: int):
+    fixtures = load_fixtures()
+    engines = {}
+    for name in parser_backends:
+        try:
+            engines[name] = ScrapingEngine(parser_backend=get_parser_backend(name))
+        except ImportError as e:
+            print(f"skipping {name}: {e}")
+
+    print(f"{'site':<30} {'backend':<12} {'parse ms':>10} {'extract ms':>11} {'articles':>9}")
+    for site, html in fixtures.items():
+        outputs = {}
+        for name, engine in engines.items():
+            plan = engine.registry.plans[site]
+            parse_ms = timed(lambda: engine.parser.parse(html), iterations)
+            total_ms = timed(lambda: engine.extract_articles(html, plan), iterations)
+            outputs[name] = engine.extract_articles(html, plan)
+            print(f"{site:<30} {name:<12} {parse_ms:>10.2f} {total_ms - parse_ms:>11.2f} {len(outputs[name]):>9}")
+
+        reference = next(iter(outputs.values()))
+        for name, output in outputs.items():
+            if output != reference:
+                print(f"  MISMATCH: {name} output differs on {site}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
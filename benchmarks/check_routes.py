@@ -0,0 +1,42 @@
+"""Request-level smoke check that the per-site API routes are mounted and answer.
+
+Every request fails fast without touching the network: the supported-site
+list is local, the education scrape gets an unsupported URL and Google Maps
+has no browser pool here. What matters is that none of them is a 404.
+
+Usage: python -m benchmarks.check_routes
+"""
+import os
+import sys
+
+# Keep the limiter out of the way of back-to-back requests
+os.environ.setdefault('RATE_LIMIT_PER_MINUTE', '0')
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+REQUESTS = [
+    ('/supported-sites', {}, (200,)),
+    ('/scrape/education', {'url': 'https://unsupported.example.com/'}, (500,)),
+    ('/scrape/google-maps', {'place_id': 'ChIJ-check'}, (200, 500)),
+]
+
+
+def main() -> int:
+    client = TestClient(app)
+    failed = 0
+    for path, params, expected in REQUESTS:
+        response = client.get(path, params=params)
+        ok = response.status_code in expected
+        failed += not ok
+        print(f"{path:<24} {response.status_code}  {'ok' if ok else 'FAILED'}")
+    sites = client.get('/supported-sites').json().get('data')
+    if not sites:
+        print("/supported-sites returned no sites  FAILED")
+        failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
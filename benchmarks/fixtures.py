@@ -0,0 +1,55 @@
+import os
+from typing import Dict
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def load_fixtures() -> Dict[str, str]:
+    """Recorded listing pages keyed by site_configs domain"""
+    fixtures = {}
+    for filename in sorted(os.listdir(FIXTURE_DIR)):
+        if filename.endswith('.html'):
+            with open(os.path.join(FIXTURE_DIR, filename), encoding='utf-8') as f:
+                fixtures[filename[:-len('.html')]] = f.read()
+    return fixtures
+
+
+# Synthetic pages for the ScrapingTemplate extractors, with their template configs
+TEMPLATE_CONFIGS = {
+    'ecommerce': {'selectors': {
+        'name': 'h1.product-name', 'price': 'span.price', 'description': 'div.description',
+        'images': 'div.gallery img', 'reviews': 'div.review'
+    }},
+    'social_media': {'selectors': {'posts': 'div.post'}},
+    'job_board': {'selectors': {'jobs': 'div.job'}}
+}
+
+
+def template_pages(records: int = 200) -> Dict[str, str]:
+    """One page per template with `records` reviews, posts or jobs"""
+    reviews = ''.join(
+        f'<div class="review"><span class="rating">{i % 5 + 1}</span>'
+        f'<p class="comment">Review {i} of the course material</p><span class="author">User {i}</span></div>'
+        for i in range(records)
+    )
+    images = ''.join(f'<img src="/img/{i}.jpg">' for i in range(20))
+    posts = ''.join(
+        f'<div class="post"><p class="content">Post {i} about the exam schedule</p><span class="likes">{i * 3}</span>'
+        f'<span class="comments">{i}</span><time class="timestamp">2026-10-{i % 28 + 1:02d}</time></div>'
+        for i in range(records)
+    )
+    jobs = ''.join(
+        f'<div class="job"><h3 class="title">Assistant Professor {i}</h3><span class="company">University {i % 40}</span>'
+        f'<span class="location">City {i % 12}</span><span class="salary">{40000 + i * 100}</span>'
+        f'<p class="description">Teaching and research position number {i}</p></div>'
+        for i in range(records)
+    )
+    return {
+        'ecommerce': (
+            '<html><body><h1 class="product-name">Exam Guide</h1><span class="price">499</span>'
+            f'<div class="description">Complete preparation guide</div><div class="gallery">{images}</div>'
+            f'{reviews}</body></html>'
+        ),
+        'social_media': f'<html><body>{posts}</body></html>',
+        'job_board': f'<html><body>{jobs}</body></html>'
+    }
@@ -0,0 +1,47 @@
+from aiohttp import web
+import asyncio
+from typing import Dict, Optional
+
+
+class LocalServer:
+    """Local stand-in HTTP server serving fixed pages for benchmarks"""
+
+    def __init__(self, pages: Optional[Dict[str, str]] = None, host: str = '127.0.0.1', delay: float = 0):
+        self.pages = pages or {}
+        self.host = host
+        # Simulated server latency per response
+        self.delay = delay
+        self.port = None
+        self._runner = None
+
+    def url(self, path: str = '/') -> str:
+        return f"http://{self.host}:{self.port}{path}"
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        body = self.pages.get(request.path)
+        if body is None:
+            return web.Response(status=404, text='Not found')
+        return web.Response(text=body, content_type='text/html')
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_route('GET', '/{tail:.*}', self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
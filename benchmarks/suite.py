@@ -0,0 +1,294 @@
+"""Offline benchmark suite over the scraping hot paths, with recorded baselines.
+
+Every case runs against the recorded fixtures in benchmarks/fixtures, served
+by LocalServer wherever a fetch is involved, so nothing leaves the machine.
+Each case reports per-operation latency percentiles and the peak memory
+traced while running one sample. Results are compared with a JSON baseline
+and the run exits non-zero when a case got slower, or needs more memory,
+by more than the threshold.
+
+Baselines are only comparable on the machine that recorded them: record one
+with --save before making a change, then rerun without it.
+
+Usage:
+    python -m benchmarks.suite [--save] [--baseline PATH] [--threshold 0.3]
+                               [--samples N] [--only SUBSTRING] [--output PATH]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.date_parser import DateNormalizer
+from app.exporters import DataExporter
+from app.scraping_engine import ScrapingEngine
+from app.scraping_templates import EcommerceScraper, JobBoardScraper, SocialMediaScraper
+from app.transformers import DataTransformationPipeline
+from benchmarks.bench_dates import CORPUS
+from benchmarks.bench_transformers import make_records, make_steps
+from benchmarks.fixtures import TEMPLATE_CONFIGS, load_fixtures, template_pages
+from benchmarks.server import LocalServer
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+TEMPLATES = {
+    'ecommerce': EcommerceScraper,
+    'social_media': SocialMediaScraper,
+    'job_board': JobBoardScraper
+}
+
+
+class Case:
+    """One benchmark: `run` performs a single sample of `ops` operations"""
+
+    def __init__(self, name: str, run: Callable[[], Awaitable[Any]], ops: int = 1):
+        self.name = name
+        self.run = run
+        self.ops = ops
+
+
+def sync_case(name: str, fn: Callable[[], Any], ops: int = 1) -> Case:
+    async def run():
+        return fn()
+    return Case(name, run, ops)
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = (len(ordered) - 1) * q
+    low = int(index)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (index - low)
+
+
+async def measure(case: Case, samples: int, warmup: int) -> Dict[str, float]:
+    for _ in range(warmup):
+        await case.run()
+
+    latencies = []
+    gc.collect()
+    for _ in range(samples):
+        start = time.perf_counter()
+        await case.run()
+        latencies.append((time.perf_counter() - start) / case.ops * 1000)
+
+    # Traced separately, tracemalloc slows everything it watches
+    gc.collect()
+    tracemalloc.start()
+    try:
+        await case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    mean = statistics.fmean(latencies)
+    return {
+        'ops': case.ops,
+        'samples': samples,
+        'mean_ms': mean,
+        'p50_ms': percentile(latencies, 0.5),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99),
+        'ops_per_s': 1000 / mean if mean else 0.0,
+        'peak_kb': peak / 1024
+    }
+
+
+def write_site_config(site_dir: str, site: str, config: Dict[str, Any], server: LocalServer):
+    """The site's real selectors, pointed at its fixture on the local server"""
+    local = dict(config, domain=server.host, base_url=server.url('/'), education_url=server.url(f'/{site}'))
+    with open(os.path.join(site_dir, f'{site}.json'), 'w') as f:
+        json.dump(local, f)
+
+
+async def build_cases(server: LocalServer, fixtures: Dict[str, str], site_dir: str,
+                      engines: List[ScrapingEngine]) -> List[Case]:
+    cases = []
+    reference = ScrapingEngine()
+
+    # Raw fetches over the pooled session, a batch of concurrent requests per sample
+    fetcher = ScrapingEngine()
+    await fetcher.start()
+    engines.append(fetcher)
+    urls = [server.url(f'/{site}') for site in fixtures] * 16
+
+    async def fetch_batch():
+        pages = await asyncio.gather(*(fetcher.fetch_with_retry(url) for url in urls))
+        if not all(pages):
+            raise RuntimeError("fetch_with_retry returned no content")
+    cases.append(Case('fetch_with_retry', fetch_batch, ops=len(urls)))
+
+    # Fetch, parse and extract, one engine per site since they all live on one host
+    for site, config in reference.site_configs.items():
+        if site not in fixtures:
+            continue
+        engine_dir = os.path.join(site_dir, site)
+        os.makedirs(engine_dir)
+        write_site_config(engine_dir, site, config, server)
+        engine = ScrapingEngine(site_config_dir=engine_dir)
+        await engine.start()
+        engines.append(engine)
+
+        async def scrape(engine=engine, url=server.url(f'/{site}')):
+            if not await engine.scrape_website(url):
+                raise RuntimeError(f"No articles extracted from {url}")
+        cases.append(Case(f'scrape_website[{site}]', scrape))
+
+    samples = [
+        (reference.site_configs[site]['name'], date_str, reference.site_configs[site]['date_formats'])
+        for site, dates in CORPUS.items() for date_str in dates
+    ]
+
+    # Memo hits take well under a microsecond, so each sample repeats the corpus
+    def parse_dates(parse=reference.parse_date):
+        for _ in range(50):
+            for site, date_str, formats in samples:
+                parse(date_str, formats, site)
+    cases.append(sync_case('parse_date', parse_dates, ops=len(samples) * 50))
+
+    def parse_dates_cold():
+        normalizer = DateNormalizer(reference.timezone, cache_size=0)
+        for site, date_str, formats in samples:
+            normalizer.parse(date_str, formats, site)
+    cases.append(sync_case('parse_date[no memo]', parse_dates_cold, ops=len(samples)))
+
+    # Real extracted articles, repeated up to a realistic export size
+    articles = [
+        article
+        for site, html in fixtures.items() if site in reference.registry.plans
+        for article in reference.extract_articles(html, reference.registry.plans[site])
+    ]
+    records = (articles * (2000 // max(1, len(articles)) + 1))[:2000]
+    fields = ['title', 'link', 'summary', 'published_date', 'source']
+    for format, compression in (('csv', None), ('json', None), ('ndjson', None), ('ndjson', 'gzip')):
+        async def export(format=format, compression=compression):
+            exporter = DataExporter(records, fields=fields)
+            async for _ in exporter.stream(format, compression):
+                pass
+        label = f'{format}+{compression}' if compression else format
+        cases.append(Case(f'DataExporter[{label}]', export, ops=len(records)))
+
+    transform_records = make_records(5000)
+    pipeline = DataTransformationPipeline(make_steps(50))
+
+    async def transform_batch():
+        await pipeline.transform_batch([dict(record) for record in transform_records])
+    cases.append(Case('DataTransformationPipeline.transform_batch', transform_batch, ops=len(transform_records)))
+
+    async def transform_each():
+        for record in transform_records[:500]:
+            await pipeline.transform(dict(record))
+    cases.append(Case('DataTransformationPipeline.transform', transform_each, ops=500))
+
+    for name, html in template_pages().items():
+        template = TEMPLATES[name](TEMPLATE_CONFIGS[name], reference.parser)
+        cases.append(Case(f'ScrapingTemplate[{name}]', lambda template=template, html=html: template.extract_data(html)))
+
+        async def stream(template=template, html=html):
+            async for _ in template.stream_records(html):
+                pass
+        cases.append(Case(f'ScrapingTemplate.stream_records[{name}]', stream))
+
+    return cases
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float) -> List[str]:
+    """Cases whose median latency or peak memory grew by more than `threshold`"""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ('p50_ms', 'peak_kb'):
+            if previous[metric] and result[metric] > previous[metric] * (1 + threshold):
+                change = result[metric] / previous[metric] - 1
+                regressions.append(
+                    f"{name}: {metric} {previous[metric]:.3f} -> {result[metric]:.3f} (+{change:.0%})"
+                )
+    return regressions
+
+
+async def run_suite(samples: int, warmup: int, only: Optional[str]) -> Dict[str, Dict[str, float]]:
+    fixtures = load_fixtures()
+    engines: List[ScrapingEngine] = []
+    results = {}
+    async with LocalServer({f'/{site}': html for site, html in fixtures.items()}) as server:
+        with tempfile.TemporaryDirectory() as site_dir:
+            try:
+                cases = await build_cases(server, fixtures, site_dir, engines)
+                print(f"{'case':<44} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>11} {'peak KB':>9}")
+                for case in cases:
+                    if only and only not in case.name:
+                        continue
+                    result = results[case.name] = await measure(case, samples, warmup)
+                    print(f"{case.name:<44} {result['p50_ms']:>9.3f} {result['p95_ms']:>9.3f} "
+                          f"{result['p99_ms']:>9.3f} {result['ops_per_s']:>11,.0f} {result['peak_kb']:>9.0f}")
+            finally:
+                await asyncio.gather(*(engine.close() for engine in engines))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help="record the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.3, help="allowed growth before failing, 0.3 = 30%%")
+    parser.add_argument('--samples', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--only', help="run only cases whose name contains this")
+    parser.add_argument('--output', help="also write this run's results to a JSON file")
+    args = parser.parse_args(argv)
+    warnings.simplefilter('ignore')
+
+    results = asyncio.run(run_suite(args.samples, args.warmup, args.only))
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}",
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save:
+        if os.path.exists(args.baseline) and args.only:
+            # Partial run: keep the other cases' baselines
+            with open(args.baseline) as f:
+                previous = json.load(f)
+            report['results'] = dict(previous.get('results', {}), **results)
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}, record one with --save")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline.get('results', {}), args.threshold)
+    missing = sorted(set(results) - set(baseline.get('results', {})))
+    if missing:
+        print(f"not in baseline: {', '.join(missing)}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"no regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())